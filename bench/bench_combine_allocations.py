@@ -0,0 +1,82 @@
+"""
+memory allocated per dispatch by combine_reducers(), measured with
+tracemalloc, against the previous combination that always built
+a next state dict
+
+usage: PYTHONPATH=. python bench/bench_combine_allocations.py [keys]
+"""
+from __future__ import print_function
+
+import sys
+import timeit
+import tracemalloc
+
+from pydux import combine_reducers
+
+
+def make_counter(key):
+    def counter(state=None, action=None):
+        if state is None:
+            state = 0
+        if action['type'] == 'INCREMENT' and action['key'] == key:
+            return state + 1
+        return state
+    return counter
+
+
+def eager_combine_reducers(reducers):
+    # combine_reducers() before next_state was allocated lazily
+    def combination(state=None, action=None):
+        if state is None:
+            state = {}
+        has_changed = False
+        next_state = {}
+        for key, reducer in reducers.items():
+            previous_state_for_key = state.get(key)
+            next_state_for_key = reducer(previous_state_for_key, action)
+            next_state[key] = next_state_for_key
+            has_changed = (has_changed or
+                           next_state_for_key != previous_state_for_key)
+        return next_state if has_changed else state
+    return combination
+
+
+def allocated_per_call(reducer, state, action, number):
+    """average bytes allocated (and freed again) during one call"""
+    total = 0
+    tracemalloc.start()
+    try:
+        for _ in range(number):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            reducer(state, action)
+            total += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return total / float(number)
+
+
+def main(count=100, number=2000):
+    reducers = dict(('k%d' % (i,), make_counter('k%d' % (i,))) for i in range(count))
+    variants = [
+        ('eager', eager_combine_reducers(reducers)),
+        ('lazy', combine_reducers(reducers)),
+        ('compiled', combine_reducers(reducers, compile=True)),
+    ]
+    cases = [
+        ('no change', {'type': 'UNKNOWN'}),
+        ('last key changes', {'type': 'INCREMENT', 'key': 'k%d' % (count - 1,)}),
+    ]
+    print('%d keys, %d calls each' % (count, number))
+    for label, action in cases:
+        print(label)
+        for name, reducer in variants:
+            state = reducer(None, {'type': 'INIT'})
+            allocated = allocated_per_call(reducer, state, action, number)
+            seconds = timeit.timeit(lambda: reducer(state, action), number=number)
+            print('  %-9s %8.0f bytes/call %9.2f us/call' % (
+                name, allocated, seconds / number * 1e6))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
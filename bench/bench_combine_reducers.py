@@ -0,0 +1,56 @@
+"""
+combine_reducers() combination vs. compile=True
+
+usage: PYTHONPATH=. python bench/bench_combine_reducers.py [keys ...]
+"""
+from __future__ import print_function
+
+import sys
+import timeit
+
+from pydux import combine_reducers
+
+
+def make_counter(key):
+    def counter(state=None, action=None):
+        if state is None:
+            state = 0
+        if action['type'] == 'INCREMENT' and action['key'] == key:
+            return state + 1
+        return state
+    return counter
+
+
+def dispatcher(reducer, action):
+    # feeds each result back in, like a store does
+    state = [reducer(None, {'type': 'INIT'})]
+
+    def dispatch():
+        state[0] = reducer(state[0], action)
+    return dispatch
+
+
+def main(key_counts=(10, 50, 100, 500), number=None):
+    for count in key_counts:
+        reducers = dict(('k%d' % (i,), make_counter('k%d' % (i,))) for i in range(count))
+        plain = combine_reducers(reducers)
+        compiled = combine_reducers(reducers, compile=True)
+        calls = number or max(200, 200000 // count)
+
+        cases = [
+            ('no change', {'type': 'UNKNOWN'}),
+            ('one change', {'type': 'INCREMENT', 'key': 'k0'}),
+        ]
+        print('%d keys, %d calls each' % (count, calls))
+        for label, action in cases:
+            t_plain = timeit.timeit(dispatcher(plain, action), number=calls)
+            t_compiled = timeit.timeit(dispatcher(compiled, action), number=calls)
+            print('  %-10s combination %9.2f us   compiled %9.2f us   %5.2fx' % (
+                label,
+                t_plain / calls * 1e6,
+                t_compiled / calls * 1e6,
+                t_plain / t_compiled))
+
+
+if __name__ == '__main__':
+    main(*[[int(arg) for arg in sys.argv[1:]]] if sys.argv[1:] else [])
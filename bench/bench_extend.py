@@ -0,0 +1,42 @@
+"""
+extend() vs. extend_overlay() on large slices
+
+usage: PYTHONPATH=. python bench/bench_extend.py [keys]
+"""
+from __future__ import print_function
+
+import sys
+import timeit
+
+from pydux.extend import extend, extend_overlay
+
+
+def update_chain(extend_fn, base, updates):
+    state = base
+    for i in range(updates):
+        state = extend_fn(state, {'key_%d' % (i,): i})
+    return state
+
+
+def main(keys=10000, updates=100, reads=1000):
+    base = {'key_%d' % (i,): i for i in range(keys)}
+    print('%d keys, %d single-key updates' % (keys, updates))
+
+    for label, extend_fn in [('extend', extend), ('extend_overlay', extend_overlay)]:
+        t_update = min(timeit.repeat(lambda: update_chain(extend_fn, base, updates),
+                                     number=10, repeat=3)) / 10
+        state = update_chain(extend_fn, base, updates)
+        lookups = ['key_%d' % (i,) for i in range(0, keys, keys // reads)]
+        t_read = min(timeit.repeat(lambda: [state[key] for key in lookups],
+                                   number=100, repeat=3)) / 100
+        t_iter = min(timeit.repeat(lambda: list(state.items()),
+                                   number=10, repeat=3)) / 10
+        print('%-15s update %8.2f us   read %6.1f ns   items() %8.2f us' % (
+            label,
+            t_update / updates * 1e6,
+            t_read / len(lookups) * 1e9,
+            t_iter * 1e6))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,55 @@
+"""
+handle_actions() lookup table vs. an if/elif reducer chain
+
+usage: PYTHONPATH=. python bench/bench_handle_actions.py [branches]
+"""
+from __future__ import print_function
+
+import sys
+import timeit
+
+from pydux import handle_actions
+
+
+def make_chain_reducer(types):
+    # build the equivalent of a hand-written if/elif reducer
+    lines = ['def reducer(state=None, action=None):',
+             '    if state is None:',
+             '        state = 0']
+    for i, ty in enumerate(types):
+        lines.append('    %s action["type"] == %r:' % ('if' if i == 0 else 'elif', ty))
+        lines.append('        return state + 1')
+    lines.append('    return state')
+    namespace = {}
+    exec('\n'.join(lines), namespace)
+    return namespace['reducer']
+
+
+def make_table_reducer(types):
+    return handle_actions({ty: lambda state, action: state + 1 for ty in types}, 0)
+
+
+def main(branches=80, number=200000):
+    types = ['ACTION_%d' % (i,) for i in range(branches)]
+    chain = make_chain_reducer(types)
+    table = make_table_reducer(types)
+
+    cases = [
+        ('first type', {'type': types[0]}),
+        ('middle type', {'type': types[branches // 2]}),
+        ('last type', {'type': types[-1]}),
+        ('unknown type', {'type': 'UNKNOWN'}),
+    ]
+    print('%d branches, %d calls each' % (branches, number))
+    for label, action in cases:
+        t_chain = timeit.timeit(lambda: chain(0, action), number=number)
+        t_table = timeit.timeit(lambda: table(0, action), number=number)
+        print('%-14s if/elif %7.1f ns   table %7.1f ns   %5.1fx' % (
+            label,
+            t_chain / number * 1e9,
+            t_table / number * 1e9,
+            t_chain / t_table))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
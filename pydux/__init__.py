@@ -1,7 +1,59 @@
 from __future__ import absolute_import
 
-from .apply_middleware import apply_middleware
-from .combine_reducers import combine_reducers
-from .create_store import create_store
+import importlib
+import sys
+import types
+
+from .create_store import ListenerError, create_store
 
 __version__ = '0.2.2'
+
+# everything but create_store is imported on first access (PEP 562,
+# python 3.7+)
+_lazy_attributes = {
+    'add_hook': 'hooks',
+    'apply_middleware': 'apply_middleware',
+    'check_immutability': 'immutability',
+    'combine_reducers': 'combine_reducers',
+    'create_reducer': 'handle_actions',
+    'create_sharded_store': 'sharded_store',
+    'depends_on': 'combine_reducers',
+    'for_action_types': 'apply_middleware',
+    'handle_actions': 'handle_actions',
+    'memoize_reducer': 'memoize_reducer',
+    'remove_hook': 'hooks',
+    'undoable': 'undoable',
+}
+
+__all__ = sorted(['ListenerError', 'create_store'] + list(_lazy_attributes))
+
+
+if sys.version_info < (3, 7):
+    # no module __getattr__ before python 3.7, so import eagerly
+    for _name, _module_name in _lazy_attributes.items():
+        globals()[_name] = getattr(
+            importlib.import_module('.' + _module_name, __name__), _name)
+    del _name, _module_name
+else:
+    def __getattr__(name):
+        try:
+            module_name = _lazy_attributes[name]
+        except KeyError:
+            raise AttributeError('module %r has no attribute %r' % (__name__, name))
+        value = getattr(importlib.import_module('.' + module_name, __name__), name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(_lazy_attributes))
+
+    class _Package(types.ModuleType):
+        def __setattr__(self, name, value):
+            # importing a submodule binds it on the package.  several
+            # submodules share their name with the function they define,
+            # which is what the package attribute must refer to.
+            if name in _lazy_attributes and isinstance(value, types.ModuleType):
+                return
+            types.ModuleType.__setattr__(self, name, value)
+
+    sys.modules[__name__].__class__ = _Package
@@ -1,11 +1,46 @@
 from .compose import compose
 from .extend import extend
+from .hooks import call_hooks, clock, get_hooks
+
+
+def for_action_types(*action_types):
+    """
+    declares the action types a middleware is interested in
+
+    usage:
+        @for_action_types('FETCH', 'REFRESH')
+        def fetch_middleware(store):
+            ...
+
+    apply_middleware() leaves the middleware out of the dispatch
+    chain for all other actions, including non-dict actions such
+    as thunks.
+
+    Args:
+        *action_types: the action types to handle
+
+    Returns:
+        decorator that sets the middleware's action_types
+    """
+    def decorate(middleware):
+        middleware.action_types = frozenset(action_types)
+        return middleware
+    return decorate
 
 
 def apply_middleware(*middlewares):
     """
     creates an enhancer function composed of middleware
 
+    If any middleware declares action_types (see for_action_types()),
+    dispatch goes through a chain containing only the middleware
+    relevant to the action's type.  Chains are composed the first
+    time a type is seen and cached, so a middleware's next_ => dispatch
+    function may be called once per distinct chain.
+
+    With instrumentation hooks (see pydux.hooks) or metrics, dispatch
+    reports after_dispatch with the time spent in the whole chain.
+
     Args:
         *middlewares: list of middleware functions to apply
 
@@ -13,16 +48,73 @@ def apply_middleware(*middlewares):
         an enhancer for subsequent calls to create_store()
     """
     def inner(create_store_):
-        def create_wrapper(reducer, enhancer=None):
-            store = create_store_(reducer, enhancer)
+        def create_wrapper(reducer, enhancer=None, **options):
+            store = create_store_(reducer, enhancer, **options)
             dispatch = store['dispatch']
             middleware_api = {
                 'get_state': store['get_state'],
                 'dispatch': lambda action: dispatch(action),
             }
             chain = [mw(middleware_api) for mw in middlewares]
-            dispatch = compose(*chain)(store['dispatch'])
+            filters = [getattr(mw, 'action_types', None) for mw in middlewares]
+            if all(types is None for types in filters):
+                dispatch = compose(*chain)(store['dispatch'])
+            else:
+                dispatch = typed_dispatch(chain, filters, store['dispatch'])
+
+            hooks = get_hooks(options.get('hooks'))
+            if options.get('metrics') is not None:
+                hooks += (options['metrics'],)
+            if hooks:
+                dispatch = timed_dispatch(hooks, dispatch)
 
             return extend(store, {'dispatch': dispatch})
         return create_wrapper
     return inner
+
+
+def timed_dispatch(hooks, chain_dispatch):
+    """dispatch function that reports after_dispatch to hooks"""
+    def dispatch(action):
+        start = clock()
+        result = chain_dispatch(action)
+        call_hooks(hooks, 'after_dispatch', action, clock() - start)
+        return result
+    return dispatch
+
+
+def typed_dispatch(chain, filters, store_dispatch):
+    """
+    dispatch function that routes each action type through a cached
+    chain of only the middleware interested in it
+    """
+    chains_by_mask = {}
+    chains_by_type = {}
+
+    def chain_for(mask):
+        try:
+            return chains_by_mask[mask]
+        except KeyError:
+            composed = compose(*[chain[i] for i in mask])(store_dispatch)
+            chains_by_mask[mask] = composed
+            return composed
+
+    untyped = chain_for(tuple(i for i, types in enumerate(filters) if types is None))
+
+    def build(action_type):
+        return chain_for(tuple(i for i, types in enumerate(filters)
+                               if types is None or action_type in types))
+
+    def dispatch(action):
+        if not isinstance(action, dict):
+            return untyped(action)
+        action_type = action.get('type')
+        try:
+            fn = chains_by_type[action_type]
+        except KeyError:
+            fn = chains_by_type[action_type] = build(action_type)
+        except TypeError:  # unhashable type
+            fn = untyped
+        return fn(action)
+
+    return dispatch
@@ -1,9 +1,12 @@
 from __future__ import absolute_import
 
-import random
-from string import ascii_letters
+import binascii
+from collections import OrderedDict
+from itertools import islice
+import os
 
 from .create_store import ActionTypes
+from .hooks import call_hooks, get_hooks
 
 
 def get_undefined_state_error_message(key, action):
@@ -13,9 +16,19 @@ def get_undefined_state_error_message(key, action):
             'To ignore an action you must return the previous '
             'state.' % (action_name, key))
 
-def assert_reducer_sanity(reducers):
+def assert_reducer_sanity(reducers, dependencies=None):
+    # reducers with dependencies are given the initial states of
+    # their siblings, so reducers must be in dependency order
+    dependencies = dependencies or {}
+    initial_states = {}
     for key, reducer in reducers.items():
-        initial_state = reducer(None, {'type': ActionTypes.INIT})
+        deps = dependencies.get(key)
+        if deps is None:
+            call = reducer
+        else:
+            siblings = dict((dep, initial_states[dep]) for dep in deps)
+            call = lambda state, action: reducer(state, action, siblings)
+        initial_state = call(None, {'type': ActionTypes.INIT})
 
         if initial_state is None:
             msg = ('Reducer "%s" returned None during initialization. '
@@ -23,9 +36,10 @@ def assert_reducer_sanity(reducers):
                    'you must explicitly return the initial state. '
                    'The initial state may not be None.' % (key,))
             raise Exception(msg)
+        initial_states[key] = initial_state
         ty = ('@@redux/PROBE_UNKNOWN_ACTION_%s' %
-              ('.'.join(random.choice(ascii_letters) for _ in range(20)),))
-        if reducer(None, {'type': ty}) is None:
+              ('.'.join(binascii.hexlify(os.urandom(10)).decode('ascii')),))
+        if call(None, {'type': ty}) is None:
             msg = ('Reducer "%s" returned None when probed with a random type. '
                    'Don\'t try to handle %s or other actions in the "redux/*" '
                    'namespace. They are considered private. Instead, you must '
@@ -36,15 +50,193 @@ def assert_reducer_sanity(reducers):
             raise Exception(msg)
 
 
+def depends_on(*keys):
+    """
+    declares the sibling slices a reducer reads
+
+    usage:
+        @depends_on('todos')
+        def stats(state, action, siblings):
+            return {'count': len(siblings['todos'])}
+
+    combine_reducers() calls such a reducer as
+    reducer(state, action, siblings), where siblings is a dict of the
+    named slices, after their reducers have run for the action.
+
+    Args:
+        *keys: the state keys of the sibling slices
+
+    Returns:
+        decorator that sets the reducer's depends_on
+    """
+    def decorate(reducer):
+        reducer.depends_on = tuple(keys)
+        return reducer
+    return decorate
+
+
+def dependency_order(dependencies, keys):
+    """
+    returns keys sorted so that every key follows its dependencies,
+    otherwise keeping their order
+    """
+    known = set(keys)
+    for key in keys:
+        for dep in dependencies.get(key, ()):
+            if dep not in known:
+                raise ValueError('Reducer "%s" depends on unknown slice "%s".' % (key, dep))
+
+    ordered = []
+    done = set()
+    remaining = list(keys)
+    while remaining:
+        ready = [key for key in remaining
+                 if all(dep in done for dep in dependencies.get(key, ()))]
+        if not ready:
+            raise ValueError('Reducer dependencies form a cycle: %s' % (
+                ', '.join(sorted(str(key) for key in remaining)),))
+        ordered.extend(ready)
+        done.update(ready)
+        remaining = [key for key in remaining if key not in done]
+    return ordered
+
+
+_combination_factories = {}
+
+
+def _combination_factory_source(shape):
+    """
+    source of a function that binds the keys, reducers and
+    handled_types of a reducer tree with this shape and returns
+    an unrolled combination for it
+    """
+    count = len(shape)
+    names = []
+    for i in range(count):
+        names.extend(('k%d' % i, 'r%d' % i, 'h%d' % i))
+    lines = [
+        'def make_combination(bindings):',
+        '    %s, = bindings' % (', '.join(names),),
+        '    last = [None]',
+        '    def combination(state=None, action=None):',
+        '        if state is None:',
+        '            state = {}',
+        '        get = state.get',
+    ]
+    if any(handled for handled, _ in shape):
+        lines.extend([
+            "        action_type = action.get('type') if isinstance(action, dict) else None",
+            '        try:',
+            '            hash(action_type)',
+            '        except TypeError:',
+            '            action_type = None',
+        ])
+
+    for i, (handled, deps) in enumerate(shape):
+        if deps is None:
+            call = 'r%d(p%d, action)' % (i, i)
+        else:
+            call = 'r%d(p%d, action, {%s})' % (i, i, ', '.join(
+                'k%d: n%d' % (dep, dep) for dep in deps))
+        lines.append('        p%d = get(k%d)' % (i, i))
+        if not handled:
+            lines.extend([
+                '        n%d = %s' % (i, call),
+                '        if n%d is None:' % (i,),
+                '            raise Exception(get_undefined_state_error_message(k%d, action))' % (i,),
+                '        if n%d is not p%d and not n%d != p%d:' % (i, i, i, i),
+                '            n%d = p%d' % (i, i),
+            ])
+            continue
+        skip = 'p%d is not None and action_type not in h%d' % (i, i)
+        for dep in deps or ():
+            skip += ' and n%d is p%d' % (dep, dep)
+        lines.extend([
+            '        if %s:' % (skip,),
+            '            n%d = p%d' % (i, i),
+            '        else:',
+            '            n%d = %s' % (i, call),
+            '            if n%d is None:' % (i,),
+            '                raise Exception(get_undefined_state_error_message(k%d, action))' % (i,),
+            '            if n%d is not p%d and not n%d != p%d:' % (i, i, i, i),
+            '                n%d = p%d' % (i, i),
+        ])
 
+    # a state this combination returned has exactly its keys, in
+    # order, so copying it and storing the changed slices is cheaper
+    # than building the next state from scratch.
+    lines.append('        if (%s):' % (' and\n                '.join(
+        'n%d is p%d' % (i, i) for i in range(count)),))
+    lines.append('            return state')
+    lines.append('        if state is last[0]:')
+    lines.append('            next_state = state.copy()')
+    for i in range(count):
+        lines.append('            if n%d is not p%d:' % (i, i))
+        lines.append('                next_state[k%d] = n%d' % (i, i))
+    lines.append('        else:')
+    lines.append('            next_state = {%s}' % (', '.join('k%d: n%d' % (i, i) for i in range(count)),))
+    lines.append('        last[0] = next_state')
+    lines.append('        return next_state')
+    lines.append('    return combination')
+    return '\n'.join(lines)
 
-def combine_reducers(reducers):
+
+def compile_combination(final_reducers, dependencies):
+    """
+    returns a combination specialized for final_reducers
+
+    The generated function has the per-slice steps unrolled, with
+    keys, reducers and handled_types bound as closure variables,
+    and only builds the next state dict once a slice has changed.
+    When the state passed in is the one it returned last, the next
+    state is a copy of it with the changed slices replaced.
+    The code is generated once per tree shape (slice count, which
+    slices have handled_types and dependencies) and reused.
+    """
+    keys = list(final_reducers)
+    index = dict((key, i) for i, key in enumerate(keys))
+    shape = tuple(
+        (getattr(final_reducers[key], 'handled_types', None) is not None,
+         tuple(index[dep] for dep in dependencies[key]) if key in dependencies else None)
+        for key in keys)
+    try:
+        factory = _combination_factories[shape]
+    except KeyError:
+        namespace = {'get_undefined_state_error_message': get_undefined_state_error_message}
+        exec(_combination_factory_source(shape), namespace)
+        factory = _combination_factories[shape] = namespace['make_combination']
+
+    bindings = []
+    for key in keys:
+        reducer = final_reducers[key]
+        bindings.extend((key, reducer, getattr(reducer, 'handled_types', None)))
+    return factory(tuple(bindings))
+
+
+def combine_reducers(reducers, hooks=None, compile=False):
     """
     composition tool for creating reducer trees.
    
+    Reducers that declare `handled_types` (see handle_actions())
+    are only called for those action types once their slice has
+    been initialized.
+
+    Reducers that declare dependencies on sibling slices (see
+    depends_on()) are called after them, in the same pass, with
+    their updated values.  They are also called for unhandled
+    action types when one of their dependencies changed.
+
     Args:
         reducers: dict with state keys and reducer functions
                   that are responsible for each key
+        hooks: optional list of instrumentation hooks, in addition
+               to those registered with add_hook() (see pydux.hooks)
+        compile: if True, generate a combination specialized for
+                 this set of keys (see compile_combination()).  it
+                 behaves the same.  it is mostly faster when slices
+                 change; when none do, the gain shrinks as the tree
+                 grows and is gone at a few hundred keys (see
+                 bench/bench_combine_reducers.py).
 
     Returns:
         a new, combined reducer function
@@ -52,30 +244,82 @@ def combine_reducers(reducers):
     final_reducers = {key: reducer
                       for key, reducer in reducers.items()
                       if hasattr(reducer, '__call__')}
+    dependencies = dict((key, tuple(reducer.depends_on))
+                        for key, reducer in final_reducers.items()
+                        if getattr(reducer, 'depends_on', None) is not None)
+    if dependencies:
+        order = dependency_order(dependencies, list(final_reducers))
+        final_reducers = OrderedDict((key, final_reducers[key]) for key in order)
 
     sanity_error = None
     try:
-        assert_reducer_sanity(final_reducers)
+        assert_reducer_sanity(final_reducers, dependencies)
     except Exception as e:
         sanity_error = e
 
+    # the next state is only allocated once a slice has changed,
+    # starting with the previous values of the slices before it.
+    # slices whose new value is equal to the previous one keep the
+    # previous object.  deps is None for slices without dependencies.
+    routes = [(key, reducer, getattr(reducer, 'handled_types', None),
+               dependencies.get(key))
+              for key, reducer in final_reducers.items()]
+    keys = list(final_reducers)
+
     def combination(state=None, action=None):
         if state is None:
             state = {}
         if sanity_error:
             raise sanity_error
 
-        has_changed = False
-        next_state = {}
-        for key, reducer in final_reducers.items():
+        action_type = action.get('type') if isinstance(action, dict) else None
+        try:
+            hash(action_type)
+        except TypeError:  # unhashable type, handled by no reducer
+            action_type = None
+        next_state = None
+        for index, (key, reducer, handled_types, deps) in enumerate(routes):
             previous_state_for_key = state.get(key)
-            next_state_for_key = reducer(previous_state_for_key, action)
+            if (handled_types is not None and
+                    previous_state_for_key is not None and
+                    action_type not in handled_types and
+                    (deps is None or next_state is None or
+                     all(next_state[dep] is state.get(dep) for dep in deps))):
+                if next_state is not None:
+                    next_state[key] = previous_state_for_key
+                continue
+            if deps is None:
+                next_state_for_key = reducer(previous_state_for_key, action)
+            else:
+                current = state if next_state is None else next_state
+                siblings = dict((dep, current[dep]) for dep in deps)
+                next_state_for_key = reducer(previous_state_for_key, action, siblings)
             if next_state_for_key is None:
                 msg = get_undefined_state_error_message(key, action)
                 raise Exception(msg)
-            next_state[key] = next_state_for_key
-            has_changed = (has_changed or
-                           next_state_for_key != previous_state_for_key)
-        return next_state if has_changed else state
+            if (next_state_for_key is not previous_state_for_key and
+                    next_state_for_key != previous_state_for_key):
+                if next_state is None:
+                    next_state = {key_: state.get(key_) for key_ in islice(keys, index)}
+                next_state[key] = next_state_for_key
+            elif next_state is not None:
+                next_state[key] = previous_state_for_key
+        return state if next_state is None else next_state
+
+    if compile and final_reducers and not sanity_error:
+        combination = compile_combination(final_reducers, dependencies)
+
+    hooks = get_hooks(hooks)
+    if not hooks:
+        return combination
+
+    def hooked_combination(state=None, action=None):
+        next_state = combination(state, action)
+        if next_state is not state:
+            state = state or {}
+            for key in final_reducers:
+                if next_state.get(key) is not state.get(key):
+                    call_hooks(hooks, 'slice_changed', key, action)
+        return next_state
 
-    return combination
+    return hooked_combination
@@ -10,24 +10,150 @@ names in JavaScript, so they are read-only.  Single-
 element arrays are used to create read/write closures.
 
 """
+from collections import deque, OrderedDict
+from functools import partial
+from itertools import count
+from .hooks import call_hooks, clock, get_hooks
 
 
 class ActionTypes(object):
     INIT = '@@redux/INIT'
 
 
+class ListenerError(Exception):
+    """
+    raised after notification when listeners of a store created
+    with isolate_listeners=True raised.  errors is a list of
+    (listener, exception) pairs.
+    """
+    def __init__(self, errors):
+        Exception.__init__(self, '%d listener(s) raised: %s' % (
+            len(errors), '; '.join(repr(e) for _, e in errors)))
+        self.errors = errors
+
+
 class StoreDict(dict):
     def get_state(self):
         return self['get_state']()
-    def subscribe(self, listener):
-        return self['subscribe'](listener)
+    def subscribe(self, listener, weak=False):
+        return self['subscribe'](listener, weak)
     def dispatch(self, action):
         return self['dispatch'](action)
     def replace_reducer(self, next_reducer):
         return self['replace_reducer'](next_reducer)
+    def listener_count(self):
+        return self['subscribe'].listener_count()
+
+
+def make_weak_listener(listener, on_dead):
+    """
+    wrap listener in a callable that holds it by weak reference
+
+    bound methods are held through their instance so that the
+    listener lives as long as the instance, not as long as the
+    short-lived bound method object.  on_dead() is called instead
+    of the listener once it has been collected.
+    """
+    import weakref  # only needed for weak subscriptions
+
+    instance = getattr(listener, '__self__', None)
+    if instance is None:
+        ref = weakref.ref(listener)
+    elif hasattr(weakref, 'WeakMethod'):  # python 3.4+
+        ref = weakref.WeakMethod(listener)
+    else:
+        instance_ref = weakref.ref(instance)
+        function = listener.__func__
+
+        def ref():
+            obj = instance_ref()
+            return None if obj is None else function.__get__(obj, type(obj))
+
+    def weak_listener():
+        fn = ref()
+        if fn is None:
+            on_dead()
+        else:
+            fn()
+    weak_listener.ref = ref
+    return weak_listener
+
+
+class _NoLock(object):
+    def __enter__(self):
+        pass
+    def __exit__(self, *exc_info):
+        pass
+
+
+def create_listener_registry(lock=None):
+    """
+    listener registry of a store
+
+    listeners are keyed by a per-subscription token so that
+    subscribe/unsubscribe are O(1).  get_snapshot() returns a
+    cached list of the listeners, which is only rebuilt after the
+    registry has changed.
+
+    Args:
+        lock: optional lock guarding the registry, for stores that
+              notify from several threads
+
+    Returns:
+        (subscribe, get_snapshot).  subscribe.listener_count()
+        returns the number of live listeners.
+    """
+    if lock is None:
+        lock = _NoLock()
+    listeners = OrderedDict()
+    listeners_snapshot = [None]
+    weak_refs = {}
+    next_token = partial(next, count())
+
+    def remove_listener(token):
+        with lock:
+            if listeners.pop(token, None) is not None:
+                weak_refs.pop(token, None)
+                listeners_snapshot[0] = None
+
+    def subscribe(listener, weak=False):
+        if not hasattr(listener, '__call__'):
+            raise TypeError('Expected listener to be a function.')
+
+        token = next_token()
+
+        def unsubcribe():
+            remove_listener(token)
+
+        if weak:
+            listener = make_weak_listener(listener, unsubcribe)
+        with lock:
+            if weak:
+                weak_refs[token] = listener.ref
+            listeners[token] = listener
+            listeners_snapshot[0] = None
+
+        return unsubcribe
+
+    def listener_count():
+        for token, ref in list(weak_refs.items()):
+            if ref() is None:
+                remove_listener(token)
+        return len(listeners)
+
+    subscribe.listener_count = listener_count
 
+    def get_snapshot():
+        snapshot = listeners_snapshot[0]
+        if snapshot is None:
+            with lock:
+                snapshot = listeners_snapshot[0] = list(listeners.values())
+        return snapshot
 
-def create_store(reducer, initial_state=None, enhancer=None):
+    return subscribe, get_snapshot
+
+
+def create_store(reducer, initial_state=None, enhancer=None, **options):
     """
     redux in a nutshell.
 
@@ -37,6 +163,29 @@ def create_store(reducer, initial_state=None, enhancer=None):
         reducer: root reducer function for the state tree
         initial_state: optional initial state data
         enhancer: optional enhancer function for middleware etc.
+        **options: keyword options, passed on to the enhancer:
+            queue_dispatch: if True, actions dispatched by listeners
+                are queued and reduced by the outermost dispatch()
+                once its notification is done, instead of recursing.
+                The nested dispatch() returns before its action has
+                been reduced.
+            coalesce_notifications: with queue_dispatch, notify
+                listeners once after the queue has been drained
+                instead of once per queued action.
+            isolate_listeners: if True, a listener raising does not
+                stop the other listeners from being notified.  The
+                errors are collected and raised together as a
+                ListenerError once all listeners ran.
+            on_listener_error: function (action, listener, exception)
+                called for each listener error instead of raising.
+                Implies isolate_listeners.
+            hooks: list of instrumentation hooks for this store, in
+                addition to those registered with add_hook() (see
+                pydux.hooks).  Hooks are captured when the store is
+                created; a store without hooks runs an uninstrumented
+                dispatch.
+            metrics: a pydux.metrics.Metrics to collect the store's
+                metrics, added to its hooks.
 
     Returns:
         a Pydux store
@@ -44,46 +193,37 @@ def create_store(reducer, initial_state=None, enhancer=None):
     if enhancer is not None:
         if not hasattr(enhancer, '__call__'):
             raise TypeError('Expected the enhancer to be a function.')
-        return enhancer(create_store)(reducer, initial_state)
+        return enhancer(create_store)(reducer, initial_state, **options)
 
     if not hasattr(reducer, '__call__'):
         raise TypeError('Expected the reducer to be a function.')
 
+    hooks = get_hooks(options.pop('hooks', None))
+    metrics = options.pop('metrics', None)
+    if metrics is not None:
+        hooks += (metrics,)
+    queue_dispatch = options.pop('queue_dispatch', False)
+    coalesce_notifications = options.pop('coalesce_notifications', False)
+    on_listener_error = options.pop('on_listener_error', None)
+    isolate_listeners = (options.pop('isolate_listeners', False) or
+                         on_listener_error is not None)
+    if options:
+        raise TypeError('Unexpected option(s): %s' % (', '.join(sorted(options)),))
+
     # single-element arrays for r/w closure
     current_reducer = [reducer]
     current_state = [initial_state]
-    current_listeners = [[]]
-    next_listeners = [current_listeners[0]]
     is_dispatching = [False]
 
-    def ensure_can_mutate_next_listeners():
-        if next_listeners[0] == current_listeners[0]:
-            next_listeners[0] = current_listeners[0][:]
+    subscribe, get_snapshot = create_listener_registry()
 
     def get_state():
         return current_state[0]
 
-    def subscribe(listener):
-        if not hasattr(listener, '__call__'):
-            raise TypeError('Expected listener to be a function.')
-
-        is_subscribed = [True]  # r/w closure
-
-        ensure_can_mutate_next_listeners()
-        next_listeners[0].append(listener)
+    pending = deque()
+    is_notifying = [False]
 
-        def unsubcribe():
-            if not is_subscribed[0]:
-                return
-            is_subscribed[0] = False
-
-            ensure_can_mutate_next_listeners()
-            index = next_listeners[0].index(listener)
-            next_listeners[0].pop(index)
-
-        return unsubcribe
-
-    def dispatch(action):
+    def check_action(action):
         if not isinstance(action, dict):
             raise TypeError('Actions must be a dict. '
                             'Use custom middleware for async actions.')
@@ -92,6 +232,9 @@ def create_store(reducer, initial_state=None, enhancer=None):
             raise ValueError('Actions must have a non-None "type" property. '
                              'Have you misspelled a constant?')
 
+    def reduce_action(action):
+        check_action(action)
+
         if is_dispatching[0]:
             raise Exception('Reducers may not dispatch actions.')
 
@@ -101,12 +244,112 @@ def create_store(reducer, initial_state=None, enhancer=None):
         finally:
             is_dispatching[0] = False
 
-        listeners = current_listeners[0] = next_listeners[0]
-        for listener in listeners:
+    def notify_listeners(action):
+        for listener in get_snapshot():
             listener()
 
+    def run_listeners_guarded(snapshot):
+        # one try block around the whole loop; after an error the
+        # loop resumes from the shared iterator.
+        errors = None
+        remaining = iter(snapshot)
+        while True:
+            try:
+                for listener in remaining:
+                    listener()
+            except Exception as e:
+                if errors is None:
+                    errors = []
+                errors.append((listener, e))
+                continue
+            return errors
+
+    def report_listener_errors(action, errors):
+        if on_listener_error is None:
+            raise ListenerError(errors)
+        for listener, e in errors:
+            on_listener_error(action, listener, e)
+
+    def isolated_notify(action):
+        errors = run_listeners_guarded(get_snapshot())
+        if errors:
+            report_listener_errors(action, errors)
+
+    def hooked_reduce(action):
+        call_hooks(hooks, 'before_dispatch', action)
+        start = clock()
+        reduce_action(action)
+        call_hooks(hooks, 'after_reduce', action, clock() - start)
+
+    def hooked_notify(action):
+        snapshot = get_snapshot()
+        start = clock()
+        try:
+            for listener in snapshot:
+                listener()
+        except Exception as e:
+            call_hooks(hooks, 'listener_error', action, listener, e)
+            raise
+        call_hooks(hooks, 'after_notify', action, len(snapshot), clock() - start)
+
+    def hooked_isolated_notify(action):
+        snapshot = get_snapshot()
+        start = clock()
+        errors = run_listeners_guarded(snapshot)
+        for listener, e in errors or ():
+            call_hooks(hooks, 'listener_error', action, listener, e)
+        call_hooks(hooks, 'after_notify', action, len(snapshot), clock() - start)
+        if errors:
+            report_listener_errors(action, errors)
+
+    if hooks:
+        do_reduce = hooked_reduce
+        do_notify = hooked_isolated_notify if isolate_listeners else hooked_notify
+    else:
+        do_reduce = reduce_action
+        do_notify = isolated_notify if isolate_listeners else notify_listeners
+
+    def dispatch(action):
+        reduce_action(action)
+        notify_listeners(action)
         return action
 
+    def staged_dispatch(action):
+        do_reduce(action)
+        do_notify(action)
+        return action
+
+    if hooks or isolate_listeners:
+        dispatch = staged_dispatch
+
+    def queued_dispatch(action):
+        if is_notifying[0]:
+            check_action(action)
+            if is_dispatching[0]:
+                raise Exception('Reducers may not dispatch actions.')
+            pending.append(action)
+            return action
+
+        do_reduce(action)
+        is_notifying[0] = True
+        try:
+            do_notify(action)
+            while pending:
+                action_ = pending.popleft()
+                do_reduce(action_)
+                if coalesce_notifications and pending:
+                    continue
+                do_notify(action_)
+        except Exception:
+            pending.clear()
+            raise
+        finally:
+            is_notifying[0] = False
+        return action
+
+    if queue_dispatch:
+        dispatch = queued_dispatch
+
     def replace_reducer(next_reducer):
         if not hasattr(next_reducer, '__call__'):
             raise TypeError('Expected next_reducer to be a function')
@@ -0,0 +1,155 @@
+"""
+structural diff/patch for state trees
+
+diff() compares two states and returns a list of patch
+operations, each a dict:
+
+    {'op': 'add', 'path': [...], 'value': v}
+    {'op': 'replace', 'path': [...], 'value': v}
+    {'op': 'remove', 'path': [...]}
+
+path is the list of dict keys / list indexes leading to the
+changed value; an empty path replaces the whole state.  Subtrees
+that are the same object in both states are skipped without
+being visited, so unchanged slices from combine_reducers() cost
+O(1).  Dicts (any Mapping) and lists are diffed recursively;
+everything else is compared with == and replaced as a whole.
+
+patch() applies a list of operations to a state and returns the
+new state, leaving the original untouched.
+"""
+try:
+    from collections.abc import Mapping
+except ImportError:  # python 2
+    from collections import Mapping
+
+
+_missing = object()
+
+
+def _diff(prev, next_, path, out):
+    if prev is next_:
+        return
+
+    if isinstance(prev, Mapping) and isinstance(next_, Mapping):
+        for key, value in next_.items():
+            previous_value = prev.get(key, _missing)
+            if previous_value is _missing:
+                out.append({'op': 'add', 'path': path + [key], 'value': value})
+            else:
+                _diff(previous_value, value, path + [key], out)
+        for key in prev:
+            if key not in next_:
+                out.append({'op': 'remove', 'path': path + [key]})
+        return
+
+    if isinstance(prev, list) and isinstance(next_, list):
+        common = min(len(prev), len(next_))
+        for index in range(common):
+            _diff(prev[index], next_[index], path + [index], out)
+        for index in range(common, len(next_)):
+            out.append({'op': 'add', 'path': path + [index], 'value': next_[index]})
+        for index in reversed(range(common, len(prev))):
+            out.append({'op': 'remove', 'path': path + [index]})
+        return
+
+    if type(prev) is not type(next_) or prev != next_:
+        out.append({'op': 'replace', 'path': path, 'value': next_})
+
+
+def diff(prev, next_):
+    """
+    computes the patch operations that turn prev into next_
+
+    Args:
+        prev: previous state
+        next_: next state
+
+    Returns:
+        list of patch operations, empty if nothing changed
+    """
+    out = []
+    _diff(prev, next_, [], out)
+    return out
+
+
+def patch(state, operations):
+    """
+    applies patch operations produced by diff()
+
+    Containers along each path are shallow-copied once per call;
+    untouched subtrees are shared with the input state.  Mappings
+    are copied into plain dicts.
+
+    Args:
+        state: state to patch
+        operations: list of patch operations
+
+    Returns:
+        the patched state
+    """
+    copied = {}  # id => copy; holding the copy keeps the id unique
+
+    def writable(obj):
+        if id(obj) in copied:
+            return obj
+        obj = list(obj) if isinstance(obj, list) else dict(obj)
+        copied[id(obj)] = obj
+        return obj
+
+    root = state
+    for operation in operations:
+        op, path = operation['op'], operation['path']
+        if not path:
+            if op == 'remove':
+                raise ValueError('Cannot remove the root of the state.')
+            root = operation['value']
+            copied.clear()
+            continue
+
+        node = root = writable(root)
+        for key in path[:-1]:
+            child = node[key] = writable(node[key])
+            node = child
+
+        key = path[-1]
+        if op == 'remove':
+            del node[key]
+        elif op == 'replace':
+            node[key] = operation['value']
+        elif op == 'add':
+            if isinstance(node, list) and key == len(node):
+                node.append(operation['value'])
+            else:
+                node[key] = operation['value']
+        else:
+            raise ValueError('Unknown patch operation "%s".' % (op,))
+    return root
+
+
+def subscribe_patches(store, callback):
+    """
+    subscribes callback to the patches between successive states
+
+    callback(operations) is called after each dispatch that changed
+    the state.  The caller is expected to have already shipped the
+    state as of subscription time.
+
+    Args:
+        store: a pydux store
+        callback: function taking a list of patch operations
+
+    Returns:
+        the unsubscribe function
+    """
+    get_state = store['get_state']
+    last_state = [get_state()]
+
+    def listener():
+        state = get_state()
+        operations = diff(last_state[0], state)
+        last_state[0] = state
+        if operations:
+            callback(operations)
+
+    return store['subscribe'](listener)
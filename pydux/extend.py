@@ -1,3 +1,9 @@
+try:
+    from collections.abc import Mapping
+except ImportError:  # python 2
+    from collections import Mapping
+
+
 def extend(*args):
     """shallow dictionary merge
 
@@ -7,13 +13,150 @@ def extend(*args):
 
     Returns:
         new instance of the same type as _a_, with _a_ and _b_ merged.
+        when _a_ is an OverlayDict the result is another OverlayDict
+        (see extend_overlay()), not a dict.
     """
     if not args:
         return {}
 
     first = args[0]
+    if isinstance(first, OverlayDict):
+        return extend_overlay(*args)
     rest = args[1:]
     out = type(first)(first)
     for each in rest:
         out.update(each)
     return out
+
+
+class OverlayDict(Mapping):
+    """read-only layered view over a base mapping and its updates
+
+    Layers are kept newest first.  The base mapping is shared, not
+    copied, so it must not be mutated afterwards -- the usual rule
+    for state in a pydux store.  Once the chain grows deeper than
+    max_depth the layers are merged into a single dict.
+
+    Key lookups walk the layers.  Whole-mapping operations (len,
+    iteration, items, ...) merge the layers once and cache the
+    result, which later overlays reuse as their base.
+
+    An OverlayDict is a Mapping, not a dict: isinstance(x, dict) is
+    False, there is no copy() or other mutating method, and
+    json.dumps() cannot encode it.  Use to_dict() where a plain dict
+    is needed.
+    """
+    max_depth = 8
+
+    def __init__(self, *maps):
+        layers = []
+        for each in maps:
+            if isinstance(each, OverlayDict):
+                if each._flat is not None:
+                    layers.insert(0, each._flat)
+                else:
+                    layers[:0] = each._layers
+            elif each:
+                layers.insert(0, each)
+        if len(layers) > self.max_depth:
+            layers = [_merge(layers)]
+        self._layers = tuple(layers)
+        self._flat = layers[0] if len(layers) == 1 else None
+
+    def __getitem__(self, key):
+        for layer in self._layers:
+            value = layer.get(key, _missing)
+            if value is not _missing:
+                return value
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        for layer in self._layers:
+            value = layer.get(key, _missing)
+            if value is not _missing:
+                return value
+        return default
+
+    def __contains__(self, key):
+        for layer in self._layers:
+            if key in layer:
+                return True
+        return False
+
+    def _flattened(self):
+        if self._flat is None:
+            self._flat = _merge(self._layers) if self._layers else {}
+        return self._flat
+
+    def __iter__(self):
+        return iter(self._flattened())
+
+    def __len__(self):
+        return len(self._flattened())
+
+    def keys(self):
+        return self._flattened().keys()
+
+    def items(self):
+        return self._flattened().items()
+
+    def values(self):
+        return self._flattened().values()
+
+    def __eq__(self, other):
+        if other is self:
+            return True
+        if isinstance(other, OverlayDict):
+            other = other._flattened()
+        return self._flattened() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    @property
+    def depth(self):
+        """number of layers currently in the chain"""
+        return len(self._layers)
+
+    def to_dict(self):
+        """returns a plain dict copy"""
+        return dict(self._flattened())
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self._flattened())
+
+
+_missing = object()
+
+
+def _merge(layers):
+    out = dict(layers[-1])
+    for layer in reversed(layers[:-1]):
+        out.update(layer)
+    return out
+
+
+def extend_overlay(*args):
+    """copy-on-write variant of extend()
+
+    Instead of copying _a_, returns an OverlayDict that layers the
+    updates over it.  Each update is copied (they are expected to
+    be small); _a_ is shared.
+
+    The result is not a dict (see OverlayDict) and extend() keeps
+    returning overlays once given one, so the whole subtree built
+    from it stays overlays.  Call to_dict() before handing it to
+    code that expects a dict, such as json.dumps().
+
+    Args:
+        a: mapping to extend
+        b: dict to apply to a
+
+    Returns:
+        new OverlayDict with _a_ and _b_ merged.
+    """
+    if not args:
+        return OverlayDict()
+    return OverlayDict(args[0], *[dict(each) for each in args[1:]])
@@ -0,0 +1,65 @@
+"""
+table-driven reducers
+
+Instead of an if/elif chain over action['type'], a reducer is
+described by a dict mapping action types to handler functions.
+Dispatch is a single dict lookup regardless of the number of
+handled types.
+"""
+
+
+def handle_actions(handlers, default_state=None):
+    """
+    creates a reducer from a {type: handler} lookup table
+
+    Each handler has the (state, action) => state signature and is
+    only called for actions of its type.  Unknown actions return the
+    current state unchanged.
+
+    The returned reducer carries a `handled_types` frozenset, which
+    combine_reducers() uses to skip the reducer for unrelated actions.
+
+    Args:
+        handlers: dict of action type => handler function
+        default_state: state used when the reducer receives None
+
+    Returns:
+        a reducer function
+    """
+    for action_type, handler in handlers.items():
+        if not hasattr(handler, '__call__'):
+            raise TypeError('Expected the handler for "%s" to be a '
+                            'function.' % (action_type,))
+
+    table = dict(handlers)
+    lookup = table.get
+
+    def reducer(state=None, action=None):
+        if state is None:
+            state = default_state
+        if not isinstance(action, dict):
+            return state
+        try:
+            handler = lookup(action.get('type'))
+        except TypeError:  # unhashable type
+            return state
+        if handler is None:
+            return state
+        return handler(state, action)
+
+    reducer.handled_types = frozenset(table)
+    return reducer
+
+
+def create_reducer(initial_state, handlers):
+    """
+    Redux-docs style spelling of handle_actions()
+
+    Args:
+        initial_state: state used when the reducer receives None
+        handlers: dict of action type => handler function
+
+    Returns:
+        a reducer function
+    """
+    return handle_actions(handlers, initial_state)
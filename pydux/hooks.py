@@ -0,0 +1,61 @@
+"""
+instrumentation hooks
+
+Modeled on sys.audit(): a hook is a function hook(event, args)
+where event is a string and args a tuple.  Hooks are registered
+globally with add_hook(), or per store with create_store(...,
+hooks=[...]) and per reducer tree with combine_reducers(...,
+hooks=[...]).  pydux.metrics.Metrics is a hook.
+
+Stores and combined reducers pick up the registered hooks when
+they are created.  When there are none they run their usual
+uninstrumented code, so hooks cost nothing unless used.
+
+events:
+    before_dispatch  (action,)
+    after_reduce     (action, seconds spent in the reducer)
+    after_notify     (action, listener count, seconds spent notifying)
+    listener_error   (action, listener, exception)
+                     the exception is re-raised after the hooks ran
+    slice_changed    (key, action)
+                     from combine_reducers(), per changed slice
+    after_dispatch   (action, seconds spent in dispatch())
+                     from apply_middleware(), for the whole chain
+"""
+import time
+
+
+clock = getattr(time, 'perf_counter', time.time)
+
+_hooks = []
+
+
+def add_hook(hook):
+    """
+    registers hook(event, args) for stores and reducer trees
+    created from now on
+    """
+    if not hasattr(hook, '__call__'):
+        raise TypeError('Expected the hook to be a function.')
+    _hooks.append(hook)
+
+
+def remove_hook(hook):
+    """unregisters a hook added with add_hook()"""
+    _hooks.remove(hook)
+
+
+def get_hooks(extra=None):
+    """returns the registered hooks followed by extra, as a tuple"""
+    hooks = tuple(_hooks)
+    if extra:
+        for hook in extra:
+            if not hasattr(hook, '__call__'):
+                raise TypeError('Expected the hook to be a function.')
+        hooks += tuple(extra)
+    return hooks
+
+
+def call_hooks(hooks, event, *args):
+    for hook in hooks:
+        hook(event, args)
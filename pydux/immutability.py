@@ -0,0 +1,217 @@
+"""
+state mutation detection
+
+Reducers must return new objects instead of changing the state in
+place.  A mutated dict or list keeps its identity, so
+combine_reducers(), memoize_reducer() and selectors take it to be
+unchanged and silently work on stale data.
+
+MutationChecker remembers a shallow fingerprint of every container
+in the state tree -- its keys and the identities of its children --
+by key path.  After a dispatch, the tree is walked only where
+identities changed.  Containers found with the same identity as
+before have their fingerprint recomputed and compared, and the
+remaining cached containers are re-verified in rotation, at most
+max_nodes per check, so that deep mutations are caught without
+walking the whole tree on every dispatch.
+
+Only dicts (Mappings), lists, tuples and sets are inspected; other
+objects in the state are compared by equality with themselves.
+"""
+from collections import deque
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # python 2
+    from collections import Mapping
+
+from .extend import extend
+from .sampling import create_sampler
+
+
+class MutationError(Exception):
+    """
+    raised when a container in the state was changed in place.
+    path is the tuple of keys leading to it from the root.
+    """
+    def __init__(self, path, action):
+        Exception.__init__(self, 'State mutated at %r, detected after %r.' % (path, action))
+        self.path = path
+        self.action = action
+
+
+def _is_container(value):
+    return isinstance(value, (Mapping, list, tuple, set, frozenset))
+
+
+def _token(value):
+    return id(value) if _is_container(value) else value
+
+
+def _fingerprint(node):
+    """shallow fingerprint of a container, or None for other values"""
+    if isinstance(node, Mapping):
+        return tuple([(key, _token(value)) for key, value in node.items()])
+    if isinstance(node, (list, tuple)):
+        return tuple([_token(value) for value in node])
+    if isinstance(node, (set, frozenset)):
+        return frozenset(node)
+    return None
+
+
+def _children(node):
+    if isinstance(node, Mapping):
+        return node.items()
+    if isinstance(node, (list, tuple)):
+        return enumerate(node)
+    return ()
+
+
+def _child_keys(node, fingerprint):
+    if isinstance(node, Mapping):
+        return [key for key, _ in fingerprint]
+    if isinstance(node, (list, tuple)):
+        return range(len(fingerprint))
+    return ()
+
+
+class MutationChecker(object):
+    """
+    finds containers changed in place between checks
+
+    Args:
+        max_nodes: maximum number of unchanged containers re-verified
+                   per check, or None to verify all of them
+    """
+    def __init__(self, max_nodes=None):
+        if max_nodes is not None and max_nodes < 0:
+            raise ValueError('max_nodes must not be negative.')
+        self.max_nodes = max_nodes
+        self._cache = {}  # path => (node, fingerprint)
+        self._rotation = deque()
+        self._queued = set()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def check(self, state):
+        """
+        compares state with the state seen by the previous check
+
+        Returns:
+            list of key paths of the containers found mutated
+        """
+        mutated = []
+        self._walk([((), state)], mutated)
+        self._verify_rotation(mutated)
+        return mutated
+
+    def _walk(self, stack, mutated):
+        cache = self._cache
+        while stack:
+            path, node = stack.pop()
+            entry = cache.get(path)
+            fingerprint = _fingerprint(node)
+            if fingerprint is None:
+                if entry is not None:
+                    self._forget(path)
+                continue
+            if entry is not None and entry[0] is node:
+                if entry[1] == fingerprint:
+                    continue
+                mutated.append(path)
+            self._remember(path, entry, node, fingerprint, stack)
+
+    def _remember(self, path, entry, node, fingerprint, stack):
+        self._cache[path] = (node, fingerprint)
+        if path not in self._queued:
+            self._queued.add(path)
+            self._rotation.append(path)
+        if entry is not None:
+            keys = set(_child_keys(node, fingerprint))
+            for key in _child_keys(entry[0], entry[1]):
+                if key not in keys:
+                    self._forget(path + (key,))
+        for key, child in _children(node):
+            stack.append((path + (key,), child))
+
+    def _forget(self, path):
+        entry = self._cache.pop(path, None)
+        if entry is not None:
+            for key in _child_keys(entry[0], entry[1]):
+                self._forget(path + (key,))
+
+    def _verify_rotation(self, mutated):
+        cache, rotation = self._cache, self._rotation
+        budget = len(rotation)
+        if self.max_nodes is not None:
+            budget = min(budget, self.max_nodes)
+        for _ in range(budget):
+            path = rotation.popleft()
+            entry = cache.get(path)
+            if entry is None:
+                self._queued.discard(path)
+                continue
+            rotation.append(path)
+            node = entry[0]
+            fingerprint = _fingerprint(node)
+            if fingerprint != entry[1]:
+                mutated.append(path)
+                stack = []
+                self._remember(path, entry, node, fingerprint, stack)
+                self._walk(stack, mutated)
+
+
+def check_immutability(sample_rate=1.0, max_nodes=None, on_mutation=None):
+    """
+    creates an enhancer that detects state mutation
+
+    usage:
+        store = create_store(reducer, None, check_immutability())
+
+    The state is checked after sampled dispatches (see
+    MutationChecker).  In development the defaults check every
+    dispatch completely; in production a low sample_rate and a
+    max_nodes budget bound the cost while still eventually finding
+    a mutated container.
+
+    Args:
+        sample_rate: fraction of dispatches after which the state is
+                     checked, spread evenly.  1 checks every dispatch; e.g. 0.01
+                     checks after every 100th; 0 disables checking.
+        max_nodes: maximum number of unchanged containers re-verified
+                   per check, or None for all of them
+        on_mutation: optional function (path, action) called for each
+                     mutated container instead of raising MutationError
+
+    Returns:
+        an enhancer for create_store()
+    """
+    if not 0 <= sample_rate <= 1:
+        raise ValueError('sample_rate must be between 0 and 1.')
+
+    def enhancer(create_store_):
+        def create_checked_store(reducer, initial_state=None, **options):
+            store = create_store_(reducer, initial_state, **options)
+            if not sample_rate:
+                return store
+
+            get_state, store_dispatch = store['get_state'], store['dispatch']
+            checker = MutationChecker(max_nodes)
+            checker.check(get_state())
+            sample = create_sampler(sample_rate)
+
+            def dispatch(action):
+                result = store_dispatch(action)
+                if sample_rate < 1 and not sample():
+                    return result
+
+                for path in checker.check(get_state()):
+                    if on_mutation is None:
+                        raise MutationError(path, action)
+                    on_mutation(path, action)
+                return result
+
+            return extend(store, {'dispatch': dispatch})
+        return create_checked_store
+    return enhancer
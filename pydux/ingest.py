@@ -0,0 +1,288 @@
+"""
+action stream ingestion
+
+Ingest feeds a store from a stream of raw actions: an iterator
+(e.g. the lines of a file or socket), an async iterator, or a
+queue.  A reader thread pulls raw items into a bounded buffer and
+the dispatching thread takes them out in batches, decodes each
+batch with one call and dispatches it as a single BATCH action.
+
+The buffer has high and low water marks.  Once it holds high_water
+items the reader stops pulling from the source until the store has
+caught up to low_water, so a fast source is slowed down instead of
+growing the buffer.
+
+The store's reducer has to understand BATCH actions, see
+enable_batching().
+"""
+from collections import deque, namedtuple
+import json
+import threading
+import time
+
+
+BATCH = '@@pydux/BATCH'
+
+IngestStats = namedtuple('IngestStats', ['received', 'dispatched', 'batches',
+                                         'buffered', 'pauses', 'throughput', 'lag'])
+
+
+def batch(actions):
+    """returns an action that reduces actions in order"""
+    return {'type': BATCH, 'payload': actions}
+
+
+def enable_batching(reducer):
+    """
+    higher-order reducer that handles BATCH actions
+
+    A BATCH action is reduced as its actions in order, in one
+    dispatch, so listeners are notified once per batch.
+    """
+    def batching_reducer(state=None, action=None):
+        if isinstance(action, dict) and action.get('type') == BATCH:
+            for action_ in action['payload']:
+                state = reducer(state, action_)
+            return state
+        return reducer(state, action)
+
+    if hasattr(reducer, 'handled_types'):
+        batching_reducer.handled_types = reducer.handled_types | frozenset([BATCH])
+    return batching_reducer
+
+
+def decode_json(items):
+    """decodes a batch of JSON texts, skipping blank lines"""
+    return [json.loads(item) for item in items if item.strip()]
+
+
+def _iterate_async(source):
+    import asyncio
+
+    loop = asyncio.new_event_loop()
+    iterator = source.__aiter__()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(iterator.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.close()
+
+
+class Ingest(object):
+    """
+    dispatches actions read from a source, with backpressure
+
+    usage:
+        ingest = Ingest(store, open('actions.jsonl'), decode=decode_json)
+        ingest.run()
+
+    run() blocks until the source is exhausted.  Applications with
+    their own loop call start() once and pump() periodically.
+
+    Args:
+        store: the store to dispatch to
+        source: iterable, async iterable, or queue (anything with
+                get(timeout=...) and no __iter__).  a queue source
+                ends when it yields None.
+        decode: function list of raw items => list of actions
+        batch_size: maximum number of actions per dispatch
+        high_water: buffered items at which reading pauses
+        low_water: buffered items at which reading resumes,
+                   by default half of high_water
+        batched: if False, dispatch the actions of a batch one by
+                 one instead of as a BATCH action
+        clock: function returning the current time in seconds
+    """
+    poll_interval = 0.1
+
+    def __init__(self, store, source, decode=None, batch_size=100,
+                 high_water=10000, low_water=None, batched=True, clock=time.time):
+        if batch_size < 1:
+            raise ValueError('batch_size must be at least 1.')
+        if high_water < 1:
+            raise ValueError('high_water must be at least 1.')
+        if low_water is None:
+            low_water = high_water // 2
+        if not 0 <= low_water < high_water:
+            raise ValueError('low_water must be below high_water.')
+
+        self._dispatch = store['dispatch']
+        self._source = source
+        self._decode = decode
+        self._batch_size = batch_size
+        self._high_water = high_water
+        self._low_water = low_water
+        self._batched = batched
+        self._clock = clock
+
+        self._buffer = deque()  # (time received, raw item)
+        self._cond = threading.Condition()
+        self._reader = None
+        self._paused = False
+        self._done = False
+        self._stopped = False
+        self._error = None
+
+        self._received = 0
+        self._dispatched = 0
+        self._batches = 0
+        self._pauses = 0
+        self._started_at = None
+
+    def _items(self):
+        source = self._source
+        if hasattr(source, '__aiter__'):
+            return _iterate_async(source)
+        if hasattr(source, 'get') and not hasattr(source, '__iter__'):
+            return self._iterate_queue(source)
+        return iter(source)
+
+    def _iterate_queue(self, source):
+        try:
+            from queue import Empty
+        except ImportError:  # python 2
+            from Queue import Empty
+
+        while not self._stopped:
+            try:
+                item = source.get(timeout=self.poll_interval)
+            except Empty:
+                continue
+            if item is None:
+                return
+            yield item
+
+    def _read(self):
+        buffer, cond = self._buffer, self._cond
+        try:
+            for item in self._items():
+                with cond:
+                    if len(buffer) >= self._high_water:
+                        self._paused = True
+                        self._pauses += 1
+                        while len(buffer) > self._low_water and not self._stopped:
+                            cond.wait()
+                        self._paused = False
+                    if self._stopped:
+                        break
+                    buffer.append((self._clock(), item))
+                    self._received += 1
+                    if len(buffer) == 1:
+                        cond.notify_all()
+        except Exception as e:
+            self._error = e
+        finally:
+            with cond:
+                self._done = True
+                cond.notify_all()
+
+    def start(self):
+        """starts the reader thread"""
+        if self._reader is not None:
+            return
+        self._started_at = self._clock()
+        self._reader = threading.Thread(target=self._read, name='pydux-ingest')
+        self._reader.daemon = True
+        self._reader.start()
+
+    def stop(self):
+        """
+        stops reading from the source
+
+        already buffered items are still dispatched by pump() and
+        run().  a blocking iterator is only left after its next item.
+        """
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def _take(self):
+        buffer = self._buffer
+        items = [buffer.popleft() for _ in range(min(self._batch_size, len(buffer)))]
+        if self._paused and len(buffer) <= self._low_water:
+            self._cond.notify_all()
+        return items
+
+    def _dispatch_batch(self, items):
+        raw = [item for _, item in items]
+        actions = self._decode(raw) if self._decode is not None else raw
+        if not actions:
+            return
+        if self._batched:
+            self._dispatch(batch(actions))
+        else:
+            for action in actions:
+                self._dispatch(action)
+        self._dispatched += len(actions)
+        self._batches += 1
+
+    def pump(self):
+        """
+        dispatches the items buffered so far, without waiting
+
+        Returns:
+            the number of raw items taken from the buffer
+        """
+        with self._cond:
+            pending = len(self._buffer)
+        taken = 0
+        while taken < pending:
+            with self._cond:
+                items = self._take()
+            if not items:
+                break
+            self._dispatch_batch(items)
+            taken += len(items)
+        self._raise_reader_error()
+        return taken
+
+    def run(self):
+        """
+        reads and dispatches until the source is exhausted or stop()
+        is called, and everything buffered has been dispatched
+
+        Returns:
+            the ingestion stats
+        """
+        self.start()
+        cond = self._cond
+        try:
+            while True:
+                with cond:
+                    while not self._buffer and not self._done:
+                        cond.wait()
+                    items = self._take()
+                if not items:
+                    break
+                self._dispatch_batch(items)
+        finally:
+            # also releases a reader paused at the high water mark
+            # when dispatching raised
+            self.stop()
+        self._reader.join()  # the reader is done, it ended the loop
+        self._raise_reader_error()
+        return self.stats()
+
+    def _raise_reader_error(self):
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def stats(self):
+        """
+        returns the ingestion stats
+
+        throughput is in dispatched actions per second since start(),
+        lag is the age in seconds of the oldest buffered item.
+        """
+        now = self._clock()
+        with self._cond:
+            buffered = len(self._buffer)
+            lag = now - self._buffer[0][0] if buffered else 0.0
+        elapsed = now - self._started_at if self._started_at is not None else 0.0
+        throughput = self._dispatched / elapsed if elapsed > 0 else 0.0
+        return IngestStats(self._received, self._dispatched, self._batches,
+                           buffered, self._pauses, throughput, lag)
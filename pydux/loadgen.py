@@ -0,0 +1,267 @@
+"""
+load generation and replay for pydux stores
+
+usage:
+    pydux-loadgen myapp.store:make_store --mix ADD=5,TOGGLE=3,REMOVE=1 \\
+        --count 100000 --listeners 20
+    pydux-loadgen myapp.store:make_store --replay actions.jsonl --rate 500
+
+The store factory is a function called with no arguments that
+returns a store.  Actions are either generated from a weighted mix
+of action types with a seeded random generator, so that runs are
+repeatable, or replayed from a log with one JSON action per line.
+They are dispatched as fast as possible or at a fixed rate.
+
+The report covers throughput, dispatch latency percentiles,
+listener notification cost per listener and, with --trace-memory,
+the memory still allocated after the run.
+"""
+from __future__ import print_function
+
+import argparse
+from bisect import bisect_right
+from collections import namedtuple
+import importlib
+from itertools import islice
+import json
+import random
+import sys
+import time
+
+from .hooks import add_hook, clock, remove_hook
+from .metrics import Histogram, Metrics
+
+
+LoadReport = namedtuple('LoadReport', [
+    'actions',           # dispatched actions
+    'seconds',           # wall time of the run
+    'throughput',        # actions per second
+    'latency',           # Percentiles of dispatch() in seconds
+    'notify',            # Percentiles of listener notification in seconds
+    'listeners',         # listeners at the last notification
+    'per_listener',      # mean notification seconds per listener
+    'memory_growth',     # bytes allocated during the run and still held,
+                         # or None without trace_memory
+])
+
+
+def parse_mix(text):
+    """parses 'TYPE=WEIGHT,...' into a list of (type, weight)"""
+    mix = []
+    for part in text.split(','):
+        action_type, _, weight = part.strip().partition('=')
+        if not action_type:
+            raise ValueError('Empty action type in mix %r.' % (text,))
+        weight = float(weight) if weight else 1.0
+        if weight < 0:
+            raise ValueError('Negative weight for %r.' % (action_type,))
+        mix.append((action_type, weight))
+    return mix
+
+
+def synthetic_actions(mix, count=None, seed=0):
+    """
+    generates actions with types drawn from a weighted mix
+
+    The same mix and seed always give the same actions.  Each
+    action carries its sequence number as 'seq'.
+
+    Args:
+        mix: list of (action type or action template dict, weight)
+        count: number of actions, or None for an endless stream
+        seed: random seed
+
+    Returns:
+        iterator of actions
+    """
+    rng = random.Random(seed)
+    templates = []
+    cumulative = []
+    total = 0.0
+    for template, weight in mix:
+        if not isinstance(template, dict):
+            template = {'type': template}
+        total += weight
+        templates.append(template)
+        cumulative.append(total)
+    if not total:
+        raise ValueError('Expected a mix with positive weights.')
+
+    seq = 0
+    while count is None or seq < count:
+        template = templates[bisect_right(cumulative, rng.random() * total)]
+        action = dict(template)
+        action['seq'] = seq
+        seq += 1
+        yield action
+
+
+def replay_actions(lines):
+    """
+    reads recorded actions, one JSON object per line
+
+    Args:
+        lines: iterable of lines, e.g. an open file
+    """
+    for line in lines:
+        if line.strip():
+            yield json.loads(line)
+
+
+def run_load(store_factory, actions, rate=None, duration=None, listeners=0,
+             trace_memory=False, sleep=time.sleep):
+    """
+    dispatches actions to a new store and measures it
+
+    Args:
+        store_factory: function returning a store
+        actions: iterable of actions
+        rate: actions per second, or None for as fast as possible
+        duration: optional maximum seconds to run
+        listeners: number of no-op listeners to subscribe
+        trace_memory: if True, measure memory growth with tracemalloc
+                      (python 3.4+)
+        sleep: function used to wait at a fixed rate
+
+    Returns:
+        a LoadReport
+    """
+    if trace_memory:
+        import tracemalloc
+        tracemalloc.start()
+    try:
+        # hooks are captured when the store is created, so the metrics
+        # hook only needs to be registered around the factory call
+        metrics = Metrics()
+        add_hook(metrics)
+        try:
+            store = store_factory()
+        finally:
+            remove_hook(metrics)
+
+        for _ in range(listeners):
+            store['subscribe'](lambda: None)
+
+        dispatch = store['dispatch']
+        latency = Histogram()
+        interval = 1.0 / rate if rate else None
+        memory_before = tracemalloc.get_traced_memory()[0] if trace_memory else None
+        dispatched = 0
+
+        start = clock()
+        deadline = start + duration if duration is not None else None
+        for action in actions:
+            now = clock()
+            if deadline is not None and now >= deadline:
+                break
+            if interval is not None:
+                wait = start + dispatched * interval - now
+                if wait > 0:
+                    sleep(wait)
+            began = clock()
+            dispatch(action)
+            latency.record(clock() - began)
+            dispatched += 1
+        seconds = clock() - start
+
+        memory_growth = None
+        if trace_memory:
+            memory_growth = tracemalloc.get_traced_memory()[0] - memory_before
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+    notify = metrics.notify_seconds
+    per_listener = None
+    if metrics.listeners and notify.count:
+        per_listener = notify.total / notify.count / metrics.listeners
+    return LoadReport(
+        actions=dispatched,
+        seconds=seconds,
+        throughput=dispatched / seconds if seconds > 0 else 0.0,
+        latency=latency.percentiles(),
+        notify=notify.percentiles(),
+        listeners=metrics.listeners,
+        per_listener=per_listener,
+        memory_growth=memory_growth,
+    )
+
+
+def format_report(report):
+    """renders a LoadReport as text"""
+    def us(seconds):
+        return '%.1fus' % (seconds * 1e6,)
+
+    lines = [
+        'actions      %d in %.3fs' % (report.actions, report.seconds),
+        'throughput   %.0f actions/s' % (report.throughput,),
+        'dispatch     p50 %s  p90 %s  p99 %s  max %s' % (
+            us(report.latency.p50), us(report.latency.p90),
+            us(report.latency.p99), us(report.latency.max)),
+        'notify       p50 %s  p90 %s  p99 %s  max %s' % (
+            us(report.notify.p50), us(report.notify.p90),
+            us(report.notify.p99), us(report.notify.max)),
+        'listeners    %d%s' % (report.listeners, '' if report.per_listener is None else
+                               ', %s per listener' % (us(report.per_listener),)),
+    ]
+    if report.memory_growth is not None:
+        lines.append('memory       %+d bytes' % (report.memory_growth,))
+    return '\n'.join(lines)
+
+
+def load_factory(spec):
+    """imports 'package.module:function'"""
+    module_name, _, name = spec.partition(':')
+    if not module_name or not name:
+        raise ValueError('Expected the store factory as module:function, got %r.' % (spec,))
+    return getattr(importlib.import_module(module_name), name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='pydux-loadgen',
+        description='Dispatch generated or recorded actions to a pydux store.')
+    parser.add_argument('factory', help='store factory, as module:function')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--mix', type=parse_mix,
+                        help='weighted action types, e.g. ADD=5,REMOVE=1')
+    source.add_argument('--replay', metavar='FILE',
+                        help='action log with one JSON action per line, - for stdin')
+    parser.add_argument('--count', type=int, help='number of actions to dispatch')
+    parser.add_argument('--duration', type=float, help='maximum seconds to run')
+    parser.add_argument('--rate', type=float, help='actions per second (default: max)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for --mix')
+    parser.add_argument('--listeners', type=int, default=0,
+                        help='no-op listeners to subscribe')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='measure memory growth with tracemalloc')
+    args = parser.parse_args(argv)
+
+    if args.mix is not None and args.count is None and args.duration is None:
+        parser.error('--mix needs --count or --duration')
+
+    if '' not in sys.path:
+        sys.path.insert(0, '')
+    factory = load_factory(args.factory)
+
+    fd = None
+    if args.mix is not None:
+        actions = synthetic_actions(args.mix, count=args.count, seed=args.seed)
+    else:
+        fd = sys.stdin if args.replay == '-' else open(args.replay)
+        actions = replay_actions(fd)
+        if args.count is not None:
+            actions = islice(actions, args.count)
+    try:
+        report = run_load(factory, actions, rate=args.rate, duration=args.duration,
+                          listeners=args.listeners, trace_memory=args.trace_memory)
+    finally:
+        if fd is not None and fd is not sys.stdin:
+            fd.close()
+
+    print(format_report(report))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
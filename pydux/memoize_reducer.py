@@ -0,0 +1,90 @@
+"""
+result memoization for pure reducers
+"""
+from collections import namedtuple, OrderedDict
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+def freeze_action(action):
+    """
+    default action key for memoize_reducer()
+
+    converts an action into a hashable structure.  values are
+    tagged with their type so that e.g. 1, 1.0 and True, or a
+    list and a tuple, do not produce the same key.
+    """
+    if isinstance(action, dict):
+        return (dict, tuple(sorted((key, freeze_action(value))
+                                   for key, value in action.items())))
+    if isinstance(action, (list, tuple)):
+        return (type(action), tuple(freeze_action(value) for value in action))
+    if isinstance(action, (set, frozenset)):
+        return (frozenset, frozenset(freeze_action(value) for value in action))
+    return (type(action), action)
+
+
+def memoize_reducer(reducer, key=freeze_action, maxsize=128):
+    """
+    wraps a pure reducer with a bounded LRU result cache
+
+    Results are keyed on the identity of the previous state and
+    key(action).  A hit returns the cached next state object, so
+    duplicate actions preserve referential equality.  Actions whose
+    key cannot be hashed bypass the cache.
+
+    The wrapper exposes cache_info() and cache_clear() in the same
+    way as functools.lru_cache.
+
+    Args:
+        reducer: pure (state, action) => state function
+        key: function mapping an action to a hashable cache key
+        maxsize: maximum number of cached results
+
+    Returns:
+        the memoized reducer
+    """
+    if not hasattr(reducer, '__call__'):
+        raise TypeError('Expected the reducer to be a function.')
+    if maxsize < 1:
+        raise ValueError('maxsize must be at least 1.')
+
+    cache = OrderedDict()
+    stats = [0, 0]  # hits, misses
+
+    def memoized(state=None, action=None):
+        try:
+            cache_key = (id(state), key(action))
+            entry = cache.pop(cache_key, None)
+        except TypeError:
+            stats[1] += 1
+            return reducer(state, action)
+
+        # entries hold the previous state, so its id() cannot be reused
+        # while the entry is alive.
+        if entry is not None and entry[0] is state:
+            stats[0] += 1
+            cache[cache_key] = entry
+            return entry[1]
+
+        stats[1] += 1
+        next_state = reducer(state, action)
+        if next_state is not None:
+            cache[cache_key] = (state, next_state)
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+        return next_state
+
+    def cache_info():
+        return CacheInfo(stats[0], stats[1], maxsize, len(cache))
+
+    def cache_clear():
+        cache.clear()
+        stats[0] = stats[1] = 0
+
+    memoized.cache_info = cache_info
+    memoized.cache_clear = cache_clear
+    if hasattr(reducer, 'handled_types'):
+        memoized.handled_types = reducer.handled_types
+    return memoized
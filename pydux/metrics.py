@@ -0,0 +1,230 @@
+"""
+store metrics
+
+Metrics is an instrumentation hook (see pydux.hooks) that keeps
+counters, gauges and latency histograms for the stores and reducer
+trees it is given to:
+
+    metrics = Metrics()
+    store = create_store(combine_reducers(reducers, hooks=[metrics]),
+                         None, apply_middleware(thunk_middleware),
+                         metrics=metrics)
+
+    pydux_actions_total{type}        dispatched actions by type
+    pydux_listeners                  listeners at the last notification
+    pydux_listener_errors_total      listeners that raised
+    pydux_slice_changes_total{slice} changed slices, from combine_reducers()
+    pydux_reduce_seconds             time spent in the root reducer
+    pydux_notify_seconds             time spent notifying listeners
+    pydux_dispatch_seconds           time spent in the middleware chain,
+                                     from apply_middleware()
+
+Histograms have fixed, preallocated buckets and counters are plain
+integers updated without locks, so recording costs a few dict and
+list operations.  Updates from several threads at once may rarely
+be lost.  exposition() renders the Prometheus text format, which
+dump() writes to a file and serve() offers over HTTP.
+"""
+from bisect import bisect_left
+from collections import namedtuple
+import os
+import threading
+
+
+# 1us .. ~16s, doubling
+DEFAULT_BUCKETS = tuple(1e-6 * 2 ** i for i in range(25))
+
+Percentiles = namedtuple('Percentiles', ['count', 'p50', 'p90', 'p99', 'max'])
+
+
+class Histogram(object):
+    """
+    latency histogram with fixed bucket upper bounds, in seconds
+    """
+    __slots__ = ('bounds', 'counts', 'total', 'count', 'max')
+
+    def __init__(self, bounds=DEFAULT_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last bucket is +Inf
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        """
+        upper bound of the bucket holding the q-th quantile
+        (0 < q <= 1), or the largest value seen if that is lower
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def percentiles(self):
+        return Percentiles(self.count, self.percentile(0.5), self.percentile(0.9),
+                           self.percentile(0.99), self.max)
+
+
+def _escape(value):
+    return (str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics(object):
+    """
+    hook collecting store metrics
+
+    Args:
+        buckets: histogram bucket upper bounds in seconds
+        max_types: number of distinct action types counted
+                   separately.  further types are counted as
+                   type="other", bounding memory and output size.
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS, max_types=1000):
+        self.max_types = max_types
+        self.actions = {}
+        self.slice_changes = {}
+        self.listeners = 0
+        self.listener_errors = 0
+        self.reduce_seconds = Histogram(buckets)
+        self.notify_seconds = Histogram(buckets)
+        self.dispatch_seconds = Histogram(buckets)
+        self._handlers = {
+            'before_dispatch': self._before_dispatch,
+            'after_reduce': self._after_reduce,
+            'after_notify': self._after_notify,
+            'after_dispatch': self._after_dispatch,
+            'listener_error': self._listener_error,
+            'slice_changed': self._slice_changed,
+        }
+
+    def __call__(self, event, args):
+        handler = self._handlers.get(event)
+        if handler is not None:
+            handler(*args)
+
+    def _before_dispatch(self, action):
+        action_type = action.get('type') if isinstance(action, dict) else None
+        actions = self.actions
+        try:
+            actions[action_type] += 1
+        except KeyError:
+            if len(actions) >= self.max_types:
+                action_type = 'other'
+            actions[action_type] = actions.get(action_type, 0) + 1
+        except TypeError:  # unhashable type
+            actions['other'] = actions.get('other', 0) + 1
+
+    def _after_reduce(self, action, seconds):
+        self.reduce_seconds.record(seconds)
+
+    def _after_notify(self, action, listeners, seconds):
+        self.listeners = listeners
+        self.notify_seconds.record(seconds)
+
+    def _after_dispatch(self, action, seconds):
+        self.dispatch_seconds.record(seconds)
+
+    def _listener_error(self, action, listener, error):
+        self.listener_errors += 1
+
+    def _slice_changed(self, key, action):
+        changes = self.slice_changes
+        changes[key] = changes.get(key, 0) + 1
+
+    def exposition(self):
+        """returns the metrics in the Prometheus text format"""
+        lines = [
+            '# HELP pydux_actions_total Dispatched actions by type.',
+            '# TYPE pydux_actions_total counter',
+        ]
+        for action_type, count in sorted(self.actions.items(), key=lambda item: str(item[0])):
+            lines.append('pydux_actions_total{type="%s"} %d' % (_escape(action_type), count))
+        lines.extend([
+            '# HELP pydux_listeners Listeners at the last notification.',
+            '# TYPE pydux_listeners gauge',
+            'pydux_listeners %d' % (self.listeners,),
+            '# HELP pydux_listener_errors_total Listeners that raised.',
+            '# TYPE pydux_listener_errors_total counter',
+            'pydux_listener_errors_total %d' % (self.listener_errors,),
+            '# HELP pydux_slice_changes_total Changed state slices.',
+            '# TYPE pydux_slice_changes_total counter',
+        ])
+        for key, count in sorted(self.slice_changes.items(), key=lambda item: str(item[0])):
+            lines.append('pydux_slice_changes_total{slice="%s"} %d' % (_escape(key), count))
+        for name, help_text, histogram in [
+                ('pydux_reduce_seconds', 'Time spent in the root reducer.',
+                 self.reduce_seconds),
+                ('pydux_notify_seconds', 'Time spent notifying listeners.',
+                 self.notify_seconds),
+                ('pydux_dispatch_seconds', 'Time spent in the middleware chain.',
+                 self.dispatch_seconds)]:
+            lines.append('# HELP %s %s' % (name, help_text))
+            lines.append('# TYPE %s histogram' % (name,))
+            cumulative = 0
+            for bound, count in zip(histogram.bounds, histogram.counts):
+                cumulative += count
+                lines.append('%s_bucket{le="%s"} %d' % (name, _number(bound), cumulative))
+            lines.append('%s_bucket{le="+Inf"} %d' % (name, histogram.count))
+            lines.append('%s_sum %s' % (name, _number(histogram.total)))
+            lines.append('%s_count %d' % (name, histogram.count))
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path):
+        """writes exposition() to path, replacing it atomically"""
+        tmp = '%s.%d.tmp' % (path, os.getpid())
+        with open(tmp, 'w') as fd:
+            fd.write(self.exposition())
+        try:
+            os.replace(tmp, path)
+        except AttributeError:  # python 2
+            os.rename(tmp, path)
+
+    def serve(self, port=0, host='127.0.0.1'):
+        """
+        serves exposition() over HTTP from a daemon thread
+
+        Returns:
+            the HTTP server.  its server_address holds the bound
+            port; call shutdown() to stop it.
+        """
+        try:
+            from http.server import BaseHTTPRequestHandler, HTTPServer
+        except ImportError:  # python 2
+            from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.exposition().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer((host, port), Handler)
+        thread = threading.Thread(target=server.serve_forever, name='pydux-metrics')
+        thread.daemon = True
+        thread.start()
+        return server
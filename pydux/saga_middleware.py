@@ -0,0 +1,460 @@
+"""
+generator-based effects middleware
+
+inspired by https://github.com/redux-saga/redux-saga
+
+A saga is a generator function that yields effects -- plain
+descriptions of what it wants done -- and is resumed with the
+result:
+
+    def watch_fetch():
+        while True:
+            action = yield take('FETCH')
+            data = yield call(api.fetch, action['id'])
+            yield put({'type': 'FETCHED', 'data': data})
+
+All sagas are driven by one cooperative scheduler owned by the
+middleware; no threads are created.  A suspended saga costs only
+its generator and a small Task record.  Sagas are resumed after
+reducers have seen the dispatched action, and resumptions are
+queued and run iteratively, so put() from a saga does not grow the
+stack.
+
+Timed effects (delay, debounce, race with a delay) are resolved
+by calling tick() from the application's event loop;
+next_deadline() reports when that is next needed.
+"""
+from collections import deque
+import heapq
+from itertools import count
+import time
+
+
+class Effect(object):
+    __slots__ = ('kind', 'args')
+
+    def __init__(self, kind, *args):
+        self.kind = kind
+        self.args = args
+
+    def __repr__(self):
+        return 'Effect(%s, %r)' % (self.kind, self.args)
+
+
+def take(pattern='*'):
+    """
+    waits for a matching action and resumes with it
+
+    pattern is '*' for any action, an action type, a list/tuple of
+    types, or a predicate function taking the action.
+    """
+    return Effect('take', pattern)
+
+def put(action):
+    """dispatches action through the full middleware chain"""
+    return Effect('put', action)
+
+def call(fn, *args):
+    """
+    calls fn(*args) and resumes with its result
+
+    if fn returns a generator, it is run as a saga and the caller
+    resumes when it returns.  exceptions are thrown into the caller.
+    """
+    return Effect('call', fn, args)
+
+def fork(fn, *args):
+    """starts fn(*args) as a concurrent saga and resumes with its Task"""
+    return Effect('fork', fn, args)
+
+def cancel(task):
+    """cancels a forked Task"""
+    return Effect('cancel', task)
+
+def select(selector=None, *args):
+    """resumes with selector(state, *args), or the state itself"""
+    return Effect('select', selector, args)
+
+def delay(seconds):
+    """resumes with True after the given number of seconds"""
+    return Effect('delay', seconds)
+
+def race(effects):
+    """
+    runs a dict of effects and resumes when the first completes
+
+    resumes with a dict of the same keys, where only the winner has
+    a value and the others are None.  losing effects are cancelled.
+    """
+    return Effect('race', dict(effects))
+
+def debounce(seconds, pattern, worker, *args):
+    """
+    forks worker(*args, action) once matching actions have stopped
+    arriving for the given number of seconds
+    """
+    return fork(_debounce, seconds, pattern, worker, args)
+
+
+def _debounce(seconds, pattern, worker, args):
+    while True:
+        action = yield take(pattern)
+        while True:
+            winner = yield race({'latest': take(pattern), 'timeout': delay(seconds)})
+            if winner['latest'] is None:
+                break
+            action = winner['latest']
+        yield fork(worker, *(args + (action,)))
+
+
+def _is_generator(obj):
+    return hasattr(obj, 'send') and hasattr(obj, 'throw')
+
+
+class Task(object):
+    """handle for a running saga"""
+    __slots__ = ('gen', 'done', 'cancelled', 'result', 'error',
+                 '_cancel_wait', '_children', '_on_done')
+
+    def __init__(self, gen, on_done=None):
+        self.gen = gen
+        self.done = False
+        self.cancelled = False
+        self.result = None
+        self.error = None
+        self._cancel_wait = None
+        self._children = None
+        self._on_done = on_done
+
+    @property
+    def is_running(self):
+        return not self.done
+
+
+class SagaMiddleware(object):
+    """
+    middleware and scheduler for sagas
+
+    usage:
+        sagas = SagaMiddleware()
+        store = create_store(reducer, None, apply_middleware(sagas))
+        sagas.run(root_saga)
+
+    Args:
+        clock: function returning the current time in seconds
+        on_error: optional function (error, task) called when a saga
+                  raises.  By default the error is re-raised from the
+                  dispatch() or tick() that was driving the saga.
+    """
+    def __init__(self, clock=time.time, on_error=None):
+        self._clock = clock
+        self._on_error = on_error
+        self._dispatch = None
+        self._get_state = None
+        self._ready = deque()
+        self._running = False
+        self._takers_by_type = {}
+        self._other_takers = []
+        self._timers = []
+        self._timer_seq = count()
+        self._task_count = 0
+
+    def __call__(self, store):
+        self._dispatch = store['dispatch']
+        self._get_state = store['get_state']
+
+        def wrapper(next_):
+            def saga_dispatch(action):
+                result = next_(action)
+                self._emit(action)
+                return result
+            return saga_dispatch
+        return wrapper
+
+    @property
+    def task_count(self):
+        """number of sagas that have not finished"""
+        return self._task_count
+
+    def run(self, saga, *args):
+        """
+        starts saga(*args) and runs it until it first suspends
+
+        Returns:
+            the saga's Task
+        """
+        if self._dispatch is None:
+            raise Exception('The saga middleware must be applied to a '
+                            'store before running a saga.')
+        task = self._start(saga, args)
+        self._drain()
+        return task
+
+    def tick(self):
+        """resolves delays that have expired and runs resumed sagas"""
+        now = self._clock()
+        timers = self._timers
+        while timers and timers[0][0] <= now:
+            entry = heapq.heappop(timers)[2]
+            resume = entry[0]
+            if resume is not None:
+                entry[0] = None
+                resume(True)
+        self._drain()
+
+    def next_deadline(self):
+        """clock time of the next pending delay, or None"""
+        timers = self._timers
+        while timers and timers[0][2][0] is None:
+            heapq.heappop(timers)
+        return timers[0][0] if timers else None
+
+    # scheduler internals
+
+    def _start(self, fn, args):
+        result = fn(*args)
+        task = Task(result)
+        self._task_count += 1
+        if _is_generator(result):
+            self._ready.append((task, None, None))
+        else:
+            self._finish(task, result, None)
+        return task
+
+    def _drain(self):
+        if self._running:
+            return
+        self._running = True
+        try:
+            ready = self._ready
+            while ready:
+                task, value, error = ready.popleft()
+                self._step(task, value, error)
+        finally:
+            self._running = False
+
+    def _step(self, task, value, error):
+        if task.done:
+            return
+        task._cancel_wait = None
+        try:
+            if error is not None:
+                effect = task.gen.throw(error)
+            else:
+                effect = task.gen.send(value)
+        except StopIteration as e:
+            # e.value is python 3.3+; raise StopIteration(value) on python 2
+            self._finish(task, e.args[0] if e.args else None, None)
+            return
+        except Exception as e:
+            self._finish(task, None, e)
+            return
+
+        ready = self._ready
+
+        def resume(value, error=None, first=False):
+            if first:
+                ready.appendleft((task, value, error))
+            else:
+                ready.append((task, value, error))
+
+        task._cancel_wait = self._wait(task, effect, resume)
+
+    def _finish(self, task, result, error):
+        task.done = True
+        task.result = result
+        task.error = error
+        self._task_count -= 1
+        if task._on_done is not None:
+            task._on_done(result, error)
+        elif error is not None:
+            if self._on_error is None:
+                raise error
+            self._on_error(error, task)
+
+    def _cancel(self, task):
+        if task.done:
+            return
+        task.done = True
+        task.cancelled = True
+        self._task_count -= 1
+        if task._cancel_wait is not None:
+            task._cancel_wait()
+            task._cancel_wait = None
+        for child in task._children or ():
+            self._cancel(child)
+        if _is_generator(task.gen):
+            task.gen.close()
+
+    def _wait(self, task, effect, resume):
+        """starts effect; returns a function that abandons it, or None"""
+        if not isinstance(effect, Effect):
+            resume(None, TypeError('Sagas must yield effects, got %r.' % (effect,)))
+            return None
+
+        kind = effect.kind
+        if kind == 'take':
+            return self._add_taker(effect.args[0], resume)
+
+        if kind == 'put':
+            # the putting saga continues before the sagas woken up by
+            # its action, so it can take() their response.
+            try:
+                resume(self._dispatch(effect.args[0]), first=True)
+            except Exception as e:
+                resume(None, e, first=True)
+            return None
+
+        if kind == 'call':
+            fn, args = effect.args
+            try:
+                result = fn(*args)
+            except Exception as e:
+                resume(None, e)
+                return None
+            if not _is_generator(result):
+                resume(result)
+                return None
+            child = Task(result, resume)
+            self._task_count += 1
+            self._ready.append((child, None, None))
+            return lambda: self._cancel(child)
+
+        if kind == 'fork':
+            fn, args = effect.args
+            try:
+                child = self._start(fn, args)
+            except Exception as e:
+                resume(None, e)
+                return None
+            if task._children is None:
+                task._children = []
+            task._children = [each for each in task._children if not each.done]
+            task._children.append(child)
+            resume(child)
+            return None
+
+        if kind == 'cancel':
+            self._cancel(effect.args[0])
+            resume(None)
+            return None
+
+        if kind == 'select':
+            selector, args = effect.args
+            state = self._get_state()
+            try:
+                resume(state if selector is None else selector(state, *args))
+            except Exception as e:
+                resume(None, e)
+            return None
+
+        if kind == 'delay':
+            entry = [resume]
+            deadline = self._clock() + effect.args[0]
+            heapq.heappush(self._timers, (deadline, next(self._timer_seq), entry))
+            return lambda: entry.__setitem__(0, None)
+
+        if kind == 'race':
+            return self._race(task, effect.args[0], resume)
+
+        resume(None, ValueError('Unknown effect "%s".' % (kind,)))
+        return None
+
+    def _race(self, task, effects, resume):
+        settled = [False]
+        cancels = []
+
+        def cancel_all():
+            for cancel_wait in cancels:
+                if cancel_wait is not None:
+                    cancel_wait()
+
+        def make_resume(name):
+            def resume_race(value, error=None, first=False):
+                if settled[0]:
+                    return
+                settled[0] = True
+                cancel_all()
+                if error is not None:
+                    resume(None, error, first)
+                else:
+                    result = dict.fromkeys(effects)
+                    result[name] = value
+                    resume(result, None, first)
+            return resume_race
+
+        for name, effect in effects.items():
+            cancels.append(self._wait(task, effect, make_resume(name)))
+            if settled[0]:
+                cancel_all()
+                break
+        return cancel_all
+
+    def _add_taker(self, pattern, resume):
+        # entry is [resume, action types or None]; resume is cleared
+        # once the taker is resumed or cancelled
+        if pattern == '*':
+            entry = [resume, None]
+            self._other_takers.append((lambda action: True, entry))
+        elif hasattr(pattern, '__call__'):
+            entry = [resume, None]
+            self._other_takers.append((pattern, entry))
+        else:
+            if not isinstance(pattern, (list, tuple)):
+                pattern = (pattern,)
+            entry = [resume, pattern]
+            for action_type in pattern:
+                self._takers_by_type.setdefault(action_type, []).append(entry)
+        return lambda: self._remove_taker(entry)
+
+    def _remove_taker(self, entry):
+        """clears entry and removes it from the buckets it waits in"""
+        entry[0] = None
+        if entry[1] is None:
+            others = self._other_takers
+            for i, (_, each) in enumerate(others):
+                if each is entry:
+                    del others[i]
+                    break
+            return
+        takers_by_type = self._takers_by_type
+        for action_type in entry[1]:
+            bucket = takers_by_type.get(action_type)
+            if bucket is None:
+                continue
+            for i, each in enumerate(bucket):
+                if each is entry:
+                    del bucket[i]
+                    break
+            if not bucket:
+                del takers_by_type[action_type]
+
+    def _emit(self, action):
+        matched = None
+        if isinstance(action, dict):
+            try:
+                matched = self._takers_by_type.pop(action.get('type'), None)
+            except TypeError:  # unhashable type
+                pass
+
+        if self._other_takers:
+            waiting = []
+            for predicate, entry in self._other_takers:
+                if entry[0] is None:
+                    continue
+                if predicate(action):
+                    matched = matched or []
+                    matched.append(entry)
+                else:
+                    waiting.append((predicate, entry))
+            self._other_takers = waiting
+
+        for entry in matched or ():
+            resume = entry[0]
+            if resume is not None:
+                if entry[1] is not None and len(entry[1]) > 1:
+                    self._remove_taker(entry)  # from its other types
+                else:
+                    entry[0] = None
+                resume(action)
+        self._drain()
@@ -0,0 +1,31 @@
+"""
+sampling for checks that only run on a fraction of dispatches
+"""
+
+
+def create_sampler(rate):
+    """
+    creates a function that returns True for a fraction of its calls
+
+    Selected calls are spread evenly: 0.25 selects every 4th call,
+    0.7 selects 7 of every 10.
+
+    Args:
+        rate: fraction of calls to select, between 0 and 1
+
+    Returns:
+        a function taking no arguments
+    """
+    if not 0 <= rate <= 1:
+        raise ValueError('sample_rate must be between 0 and 1.')
+    calls = [0]
+    selected = [0]
+
+    def sample():
+        calls[0] += 1
+        due = int(calls[0] * rate)
+        if due > selected[0]:
+            selected[0] = due
+            return True
+        return False
+    return sample
@@ -0,0 +1,128 @@
+"""
+memoized selectors for state trees
+
+inspired by https://github.com/reactjs/reselect
+
+A selector derives data from the state.  Memoized selectors only
+recompute when one of their input selectors returns a different
+object than last time, which is cheap to check because unchanged
+slices from combine_reducers() keep their identity.
+"""
+from collections import namedtuple, OrderedDict
+import time
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'expirations',
+                                     'maxsize', 'currsize'])
+
+
+def _same(previous, current):
+    for a, b in zip(previous, current):
+        if a is not b:
+            return False
+    return True
+
+
+def create_selector(input_selectors, result_func):
+    """
+    creates a single-slot memoized selector
+
+    usage:
+        select_total = create_selector(
+            [lambda state: state['items'], lambda state: state['tax']],
+            lambda items, tax: sum(items) * (1 + tax))
+
+    Args:
+        input_selectors: list of functions (state, *args) => value
+        result_func: function (*values) => result
+
+    Returns:
+        selector function (state, *args) => result
+    """
+    input_selectors = tuple(input_selectors)
+    last = [None, None]  # inputs, result
+
+    def selector(state, *args):
+        inputs = tuple(select(state, *args) for select in input_selectors)
+        if last[0] is not None and _same(last[0], inputs):
+            return last[1]
+        result = result_func(*inputs)
+        last[0], last[1] = inputs, result
+        return result
+
+    return selector
+
+
+def create_selector_family(input_selectors, result_func, maxsize=256, ttl=None,
+                           clock=time.time):
+    """
+    creates a selector memoized separately for each set of parameters
+
+    usage:
+        select_user = create_selector_family(
+            [lambda state, user_id: state['users']],
+            lambda users, user_id: users.get(user_id))
+        select_user(state, 42)
+
+    Each parameter tuple gets its own memoized entry in an LRU cache
+    of up to maxsize entries.  An entry is recomputed when any input
+    selector returns a different object, or once it is older than
+    ttl seconds.  Calls with unhashable parameters are not cached.
+
+    The selector exposes cache_info(), cache_clear() and
+    invalidate(*params).
+
+    Args:
+        input_selectors: list of functions (state, *params) => value
+        result_func: function (*values, *params) => result
+        maxsize: maximum number of cached parameter tuples
+        ttl: optional maximum age of an entry in seconds
+        clock: function returning the current time in seconds
+
+    Returns:
+        selector function (state, *params) => result
+    """
+    if maxsize < 1:
+        raise ValueError('maxsize must be at least 1.')
+    input_selectors = tuple(input_selectors)
+    cache = OrderedDict()  # params => (inputs, result, expires)
+    stats = [0, 0, 0, 0]  # hits, misses, evictions, expirations
+
+    def selector(state, *params):
+        inputs = tuple(select(state, *params) for select in input_selectors)
+        try:
+            entry = cache.pop(params, None)
+        except TypeError:  # unhashable parameters
+            stats[1] += 1
+            return result_func(*(inputs + params))
+
+        if entry is not None:
+            if ttl is not None and entry[2] <= clock():
+                stats[3] += 1
+            elif _same(entry[0], inputs):
+                stats[0] += 1
+                cache[params] = entry
+                return entry[1]
+
+        stats[1] += 1
+        result = result_func(*(inputs + params))
+        cache[params] = (inputs, result, None if ttl is None else clock() + ttl)
+        if len(cache) > maxsize:
+            cache.popitem(last=False)
+            stats[2] += 1
+        return result
+
+    def cache_info():
+        return CacheInfo(stats[0], stats[1], stats[2], stats[3], maxsize, len(cache))
+
+    def cache_clear():
+        cache.clear()
+        stats[:] = [0, 0, 0, 0]
+
+    def invalidate(*params):
+        cache.pop(params, None)
+
+    selector.cache_info = cache_info
+    selector.cache_clear = cache_clear
+    selector.invalidate = invalidate
+    return selector
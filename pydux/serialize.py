@@ -0,0 +1,157 @@
+"""
+state serialization with per-subtree caching
+
+State in a pydux store is never mutated, so the encoded bytes of
+a container can be reused for as long as the same object is part
+of the state.  StateSerializer keeps an LRU cache of encoded
+containers keyed by identity, so unchanged slices produced by
+combine_reducers() are not re-encoded and the cost of dumps() is
+proportional to what changed since the last call.
+
+Containers (dicts and other Mappings, lists, tuples) cannot be
+weakly referenced, so cache entries hold a reference to their
+object.  This also keeps the id() of a cached object from being
+reused while its entry exists.  maxsize bounds the number of
+objects kept alive this way.
+"""
+from collections import namedtuple, OrderedDict
+import json
+import struct
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # python 2
+    from collections import Mapping
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    string_types = (str, unicode)
+except NameError:  # python 3
+    string_types = (str,)
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+_json_encoder = json.JSONEncoder(separators=(',', ':'))
+
+
+def _json_scalar(obj):
+    return _json_encoder.encode(obj).encode('ascii')
+
+
+def _json_key(key):
+    if isinstance(key, string_types):
+        return _json_scalar(key)
+    if key is None or isinstance(key, (bool, int, float)):
+        # json.dumps() converts these keys to strings
+        return _json_scalar(_json_encoder.encode(key))
+    raise TypeError('keys must be str, int, float, bool or None, '
+                    'not %s' % (type(key).__name__,))
+
+
+def _json_mapping(items):
+    return b'{' + b','.join(key + b':' + value for key, value in items) + b'}'
+
+
+def _json_array(values):
+    return b'[' + b','.join(values) + b']'
+
+
+def _msgpack_header(size, fix, fix_limit, code16, code32):
+    if size < fix_limit:
+        return struct.pack('B', fix | size)
+    if size < 0x10000:
+        return struct.pack('>BH', code16, size)
+    return struct.pack('>BI', code32, size)
+
+
+def _msgpack_scalar(obj):
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def _msgpack_mapping(items):
+    items = list(items)
+    return (_msgpack_header(len(items), 0x80, 16, 0xde, 0xdf) +
+            b''.join(key + value for key, value in items))
+
+
+def _msgpack_array(values):
+    values = list(values)
+    return (_msgpack_header(len(values), 0x90, 16, 0xdc, 0xdd) +
+            b''.join(values))
+
+
+FORMATS = {
+    'json': (_json_scalar, _json_key, _json_mapping, _json_array),
+    'msgpack': (_msgpack_scalar, _msgpack_scalar, _msgpack_mapping, _msgpack_array),
+}
+
+
+class StateSerializer(object):
+    """
+    encodes state trees to JSON or msgpack bytes, caching subtrees
+
+    Output is byte-for-byte what json.dumps(state, separators=(',', ':'))
+    or msgpack.packb(state, use_bin_type=True) would produce.
+
+    Args:
+        format: 'json' or 'msgpack' (requires the msgpack package)
+        maxsize: maximum number of cached containers
+    """
+    def __init__(self, format='json', maxsize=4096):
+        if format not in FORMATS:
+            raise ValueError('Unknown format "%s".' % (format,))
+        if format == 'msgpack' and msgpack is None:
+            raise ImportError('The msgpack format requires the msgpack package.')
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1.')
+        self.format = format
+        self.maxsize = maxsize
+        self._scalar, self._key, self._mapping, self._array = FORMATS[format]
+        self._cache = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def dumps(self, state):
+        """returns the encoded bytes of state"""
+        return self._encode(state)
+
+    def dump(self, state, fp):
+        """writes the encoded bytes of state to a binary file object"""
+        fp.write(self._encode(state))
+
+    def cache_info(self):
+        return CacheInfo(self._hits, self._misses, self.maxsize, len(self._cache))
+
+    def cache_clear(self):
+        self._cache.clear()
+        self._hits = self._misses = 0
+
+    def _encode(self, obj):
+        is_mapping = isinstance(obj, Mapping)
+        if not is_mapping and not isinstance(obj, (list, tuple)):
+            return self._scalar(obj)
+
+        cache = self._cache
+        entry = cache.pop(id(obj), None)
+        if entry is not None and entry[0] is obj:
+            self._hits += 1
+            cache[id(obj)] = entry
+            return entry[1]
+
+        self._misses += 1
+        encode = self._encode
+        if is_mapping:
+            key = self._key
+            data = self._mapping((key(k), encode(v)) for k, v in obj.items())
+        else:
+            data = self._array(encode(v) for v in obj)
+
+        cache[id(obj)] = (obj, data)
+        if len(cache) > self.maxsize:
+            cache.popitem(last=False)
+        return data
@@ -0,0 +1,230 @@
+"""
+sharded stores
+
+A sharded store partitions the state tree across independent
+stores, each with its own reducer and listeners.  Actions are
+routed to the shard that owns their type, so unrelated parts of
+an application no longer share one reducer tree and one dispatch
+loop, and with threaded=True each shard reduces on its own thread.
+"""
+from collections import OrderedDict
+import threading
+
+from .create_store import StoreDict, create_listener_registry, create_store
+
+
+class ShardedStore(StoreDict):
+    def replace_shard_reducer(self, name, next_reducer):
+        return self['shards'][name]['replace_reducer'](next_reducer)
+    def broadcast(self, action):
+        return self['broadcast'](action)
+    def shard(self, name):
+        return self['shards'][name]
+    def close(self):
+        return self['close']()
+
+
+def _gather(futures, result):
+    """returns a future for result, completed once all futures are"""
+    from concurrent.futures import Future
+
+    gathered = Future()
+    lock = threading.Lock()
+    remaining = [len(futures)]
+
+    def on_done(future):
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if not last:
+            return
+        for f in futures:
+            error = f.exception()
+            if error is not None:
+                gathered.set_exception(error)
+                return
+        gathered.set_result(result)
+
+    for future in futures:
+        future.add_done_callback(on_done)
+    return gathered
+
+
+def create_sharded_store(shards, routes=None, default=None, separator='/',
+                         threaded=False, **options):
+    """
+    creates a store whose state is partitioned across shards
+
+    usage:
+        store = create_sharded_store(
+            {'todos': todos, 'session': session},
+            routes={'LOGOUT': 'session'})
+        store.dispatch({'type': 'todos/ADD', 'text': 'milk'})
+        store.get_state()  # {'todos': ..., 'session': ...}
+
+    An action goes to the shard named for its type in routes, else
+    to the shard named by the type's prefix up to separator, else to
+    the default shard.  Without a default, unrouted actions are
+    broadcast to every shard, as a single store would do.
+    broadcast(action) always sends an action to every shard.
+    replace_reducer() takes a dict of shard name => reducer and
+    replaces the reducers of those shards.
+
+    get_state() returns a dict of the shard states by shard name.
+    It keeps its identity while no shard state changed.  Listeners
+    subscribed to the sharded store are notified once for every
+    shard that reduced an action.
+
+    With threaded=True, every shard reduces and notifies on its own
+    worker thread, so listeners run on those threads.  dispatch()
+    and broadcast() then return a concurrent.futures.Future of the
+    action, and close() stops the workers once they are idle.
+
+    Args:
+        shards: dict of shard name => reducer or existing store.
+                pass a store to give a shard its own enhancer.
+        routes: optional dict of action type => shard name
+        default: optional shard name for unrouted actions.  actions
+                 that are not dicts, such as thunks, can only be
+                 sent to the default shard.
+        separator: separator ending a type's shard prefix, or None
+                   to route by routes only
+        threaded: if True, run each shard on its own thread
+        **options: create_store() options for shards given as reducers
+
+    Returns:
+        a ShardedStore
+    """
+    if not shards:
+        raise ValueError('Expected at least one shard.')
+
+    stores = OrderedDict()
+    for name in sorted(shards):
+        shard = shards[name]
+        if isinstance(shard, dict):
+            stores[name] = shard
+        elif hasattr(shard, '__call__'):
+            stores[name] = create_store(shard, **options)
+        else:
+            raise TypeError('Expected shard %r to be a reducer or a store.' % (name,))
+
+    routes = dict(routes or {})
+    for action_type, name in routes.items():
+        if name not in stores:
+            raise ValueError('Route %r names unknown shard %r.' % (action_type, name))
+    if default is not None and default not in stores:
+        raise ValueError('Unknown default shard %r.' % (default,))
+
+    everything = tuple(stores)
+    targets_by_type = {}
+
+    def targets_for(action_type):
+        try:
+            name = routes.get(action_type)
+        except TypeError:  # unhashable type
+            name = None
+        if name is None and separator and hasattr(action_type, 'partition'):
+            prefix, found, _ = action_type.partition(separator)
+            if found and prefix in stores:
+                name = prefix
+        if name is None:
+            name = default
+        return everything if name is None else (name,)
+
+    def resolve(action):
+        if not isinstance(action, dict):
+            if default is None:
+                raise TypeError('Actions must be a dict. '
+                                'Non-dict actions need a default shard.')
+            return (default,)
+
+        action_type = action.get('type')
+        if action_type is None:
+            raise ValueError('Actions must have a non-None "type" property. '
+                             'Have you misspelled a constant?')
+        try:
+            return targets_by_type[action_type]
+        except KeyError:
+            targets = targets_by_type[action_type] = targets_for(action_type)
+            return targets
+        except TypeError:  # unhashable type
+            return targets_for(action_type)
+
+    # the lock guards the listener registry against shard worker threads
+    subscribe, get_snapshot = create_listener_registry(threading.Lock())
+
+    def notify():
+        for listener in get_snapshot():
+            listener()
+
+    for store in stores.values():
+        store['subscribe'](notify)
+
+    view = [((), None)]  # shard states, combined state
+
+    def get_state():
+        states = tuple(store['get_state']() for store in stores.values())
+        previous, combined = view[0]
+        if len(previous) == len(states) and all(
+                a is b for a, b in zip(previous, states)):
+            return combined
+        combined = dict(zip(everything, states))
+        view[0] = (states, combined)
+        return combined
+
+    def dispatch(action):
+        targets = resolve(action)
+        if len(targets) == 1:
+            return stores[targets[0]]['dispatch'](action)
+        for name in targets:
+            stores[name]['dispatch'](action)
+        return action
+
+    def broadcast(action):
+        resolve(action)
+        for store in stores.values():
+            store['dispatch'](action)
+        return action
+
+    def replace_reducer(next_reducers):
+        for name in next_reducers:
+            if name not in stores:
+                raise ValueError('Unknown shard %r.' % (name,))
+        for name, next_reducer in next_reducers.items():
+            stores[name]['replace_reducer'](next_reducer)
+
+    def close():
+        pass
+
+    if threaded:
+        from concurrent.futures import ThreadPoolExecutor
+
+        executors = dict((name, ThreadPoolExecutor(max_workers=1)) for name in stores)
+
+        def submit(names, action):
+            futures = [executors[name].submit(stores[name]['dispatch'], action)
+                       for name in names]
+            if len(futures) == 1:
+                return futures[0]
+            return _gather(futures, action)
+
+        def dispatch(action):
+            return submit(resolve(action), action)
+
+        def broadcast(action):
+            resolve(action)
+            return submit(everything, action)
+
+        def close():
+            for executor in executors.values():
+                executor.shutdown(wait=True)
+
+    return ShardedStore(
+        dispatch=dispatch,
+        subscribe=subscribe,
+        get_state=get_state,
+        replace_reducer=replace_reducer,
+        broadcast=broadcast,
+        close=close,
+        shards=stores,
+    )
@@ -2,6 +2,9 @@
 thunks for pydux
 original from https://github.com/gaearon/redux-thunk
 """
+from collections import OrderedDict
+import threading
+import time
 
 
 def thunk_middleware(store):
@@ -14,3 +17,111 @@ def thunk_middleware(store):
             return next_(action)
         return thunk_dispatch
     return wrapper
+
+
+def keyed(key, thunk):
+    """
+    tags a thunk with a deduplication key for create_thunk_middleware()
+
+    Returns:
+        the same thunk
+    """
+    thunk.thunk_key = key
+    return thunk
+
+
+def create_thunk_middleware(executor=None, key=None, ttl=None, clock=time.time):
+    """
+    thunk middleware with executor offload and deduplication
+
+    Dispatching a thunk returns a concurrent.futures.Future for its
+    result.  With an executor the thunk runs there, otherwise inline
+    in the dispatching thread.
+
+    Thunks with a key (see keyed()) are deduplicated: while a thunk
+    is in flight, dispatching another thunk with the same key returns
+    the in-flight future instead of running it.  With a ttl, the
+    future of a successful thunk keeps being returned for that many
+    seconds after it completed.  Both are kept separately for each
+    store the middleware is applied to.
+
+    Note that thunks running on an executor call dispatch() from a
+    worker thread.
+
+    Args:
+        executor: optional concurrent.futures.Executor
+        key: function returning a thunk's hashable key or None.
+             defaults to the thunk's thunk_key attribute.
+        ttl: optional seconds to cache successful results by key
+        clock: function returning the current time in seconds
+
+    Returns:
+        a middleware function for apply_middleware()
+    """
+    from concurrent.futures import Future
+
+    if key is None:
+        key = lambda thunk: getattr(thunk, 'thunk_key', None)
+
+    def thunk_middleware(store):
+        dispatch, get_state = store['dispatch'], store['get_state']
+        # deduplication and caching are per store
+        lock = threading.Lock()
+        in_flight = {}
+        completed = OrderedDict()  # key => (expires, future), oldest first
+
+        def run(thunk, future, thunk_key):
+            if not future.set_running_or_notify_cancel():
+                result, error = None, None
+            else:
+                try:
+                    result, error = thunk(dispatch, get_state), None
+                except Exception as e:
+                    result, error = None, e
+            if thunk_key is not None:
+                with lock:
+                    in_flight.pop(thunk_key, None)
+                    if ttl is not None and error is None and not future.cancelled():
+                        completed.pop(thunk_key, None)
+                        completed[thunk_key] = (clock() + ttl, future)
+            if error is not None:
+                future.set_exception(error)
+            elif not future.cancelled():
+                future.set_result(result)
+
+        def wrapper(next_):
+            def thunk_dispatch(action):
+                if not hasattr(action, '__call__'):
+                    return next_(action)
+
+                thunk_key = key(action)
+                future = Future()
+                if thunk_key is not None:
+                    with lock:
+                        existing = in_flight.get(thunk_key)
+                        if existing is not None:
+                            return existing
+                        if completed:
+                            now = clock()
+                            while completed and next(iter(completed.values()))[0] <= now:
+                                completed.popitem(last=False)
+                            cached = completed.get(thunk_key)
+                            if cached is not None:
+                                return cached[1]
+                        in_flight[thunk_key] = future
+
+                if executor is None:
+                    run(action, future, thunk_key)
+                else:
+                    try:
+                        executor.submit(run, action, future, thunk_key)
+                    except Exception as e:  # e.g. executor shut down
+                        if thunk_key is not None:
+                            with lock:
+                                in_flight.pop(thunk_key, None)
+                        future.set_exception(e)
+                return future
+            return thunk_dispatch
+        return wrapper
+
+    return thunk_middleware
@@ -0,0 +1,183 @@
+"""
+undo/redo history for reducers
+
+inspired by https://github.com/omnidan/redux-undo
+
+undoable(reducer) wraps a reducer so that its state becomes
+
+    {
+        'past': HistoryStack,    # most recent first
+        'present': ...,          # the wrapped reducer's state
+        'future': HistoryStack,  # next redo first
+        'group': ...,            # group key of the last recorded action
+    }
+
+and it handles the UNDO, REDO and CLEAR_HISTORY actions.
+"""
+
+UNDO = '@@pydux/UNDO'
+REDO = '@@pydux/REDO'
+CLEAR_HISTORY = '@@pydux/CLEAR_HISTORY'
+
+
+def undo():
+    return {'type': UNDO}
+
+def redo():
+    return {'type': REDO}
+
+def clear_history():
+    return {'type': CLEAR_HISTORY}
+
+
+class HistoryStack(object):
+    """
+    immutable stack holding at most `limit` entries
+
+    Pushing and popping are O(1) and share structure with the
+    previous stack, so old states stay valid.  Entries past the limit
+    are dropped by rebuilding the stack once it holds twice the limit,
+    an O(limit) step every `limit` pushes, so memory stays within
+    2 * limit entries.
+    """
+    __slots__ = ('_head', '_size', '_depth', 'limit')
+
+    def __init__(self, limit=None, _head=None, _size=0, _depth=0):
+        self.limit = limit
+        self._head = _head    # (value, next) cons cells
+        self._size = _size    # visible entries
+        self._depth = _depth  # cells reachable from _head
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        node = self._head
+        for _ in range(self._size):
+            yield node[0]
+            node = node[1]
+
+    def __repr__(self):
+        return 'HistoryStack(%r)' % (list(self),)
+
+    def peek(self):
+        """returns the top entry"""
+        if not self._size:
+            raise IndexError('peek from empty HistoryStack')
+        return self._head[0]
+
+    def push(self, value):
+        """returns a new stack with value on top"""
+        head = (value, self._head)
+        size = self._size + 1
+        depth = self._depth + 1
+        limit = self.limit
+        if limit is not None and size > limit:
+            size = limit
+            if depth > 2 * limit:
+                head = _rebuild(head, limit)
+                depth = limit
+        return HistoryStack(limit, head, size, depth)
+
+    def pop(self):
+        """returns a new stack without the top entry"""
+        if not self._size:
+            raise IndexError('pop from empty HistoryStack')
+        return HistoryStack(self.limit, self._head[1], self._size - 1, self._depth - 1)
+
+    def clear(self):
+        """returns an empty stack with the same limit"""
+        return HistoryStack(self.limit)
+
+
+def _rebuild(head, count):
+    values = []
+    for _ in range(count):
+        values.append(head[0])
+        head = head[1]
+    node = None
+    for value in reversed(values):
+        node = (value, node)
+    return node
+
+
+def undoable(reducer, limit=100, group_by=None, filter=None):
+    """
+    higher-order reducer adding undo/redo history
+
+    Args:
+        reducer: the reducer whose state is tracked
+        limit: maximum number of undo (and redo) steps kept, or None
+               for unbounded history
+        group_by: optional function action => key.  consecutive actions
+                  with the same non-None key are recorded as one step.
+        filter: optional function (action, present, previous) => bool.
+                changes from actions it rejects update the present
+                without being recorded.
+
+    Returns:
+        the undoable reducer
+    """
+    if limit is not None and limit < 1:
+        raise ValueError('limit must be at least 1.')
+    empty = HistoryStack(limit)
+
+    def undoable_reducer(state=None, action=None):
+        if state is None:
+            return {
+                'past': empty,
+                'present': reducer(None, action),
+                'future': empty,
+                'group': None,
+            }
+
+        action_type = action.get('type') if isinstance(action, dict) else None
+        past, present, future = state['past'], state['present'], state['future']
+
+        if action_type == UNDO:
+            if not past:
+                return state
+            return {
+                'past': past.pop(),
+                'present': past.peek(),
+                'future': future.push(present),
+                'group': None,
+            }
+
+        if action_type == REDO:
+            if not future:
+                return state
+            return {
+                'past': past.push(present),
+                'present': future.peek(),
+                'future': future.pop(),
+                'group': None,
+            }
+
+        if action_type == CLEAR_HISTORY:
+            return {'past': empty, 'present': present, 'future': empty, 'group': None}
+
+        next_present = reducer(present, action)
+        if next_present is present or next_present == present:
+            return state
+
+        if filter is not None and not filter(action, next_present, present):
+            return {'past': past, 'present': next_present, 'future': future,
+                    'group': state['group']}
+
+        group = group_by(action) if group_by is not None else None
+        if group is not None and group == state['group']:
+            return {'past': past, 'present': next_present, 'future': empty,
+                    'group': group}
+
+        return {
+            'past': past.push(present),
+            'present': next_present,
+            'future': empty,
+            'group': group,
+        }
+
+    if hasattr(reducer, 'handled_types'):
+        undoable_reducer.handled_types = (
+            reducer.handled_types | frozenset([UNDO, REDO, CLEAR_HISTORY]))
+    return undoable_reducer
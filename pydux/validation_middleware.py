@@ -0,0 +1,160 @@
+"""
+action payload validation middleware
+
+Schemas are declared per action type as {field: spec} dicts,
+where spec is a type (or tuple of types) checked with
+isinstance(), or a predicate function.  Wrap a spec with
+optional() for fields that may be omitted.
+
+Each schema is compiled once, the first time an action of its
+type is seen, into a checker function that is cached by type.
+"""
+from .sampling import create_sampler
+
+
+class optional(object):
+    """marks a schema field as not required"""
+    def __init__(self, spec):
+        self.spec = spec
+
+
+def _is_type_spec(spec):
+    if isinstance(spec, tuple):
+        return all(isinstance(each, type) for each in spec)
+    return isinstance(spec, type)
+
+
+def _describe(spec):
+    if isinstance(spec, tuple):
+        return ' or '.join(each.__name__ for each in spec)
+    if isinstance(spec, type):
+        return spec.__name__
+    return getattr(spec, '__name__', repr(spec))
+
+
+def compile_schema(action_type, schema):
+    """
+    compiles a {field: spec} schema into a checker function
+
+    A callable schema is used as the checker directly.  Checkers
+    raise ValueError for invalid actions.
+
+    Args:
+        action_type: type the schema applies to, for messages
+        schema: dict of field => spec, or a checker function
+
+    Returns:
+        checker function taking an action
+    """
+    if not isinstance(schema, dict):
+        if not hasattr(schema, '__call__'):
+            raise TypeError('Expected the schema for "%s" to be a dict '
+                            'or a function.' % (action_type,))
+        return schema
+
+    required_types, required_tests = [], []
+    optional_types, optional_tests = [], []
+    for field, spec in schema.items():
+        types, tests = required_types, required_tests
+        if isinstance(spec, optional):
+            spec = spec.spec
+            types, tests = optional_types, optional_tests
+        if _is_type_spec(spec):
+            types.append((field, spec))
+        elif hasattr(spec, '__call__'):
+            tests.append((field, spec))
+        else:
+            raise TypeError('Invalid spec for field "%s" of "%s".' %
+                            (field, action_type))
+
+    required_fields = tuple(field for field, _ in required_types + required_tests)
+    required_types = tuple(required_types)
+    required_tests = tuple(required_tests)
+    optional_types = tuple(optional_types)
+    optional_tests = tuple(optional_tests)
+
+    def fail(field, spec, value):
+        raise ValueError('Action "%s" field "%s" expected %s, got %r.' %
+                         (action_type, field, _describe(spec), value))
+
+    def check(action):
+        for field in required_fields:
+            if field not in action:
+                raise ValueError('Action "%s" is missing required field "%s".' %
+                                 (action_type, field))
+        for field, types in required_types:
+            if not isinstance(action[field], types):
+                fail(field, types, action[field])
+        for field, test in required_tests:
+            if not test(action[field]):
+                fail(field, test, action[field])
+        for field, types in optional_types:
+            if field in action and not isinstance(action[field], types):
+                fail(field, types, action[field])
+        for field, test in optional_tests:
+            if field in action and not test(action[field]):
+                fail(field, test, action[field])
+
+    return check
+
+
+def create_validation_middleware(schemas, sample_rate=1.0,
+                                 compiler=compile_schema, on_invalid=None):
+    """
+    creates middleware that validates actions against per-type schemas
+
+    Args:
+        schemas: dict of action type => schema (see compile_schema())
+        sample_rate: fraction of actions to validate, spread evenly
+                     and counted per store.  1 validates every
+                     action; e.g. 0.01 validates every 100th action;
+                     0 disables validation.
+        compiler: function (action_type, schema) => checker
+        on_invalid: optional function (action, error) called instead
+                    of raising.  The action is dropped either way.
+
+    Returns:
+        a middleware function for apply_middleware()
+    """
+    if not 0 <= sample_rate <= 1:
+        raise ValueError('sample_rate must be between 0 and 1.')
+
+    schemas = dict(schemas)
+    checkers = {}
+
+    def get_checker(action_type):
+        try:
+            return checkers[action_type]
+        except KeyError:
+            pass
+        except TypeError:  # unhashable type
+            return None
+        schema = schemas.get(action_type)
+        checker = None if schema is None else compiler(action_type, schema)
+        checkers[action_type] = checker
+        return checker
+
+    def validation_middleware(store):
+        sample = create_sampler(sample_rate)
+
+        def wrapper(next_):
+            def validate_dispatch(action):
+                if not sample_rate or not isinstance(action, dict):
+                    return next_(action)
+                if sample_rate < 1 and not sample():
+                    return next_(action)
+
+                checker = get_checker(action.get('type'))
+                if checker is not None:
+                    try:
+                        checker(action)
+                    except ValueError as e:
+                        if on_invalid is None:
+                            raise
+                        on_invalid(action, e)
+                        return action
+                return next_(action)
+            return validate_dispatch
+        return wrapper
+
+    return validation_middleware
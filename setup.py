@@ -28,6 +28,12 @@ setup(
     author_email='benjamin@rqdq.com',
     packages=['pydux'],
     install_requires=[],
+    extras_require={
+        'msgpack': ['msgpack'],
+    },
+    entry_points={
+        'console_scripts': ['pydux-loadgen = pydux.loadgen:main'],
+    },
     license='MIT',
 )
 
@@ -3,9 +3,10 @@ from __future__ import absolute_import
 import unittest
 
 import mock
-from pydux import create_store, apply_middleware
+from pydux import create_store, apply_middleware, for_action_types
 from .helpers.reducers import reducers
-from .helpers.action_creators import add_todo, add_todo_if_empty
+from .helpers.action_creators import add_todo, add_todo_if_empty, unknown_action
+from .helpers.action_types import ADD_TODO, UNKNOWN_ACTION
 from .helpers.middleware import thunk
 
 
@@ -58,5 +59,71 @@ class TestApplyMiddleware(unittest.TestCase):
         ##TODO: add_todo_async
 
 
+
+class TestTypedMiddleware(unittest.TestCase):
+    def recorder(self, name, calls, action_types=None):
+        def middleware(store):
+            def wrapper(next_):
+                def record(action):
+                    calls.append((name, action['type'] if isinstance(action, dict) else 'thunk'))
+                    return next_(action)
+                return record
+            return wrapper
+        if action_types is not None:
+            middleware = for_action_types(*action_types)(middleware)
+        return middleware
+
+    def test_only_runs_middleware_for_declared_types(self):
+        calls = []
+        store = create_store(reducers['todos'], None, apply_middleware(
+            self.recorder('all', calls),
+            self.recorder('todos', calls, [ADD_TODO]),
+            self.recorder('other', calls, ['OTHER']),
+        ))
+        store.dispatch(add_todo('Hello'))
+        store.dispatch(unknown_action())
+        store.dispatch({'type': 'OTHER'})
+
+        self.assertEqual(calls, [
+            ('all', ADD_TODO), ('todos', ADD_TODO),
+            ('all', UNKNOWN_ACTION),
+            ('all', 'OTHER'), ('other', 'OTHER'),
+        ])
+        self.assertEqual(store.get_state(), [{'id': 1, 'text': 'Hello'}])
+
+    def test_preserves_middleware_order(self):
+        calls = []
+        store = create_store(reducers['todos'], None, apply_middleware(
+            self.recorder('a', calls, [ADD_TODO]),
+            self.recorder('b', calls),
+            self.recorder('c', calls, [ADD_TODO]),
+        ))
+        store.dispatch(add_todo('Hello'))
+        self.assertEqual([name for name, _ in calls], ['a', 'b', 'c'])
+
+    def test_caches_chains_per_type(self):
+        spy = mock.MagicMock()
+        def spying(store):
+            def wrapper(next_):
+                spy()
+                return next_
+            return wrapper
+
+        store = create_store(reducers['todos'], None, apply_middleware(
+            for_action_types(ADD_TODO)(spying)))
+        for i in range(3):
+            store.dispatch(add_todo('todo %d' % i))
+            store.dispatch(unknown_action())
+        self.assertEqual(spy.call_count, 1)
+
+    def test_thunks_skip_typed_middleware(self):
+        calls = []
+        store = create_store(reducers['todos'], None, apply_middleware(
+            thunk, self.recorder('todos', calls, [ADD_TODO])))
+        store.dispatch(add_todo_if_empty('Hello'))
+        self.assertEqual(calls, [('todos', ADD_TODO)])
+        self.assertEqual(store.get_state(), [{'id': 1, 'text': 'Hello'}])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,8 +1,10 @@
+import random
 import re
+import sys
 import unittest
 
 import mock
-from pydux import combine_reducers, create_store
+from pydux import combine_reducers, create_store, depends_on, handle_actions
 
 ACTION_TYPES = {
     'INIT': '@@redux/INIT'
@@ -165,6 +167,201 @@ class TestCombineReducers(unittest.TestCase):
             reducer()
         self.assertTrue('counter' in str(e.exception) and 'private' in str(e.exception))
 
+    def test_keeps_previous_object_for_equal_slices(self):
+        def copying(state=None, action=None):
+            return list(state or [1, 2])
+
+        def counter(state=None, action=None):
+            state = 0 if state is None else state
+            return state + 1 if action.get('type') == 'increment' else state
+
+        for compile_ in (False, True):
+            reducer = combine_reducers({'a': copying, 'b': counter, 'c': copying},
+                                       compile=compile_)
+            state = reducer(None, {'type': 'init'})
+            self.assertTrue(reducer(state, {'type': 'unknown'}) is state)
+
+            next_state = reducer(state, {'type': 'increment'})
+            self.assertEqual(next_state, {'a': [1, 2], 'b': 1, 'c': [1, 2]})
+            self.assertTrue(next_state['a'] is state['a'])
+            self.assertTrue(next_state['c'] is state['c'])
+
+    def test_does_not_compare_identical_slices(self):
+        class Slice(object):
+            def __ne__(self, other):
+                raise AssertionError('compared')
+            __eq__ = __ne__
+            __hash__ = object.__hash__
+
+        value = Slice()
+        reducer = combine_reducers({'a': lambda state=None, action=None: value})
+        state = {'a': value}
+        self.assertTrue(reducer(state, {'type': 'unknown'}) is state)
+
+
+def todos(state=None, action=None):
+    if state is None:
+        state = []
+    if action.get('type') == 'add':
+        return state + [action['text']]
+    return state
+
+
+class TestDependentReducers(unittest.TestCase):
+    def test_passes_updated_siblings_in_one_pass(self):
+        @depends_on('todos')
+        def summary(state, action, siblings):
+            return {'count': len(siblings['todos'])}
+
+        reducer = combine_reducers({'summary': summary, 'todos': todos})
+        state = reducer(None, {'type': 'init'})
+        self.assertEqual(state, {'todos': [], 'summary': {'count': 0}})
+        state = reducer(state, {'type': 'add', 'text': 'milk'})
+        self.assertEqual(state, {'todos': ['milk'], 'summary': {'count': 1}})
+
+    def test_orders_chains_of_dependencies(self):
+        calls = []
+
+        @depends_on('b')
+        def c(state, action, siblings):
+            calls.append('c')
+            return siblings['b'] * 10
+
+        @depends_on('a')
+        def b(state, action, siblings):
+            calls.append('b')
+            return siblings['a'] + 1
+
+        def a(state=None, action=None):
+            calls.append('a')
+            return (state or 0) + (1 if action.get('type') == 'inc' else 0)
+
+        reducer = combine_reducers({'c': c, 'b': b, 'a': a})
+        state = reducer(None, {'type': 'init'})
+        del calls[:]
+        state = reducer(state, {'type': 'inc'})
+        self.assertEqual(calls, ['a', 'b', 'c'])
+        self.assertEqual(state, {'a': 1, 'b': 2, 'c': 20})
+
+    def test_maintains_referential_equality(self):
+        @depends_on('todos')
+        def summary(state, action, siblings):
+            count = len(siblings['todos'])
+            return state if state and state['count'] == count else {'count': count}
+
+        reducer = combine_reducers({'summary': summary, 'todos': todos})
+        state = reducer(None, {'type': 'init'})
+        self.assertTrue(reducer(state, {'type': 'unknown'}) is state)
+
+    def test_reruns_handled_types_reducer_when_a_dependency_changed(self):
+        def select(state, action, siblings):
+            if action['type'] == 'select':
+                return action['index']
+            return min(state or 0, len(siblings['todos']))
+
+        selected = mock.MagicMock(wraps=select, depends_on=('todos',),
+                                  handled_types=frozenset(['select']))
+
+        reducer = combine_reducers({'selected': selected, 'todos': todos})
+        state = reducer(None, {'type': 'init'})
+        selected.reset_mock()
+        reducer(state, {'type': 'unknown'})
+        self.assertEqual(selected.call_count, 0)
+        reducer(state, {'type': 'add', 'text': 'milk'})
+        self.assertEqual(selected.call_count, 1)
+        self.assertEqual(selected.call_args[0][2], {'todos': ['milk']})
+
+    def test_throws_on_unknown_dependency(self):
+        with self.assertRaises(ValueError):
+            combine_reducers({'a': depends_on('b')(lambda state, action, siblings: 0)})
+
+    def test_throws_on_cycles(self):
+        with self.assertRaises(ValueError) as e:
+            combine_reducers({
+                'a': depends_on('b')(lambda state, action, siblings: 0),
+                'b': depends_on('a')(lambda state, action, siblings: 0),
+                'c': todos,
+            })
+        self.assertTrue('a, b' in str(e.exception))
+
+
+def make_tree(count):
+    def make_counter(i):
+        def counter(state=None, action=None):
+            state = 0 if state is None else state
+            if action.get('type') == 'inc' and action.get('key') == i:
+                return state + 1
+            return state
+        return counter
+
+    reducers = {}
+    for i in range(count):
+        if i % 3 == 0:
+            reducers['k%d' % i] = handle_actions({'set%d' % i: lambda s, a: a['value']}, 0)
+        else:
+            reducers['k%d' % i] = make_counter(i)
+    reducers['total'] = depends_on('k0', 'k1')(
+        lambda state, action, siblings: siblings['k0'] + siblings['k1'])
+    return reducers
+
+
+class TestCompiledCombineReducers(unittest.TestCase):
+    def test_matches_combination(self):
+        rng = random.Random(7)
+        for count in (2, 3, 10, 40):
+            reducers = make_tree(count)
+            plain = combine_reducers(reducers)
+            compiled = combine_reducers(reducers, compile=True)
+            self.assertFalse(compiled.__code__ is plain.__code__)
+
+            state_plain = plain(None, {'type': 'init'})
+            state_compiled = compiled(None, {'type': 'init'})
+            for _ in range(200):
+                i = rng.randrange(count)
+                action = rng.choice([
+                    {'type': 'inc', 'key': i},
+                    {'type': 'set%d' % i, 'value': rng.randrange(3)},
+                    {'type': 'noop'},
+                ])
+                next_plain = plain(state_plain, action)
+                next_compiled = compiled(state_compiled, action)
+                self.assertEqual(next_plain, next_compiled)
+                if sys.version_info >= (3, 7):  # ordered dicts
+                    self.assertEqual(list(next_plain), list(next_compiled))
+                self.assertEqual(next_plain is state_plain,
+                                 next_compiled is state_compiled)
+                state_plain, state_compiled = next_plain, next_compiled
+
+    def test_preserves_unchanged_slices(self):
+        reducer = combine_reducers({'a': lambda s=None, a=None: s or [1],
+                                    'b': lambda s=None, a=None: (s or 0) + 1},
+                                   compile=True)
+        state = reducer(None, {'type': 'init'})
+        next_state = reducer(state, {'type': 'any'})
+        self.assertTrue(next_state['a'] is state['a'])
+        self.assertEqual(next_state['b'], 2)
+
+    def test_throws_like_combination(self):
+        def broken(state=None, action=None):
+            if state is None:
+                return 0
+            return None if action['type'] == 'break' else state
+
+        reducer = combine_reducers({'broken': broken}, compile=True)
+        state = reducer(None, {'type': 'init'})
+        with self.assertRaises(Exception) as e:
+            reducer(state, {'type': 'break'})
+        self.assertTrue('"break"' in str(e.exception) and '"broken"' in str(e.exception))
+
+        reducer = combine_reducers({'undefined': lambda state=None, action=None: None},
+                                   compile=True)
+        with self.assertRaises(Exception):
+            reducer()
+
+    def test_reuses_code_for_same_shape(self):
+        first = combine_reducers(make_tree(5), compile=True)
+        second = combine_reducers(make_tree(5), compile=True)
+        self.assertTrue(first.__code__ is second.__code__)
 
 
 if __name__ == '__main__':
@@ -1,9 +1,10 @@
 from __future__ import absolute_import
 
+import gc
 import unittest
 
 import mock
-from pydux import create_store, combine_reducers
+from pydux import ListenerError, apply_middleware, create_store, combine_reducers
 from .helpers.action_creators import add_todo, dispatch_in_middle, throw_error, unknown_action
 from .helpers.reducers import reducers
 
@@ -366,6 +367,113 @@ class TestCreateStoreMethod(unittest.TestCase):
         self.assertEqual(len(listener_3.call_args_list), 3)
         self.assertEqual(len(listener_4.call_args_list), 1)
 
+    def test_notifies_listeners_in_subscription_order(self):
+        store = create_store(reducers['todos'])
+        calls = []
+
+        unsubscribe_b = store['subscribe'](lambda: calls.append('b'))
+        store['subscribe'](lambda: calls.append('c'))
+        unsubscribe_b()
+        store['subscribe'](lambda: calls.append('d'))
+        store['subscribe'](lambda: calls.append('b'))
+
+        store['dispatch'](unknown_action())
+        self.assertEqual(calls, ['c', 'd', 'b'])
+
+    def test_handles_subscription_churn(self):
+        store = create_store(reducers['todos'])
+        listener = mock.MagicMock()
+        store['subscribe'](listener)
+
+        unsubscribes = [store['subscribe'](lambda: None) for _ in range(1000)]
+        for unsubscribe in reversed(unsubscribes[::2]):
+            unsubscribe()
+        for unsubscribe in unsubscribes:
+            unsubscribe()
+
+        store['dispatch'](unknown_action())
+        self.assertEqual(len(listener.call_args_list), 1)
+
+    def test_weak_listeners_are_pruned_once_collected(self):
+        store = create_store(reducers['todos'])
+        calls = []
+
+        class View(object):
+            def __init__(self, name):
+                self.name = name
+            def render(self):
+                calls.append(self.name)
+
+        kept = View('kept')
+        dropped = View('dropped')
+        store['subscribe'](kept.render, weak=True)
+        store['subscribe'](dropped.render, weak=True)
+        self.assertEqual(store.listener_count(), 2)
+
+        store['dispatch'](unknown_action())
+        self.assertEqual(calls, ['kept', 'dropped'])
+
+        del dropped
+        gc.collect()
+        store['dispatch'](unknown_action())
+        self.assertEqual(calls, ['kept', 'dropped', 'kept'])
+        self.assertEqual(store.listener_count(), 1)
+
+    def test_weak_bound_methods_live_with_their_instance_without_weak_method(self):
+        import weakref
+        store = create_store(reducers['todos'])
+        calls = []
+
+        class View(object):
+            def render(self):
+                calls.append(self)
+
+        view = View()
+        WeakMethod = weakref.__dict__.pop('WeakMethod', None)  # as on python 2
+        try:
+            store['subscribe'](view.render, weak=True)
+        finally:
+            if WeakMethod is not None:
+                weakref.WeakMethod = WeakMethod
+        gc.collect()
+        store['dispatch'](unknown_action())
+        self.assertEqual(calls, [view])
+
+        del view, calls[:]
+        gc.collect()
+        store['dispatch'](unknown_action())
+        self.assertEqual(store.listener_count(), 0)
+
+    def test_weak_listener_functions_can_be_unsubscribed(self):
+        store = create_store(reducers['todos'])
+        listener = mock.MagicMock()
+
+        unsubscribe = store.subscribe(listener, weak=True)
+        store['dispatch'](unknown_action())
+        unsubscribe()
+        unsubscribe()
+        store['dispatch'](unknown_action())
+
+        self.assertEqual(len(listener.call_args_list), 1)
+        self.assertEqual(store.listener_count(), 0)
+
+    def test_listener_count_counts_live_listeners(self):
+        store = create_store(reducers['todos'])
+        self.assertEqual(store.listener_count(), 0)
+
+        def listener():
+            pass
+        unsubscribe = store['subscribe'](listener)
+        store['subscribe'](listener, weak=True)
+        self.assertEqual(store.listener_count(), 2)
+
+        unsubscribe()
+        self.assertEqual(store.listener_count(), 1)
+
+        del listener
+        gc.collect()
+        self.assertEqual(store.listener_count(), 0)
+
     def test_provides_up_to_date_state_when_subscriber_is_notified(self):
         store = create_store(reducers['todos'])
         def callback():
@@ -423,6 +531,149 @@ class TestCreateStoreMethod(unittest.TestCase):
             'bar': 2
         })
 
+    def test_queues_dispatches_from_listeners(self):
+        store = create_store(reducers['todos'], queue_dispatch=True)
+        seen = []
+
+        def listener():
+            state = store['get_state']()
+            seen.append(len(state))
+            if len(state) < 3:
+                store['dispatch'](add_todo('nested %d' % len(state)))
+                # the nested action is reduced after this listener returns
+                self.assertEqual(len(store['get_state']()), len(state))
+
+        store['subscribe'](listener)
+        store['dispatch'](add_todo('first'))
+        self.assertEqual(seen, [1, 2, 3])
+        self.assertEqual([todo['text'] for todo in store['get_state']()],
+                         ['first', 'nested 1', 'nested 2'])
+
+    def test_queued_dispatch_keeps_stack_depth_constant(self):
+        def counter(state=None, action=None):
+            state = 0 if state is None else state
+            return state + 1 if action.get('type') == 'increment' else state
+
+        store = create_store(counter, queue_dispatch=True)
+        def listener():
+            if store['get_state']() < 5000:
+                store['dispatch']({'type': 'increment'})
+        store['subscribe'](listener)
+        store['dispatch']({'type': 'increment'})
+        self.assertEqual(store['get_state'](), 5000)
+
+    def test_coalesces_notifications_for_queued_dispatches(self):
+        store = create_store(reducers['todos'], queue_dispatch=True,
+                             coalesce_notifications=True)
+        seen = []
+        def listener():
+            state = store['get_state']()
+            seen.append(len(state))
+            if len(state) == 1:
+                store['dispatch'](add_todo('a'))
+                store['dispatch'](add_todo('b'))
+        store['subscribe'](listener)
+        store['dispatch'](add_todo('first'))
+        self.assertEqual(seen, [1, 3])
+
+    def test_queued_dispatch_validates_actions_when_queued(self):
+        store = create_store(reducers['todos'], queue_dispatch=True)
+        def listener():
+            store['dispatch']({'type': None})
+        store['subscribe'](listener)
+        with self.assertRaises(ValueError):
+            store['dispatch'](unknown_action())
+
+    def test_queued_dispatch_still_forbids_dispatch_from_reducer(self):
+        store = create_store(reducers['dispatch_in_middle_of_reducer'], queue_dispatch=True)
+        with self.assertRaises(Exception) as e:
+            store['dispatch'](dispatch_in_middle(lambda: store['dispatch'](unknown_action())))
+        self.assertTrue('may not dispatch' in str(e.exception))
+
+    def test_queued_dispatch_forbids_dispatch_from_reducer_while_draining(self):
+        store = create_store(reducers['dispatch_in_middle_of_reducer'], queue_dispatch=True)
+        dispatched = []
+        def listener():
+            if not dispatched:
+                dispatched.append(True)
+                store['dispatch'](dispatch_in_middle(
+                    lambda: store['dispatch'](unknown_action())))
+        store['subscribe'](listener)
+        with self.assertRaises(Exception) as e:
+            store['dispatch'](unknown_action())
+        self.assertTrue('may not dispatch' in str(e.exception))
+
+    def test_passes_options_through_enhancers(self):
+        store = create_store(reducers['todos'], None, apply_middleware(), queue_dispatch=True)
+        calls = []
+        def listener():
+            calls.append(len(store['get_state']()))
+            if len(calls) == 1:
+                store['dispatch'](add_todo('nested'))
+                calls.append('returned')
+        store['subscribe'](listener)
+        store['dispatch'](add_todo('first'))
+        self.assertEqual(calls, [1, 'returned', 2])
+
+    def test_isolated_listeners_all_run_and_errors_are_aggregated(self):
+        store = create_store(reducers['todos'], isolate_listeners=True)
+        called = []
+        failing = []
+
+        def make_listener(i):
+            def listener():
+                called.append(i)
+                if i % 10 == 3:
+                    raise ValueError(i)
+            if i % 10 == 3:
+                failing.append(listener)
+            return listener
+
+        for i in range(1000):
+            store['subscribe'](make_listener(i))
+
+        with self.assertRaises(ListenerError) as e:
+            store['dispatch'](add_todo('Hello'))
+        self.assertEqual(called, list(range(1000)))
+        self.assertEqual(len(e.exception.errors), 100)
+        self.assertEqual([listener for listener, _ in e.exception.errors], failing)
+        self.assertEqual([err.args[0] for _, err in e.exception.errors],
+                         list(range(3, 1000, 10)))
+        self.assertEqual(store['get_state'](), [{'id': 1, 'text': 'Hello'}])
+
+    def test_reports_listener_errors_to_callback(self):
+        on_listener_error = mock.MagicMock()
+        store = create_store(reducers['todos'], on_listener_error=on_listener_error)
+        listener_a = mock.MagicMock(side_effect=ValueError('a'))
+        listener_b = mock.MagicMock()
+        listener_c = mock.MagicMock(side_effect=KeyError('c'))
+        for listener in [listener_a, listener_b, listener_c]:
+            store['subscribe'](listener)
+
+        action = unknown_action()
+        store['dispatch'](action)
+        store['dispatch'](action)
+
+        self.assertEqual(len(listener_b.call_args_list), 2)
+        self.assertEqual(on_listener_error.call_count, 4)
+        args = on_listener_error.call_args_list[1][0]
+        self.assertTrue(args[0] is action)
+        self.assertTrue(args[1] is listener_c)
+        self.assertTrue(isinstance(args[2], KeyError))
+
+    def test_listener_error_aborts_notification_by_default(self):
+        store = create_store(reducers['todos'])
+        listener = mock.MagicMock()
+        store['subscribe'](mock.MagicMock(side_effect=ValueError()))
+        store['subscribe'](listener)
+        with self.assertRaises(ValueError):
+            store['dispatch'](unknown_action())
+        self.assertEqual(len(listener.call_args_list), 0)
+
+    def test_throws_on_unknown_option(self):
+        with self.assertRaises(TypeError):
+            create_store(reducers['todos'], queue_dispach=True)
+
     def test_does_not_allow_dispatch_from_within_reducer(self):
         store = create_store(reducers['dispatch_in_middle_of_reducer'])
         with self.assertRaises(Exception) as e:
@@ -0,0 +1,110 @@
+import json
+import unittest
+
+import mock
+from pydux import combine_reducers, create_store
+from pydux.diff import diff, patch, subscribe_patches
+
+
+class TestDiff(unittest.TestCase):
+    def test_returns_no_operations_for_same_or_equal_state(self):
+        state = {'a': [1, 2], 'b': {'c': 3}}
+        self.assertEqual(diff(state, state), [])
+        self.assertEqual(diff(state, json.loads(json.dumps(state))), [])
+
+    def test_describes_nested_changes(self):
+        prev = {'a': 1, 'b': {'c': 2, 'd': 3}, 'e': [1, 2, 3]}
+        next_ = {'a': 1, 'b': {'c': 20}, 'e': [1, 5], 'f': 'new'}
+        ops = diff(prev, next_)
+        self.assertEqual(sorted(ops, key=repr), sorted([
+            {'op': 'replace', 'path': ['b', 'c'], 'value': 20},
+            {'op': 'remove', 'path': ['b', 'd']},
+            {'op': 'replace', 'path': ['e', 1], 'value': 5},
+            {'op': 'remove', 'path': ['e', 2]},
+            {'op': 'add', 'path': ['f'], 'value': 'new'},
+        ], key=repr))
+
+    def test_replaces_values_of_different_type(self):
+        self.assertEqual(diff({'a': 1}, {'a': True}),
+                         [{'op': 'replace', 'path': ['a'], 'value': True}])
+        self.assertEqual(diff([1], {'0': 1}),
+                         [{'op': 'replace', 'path': [], 'value': {'0': 1}}])
+
+    def test_skips_identical_subtrees_without_visiting_them(self):
+        unchanged = mock.MagicMock()
+        prev = {'big': unchanged, 'n': 1}
+        next_ = {'big': unchanged, 'n': 2}
+        self.assertEqual(diff(prev, next_), [{'op': 'replace', 'path': ['n'], 'value': 2}])
+        self.assertEqual(unchanged.method_calls, [])
+
+
+class TestPatch(unittest.TestCase):
+    def test_round_trips_diff(self):
+        cases = [
+            ({'a': 1, 'b': {'c': [1, 2, {'d': 4}]}},
+             {'a': 2, 'b': {'c': [1, {'x': 1}, {'d': 5}, 6]}, 'g': None}),
+            ({'list': [1, 2, 3, 4]}, {'list': [1]}),
+            ({'list': []}, {'list': [1, 2, 3]}),
+            (1, {'a': 1}),
+        ]
+        for prev, next_ in cases:
+            self.assertEqual(patch(prev, diff(prev, next_)), next_)
+
+    def test_does_not_mutate_input_and_shares_untouched_subtrees(self):
+        prev = {'a': {'x': 1}, 'b': {'y': 2}}
+        before = json.dumps(prev, sort_keys=True)
+        out = patch(prev, [{'op': 'replace', 'path': ['a', 'x'], 'value': 10}])
+
+        self.assertEqual(out, {'a': {'x': 10}, 'b': {'y': 2}})
+        self.assertEqual(json.dumps(prev, sort_keys=True), before)
+        self.assertTrue(out['b'] is prev['b'])
+
+    def test_survives_json_transport(self):
+        prev = {'todos': [{'id': 1, 'done': False}]}
+        next_ = {'todos': [{'id': 1, 'done': True}, {'id': 2, 'done': False}]}
+        ops = json.loads(json.dumps(diff(prev, next_)))
+        self.assertEqual(patch(prev, ops), next_)
+
+    def test_throws_on_unknown_operation(self):
+        with self.assertRaises(ValueError):
+            patch({'a': 1}, [{'op': 'move', 'path': ['a']}])
+        with self.assertRaises(ValueError):
+            patch({'a': 1}, [{'op': 'remove', 'path': []}])
+
+
+class TestSubscribePatches(unittest.TestCase):
+    def test_emits_patches_for_changed_state(self):
+        def counter(state=None, action=None):
+            state = 0 if state is None else state
+            return state + 1 if action.get('type') == 'increment' else state
+
+        def other(state=None, action=None):
+            return {'static': True} if state is None else state
+
+        store = create_store(combine_reducers({'counter': counter, 'other': other}))
+        client_state = store.get_state()
+        received = []
+
+        def on_patch(ops):
+            received.append(ops)
+
+        unsubscribe = subscribe_patches(store, on_patch)
+        store.dispatch({'type': 'increment'})
+        store.dispatch({'type': 'unknown'})
+        store.dispatch({'type': 'increment'})
+
+        self.assertEqual(received, [
+            [{'op': 'replace', 'path': ['counter'], 'value': 1}],
+            [{'op': 'replace', 'path': ['counter'], 'value': 2}],
+        ])
+        for ops in received:
+            client_state = patch(client_state, ops)
+        self.assertEqual(client_state, store.get_state())
+
+        unsubscribe()
+        store.dispatch({'type': 'increment'})
+        self.assertEqual(len(received), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
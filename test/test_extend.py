@@ -0,0 +1,66 @@
+import unittest
+
+from pydux.extend import OverlayDict, extend, extend_overlay
+
+
+class TestExtend(unittest.TestCase):
+    def test_merges_into_a_new_instance(self):
+        a = {'a': 1, 'b': 2}
+        out = extend(a, {'b': 3}, {'c': 4})
+        self.assertEqual(out, {'a': 1, 'b': 3, 'c': 4})
+        self.assertEqual(a, {'a': 1, 'b': 2})
+
+    def test_preserves_type(self):
+        class Sub(dict):
+            pass
+        self.assertTrue(type(extend(Sub(a=1), {'b': 2})) is Sub)
+        self.assertEqual(extend(), {})
+
+
+class TestExtendOverlay(unittest.TestCase):
+    def test_has_dict_read_semantics(self):
+        base = {'a': 1, 'b': 2}
+        out = extend_overlay(base, {'b': 3}, {'c': 4})
+
+        self.assertEqual(out, {'a': 1, 'b': 3, 'c': 4})
+        self.assertEqual({'a': 1, 'b': 3, 'c': 4}, out)
+        self.assertFalse(out != {'a': 1, 'b': 3, 'c': 4})
+        self.assertEqual(out['b'], 3)
+        self.assertEqual(out.get('d', 5), 5)
+        self.assertTrue('c' in out and 'd' not in out)
+        self.assertEqual(len(out), 3)
+        self.assertEqual(sorted(out), ['a', 'b', 'c'])
+        self.assertEqual(sorted(out.items()), [('a', 1), ('b', 3), ('c', 4)])
+        self.assertEqual(dict(out), {'a': 1, 'b': 3, 'c': 4})
+        with self.assertRaises(KeyError):
+            out['d']
+
+    def test_shares_base_and_copies_updates(self):
+        base = {'a': 1}
+        update = {'b': 2}
+        out = extend_overlay(base, update)
+        update['b'] = 3
+        self.assertEqual(out['b'], 2)
+        self.assertEqual(base, {'a': 1})
+
+    def test_chains_and_compacts(self):
+        out = extend_overlay({'n': 0})
+        for i in range(1, 50):
+            out = extend_overlay(out, {'n': i, i: i})
+            self.assertTrue(out.depth <= OverlayDict.max_depth)
+        self.assertEqual(out['n'], 49)
+        self.assertEqual(len(out), 50)
+        self.assertEqual(out.to_dict(), dict([('n', 49)] + [(i, i) for i in range(1, 50)]))
+
+    def test_extend_keeps_overlays(self):
+        out = extend(extend_overlay({'a': 1}, {'b': 2}), {'c': 3})
+        self.assertTrue(isinstance(out, OverlayDict))
+        self.assertEqual(out, {'a': 1, 'b': 2, 'c': 3})
+
+    def test_is_not_hashable(self):
+        with self.assertRaises(TypeError):
+            hash(extend_overlay({'a': 1}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+import mock
+from pydux import combine_reducers, create_reducer, create_store, handle_actions
+
+
+def increment(state, action):
+    return state + action.get('by', 1)
+
+def decrement(state, action):
+    return state - 1
+
+
+class TestHandleActions(unittest.TestCase):
+    def test_returns_default_state_when_state_is_none(self):
+        reducer = handle_actions({'INCREMENT': increment}, 0)
+        self.assertEqual(reducer(None, {'type': '@@redux/INIT'}), 0)
+        self.assertEqual(reducer(None), 0)
+
+    def test_calls_handler_for_matching_type(self):
+        reducer = handle_actions({
+            'INCREMENT': increment,
+            'DECREMENT': decrement,
+        }, 0)
+        self.assertEqual(reducer(5, {'type': 'INCREMENT'}), 6)
+        self.assertEqual(reducer(5, {'type': 'INCREMENT', 'by': 3}), 8)
+        self.assertEqual(reducer(5, {'type': 'DECREMENT'}), 4)
+
+    def test_returns_same_state_for_unknown_action(self):
+        state = {'a': 1}
+        reducer = handle_actions({'INCREMENT': increment}, {})
+        self.assertTrue(reducer(state, {'type': 'UNKNOWN'}) is state)
+        self.assertTrue(reducer(state, '@@INIT') is state)
+
+    def test_exposes_handled_types(self):
+        reducer = handle_actions({'A': increment, 'B': decrement}, 0)
+        self.assertEqual(reducer.handled_types, frozenset(['A', 'B']))
+
+    def test_throws_if_handler_is_not_a_function(self):
+        with self.assertRaises(TypeError):
+            handle_actions({'A': 'not a function'}, 0)
+
+    def test_create_reducer_takes_initial_state_first(self):
+        reducer = create_reducer(10, {'INCREMENT': increment})
+        self.assertEqual(reducer(None, {'type': 'INCREMENT'}), 11)
+        self.assertEqual(reducer.handled_types, frozenset(['INCREMENT']))
+
+    def test_works_with_create_store(self):
+        store = create_store(handle_actions({'INCREMENT': increment}, 0))
+        store.dispatch({'type': 'INCREMENT'})
+        store.dispatch({'type': 'INCREMENT'})
+        self.assertEqual(store.get_state(), 2)
+
+
+class TestCombineReducersRouting(unittest.TestCase):
+    def test_skips_reducers_that_do_not_handle_the_type(self):
+        spy = mock.MagicMock(side_effect=increment)
+        reducer = combine_reducers({
+            'counter': handle_actions({'INCREMENT': spy}, 0),
+            'other': handle_actions({'OTHER': decrement}, 0),
+        })
+        state = reducer(None, {'type': '@@redux/INIT'})
+        self.assertEqual(state, {'counter': 0, 'other': 0})
+
+        self.assertTrue(reducer(state, {'type': 'OTHER'})['counter'] == 0)
+        self.assertEqual(spy.call_count, 0)
+
+        self.assertEqual(reducer(state, {'type': 'INCREMENT'}),
+                         {'counter': 1, 'other': 0})
+        self.assertEqual(spy.call_count, 1)
+
+    def test_maintains_referential_equality_for_unhandled_types(self):
+        reducer = combine_reducers({
+            'counter': handle_actions({'INCREMENT': increment}, 0),
+            'items': handle_actions({'ADD': lambda s, a: s + [a['item']]}, []),
+        })
+        state = reducer(None, {'type': '@@redux/INIT'})
+        self.assertTrue(reducer(state, {'type': 'UNKNOWN'}) is state)
+
+    def test_initializes_missing_slices_for_any_type(self):
+        reducer = combine_reducers({
+            'counter': handle_actions({'INCREMENT': increment}, 0),
+        })
+        self.assertEqual(reducer({}, {'type': 'UNKNOWN'}), {'counter': 0})
+
+    def test_passes_unhashable_types(self):
+        for compile in (False, True):
+            reducer = combine_reducers({
+                'counter': handle_actions({'INCREMENT': increment}, 0),
+                'last': lambda state=None, action=None: action.get('type'),
+            }, compile=compile)
+            state = reducer(None, {'type': '@@redux/INIT'})
+            self.assertEqual(reducer(state, {'type': ['T']}), {'counter': 0, 'last': ['T']})
+            self.assertEqual(handle_actions({'T': increment}, 0)(None, {'type': ['T']}), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+
+import mock
+from pydux import add_hook, combine_reducers, create_store, remove_hook
+from .helpers.action_creators import add_todo, throw_error, unknown_action
+from .helpers.reducers import reducers
+
+
+class Recorder(object):
+    def __init__(self):
+        self.events = []
+    def __call__(self, event, args):
+        self.events.append((event, args))
+    def names(self):
+        return [event for event, _ in self.events]
+
+
+class TestStoreHooks(unittest.TestCase):
+    def test_reports_dispatch_events(self):
+        hook = Recorder()
+        store = create_store(reducers['todos'], hooks=[hook])
+        store.subscribe(lambda: None)
+        store.subscribe(lambda: None)
+        del hook.events[:]
+
+        action = add_todo('Hello')
+        store.dispatch(action)
+        self.assertEqual(hook.names(), ['before_dispatch', 'after_reduce', 'after_notify'])
+        self.assertEqual(hook.events[0][1], (action,))
+        self.assertTrue(hook.events[1][1][0] is action)
+        self.assertTrue(hook.events[1][1][1] >= 0)
+        self.assertEqual(hook.events[2][1][:2], (action, 2))
+
+    def test_reports_listener_errors_and_reraises(self):
+        hook = Recorder()
+        store = create_store(reducers['todos'], hooks=[hook])
+        def failing():
+            raise ValueError('listener failed')
+        store.subscribe(failing)
+
+        with self.assertRaises(ValueError):
+            store.dispatch(unknown_action())
+        event, args = hook.events[-1]
+        self.assertEqual(event, 'listener_error')
+        self.assertTrue(args[1] is failing)
+        self.assertTrue(isinstance(args[2], ValueError))
+
+    def test_reports_isolated_listener_errors(self):
+        hook = Recorder()
+        on_listener_error = mock.MagicMock()
+        store = create_store(reducers['todos'], hooks=[hook],
+                             on_listener_error=on_listener_error)
+        store.subscribe(mock.MagicMock(side_effect=ValueError()))
+        store.subscribe(lambda: None)
+        del hook.events[:]
+
+        store.dispatch(unknown_action())
+        self.assertEqual(hook.names(), ['before_dispatch', 'after_reduce',
+                                        'listener_error', 'after_notify'])
+        self.assertEqual(hook.events[-1][1][1], 2)
+        self.assertEqual(on_listener_error.call_count, 1)
+
+    def test_reducer_errors_propagate(self):
+        hook = Recorder()
+        store = create_store(reducers['error_throwing_reducer'], hooks=[hook])
+        with self.assertRaises(Exception):
+            store.dispatch(throw_error())
+        self.assertEqual(hook.names()[-1], 'before_dispatch')
+
+    def test_global_hooks_apply_to_stores_created_afterwards(self):
+        hook = Recorder()
+        before = create_store(reducers['todos'])
+        add_hook(hook)
+        try:
+            after = create_store(reducers['todos'])
+        finally:
+            remove_hook(hook)
+        del hook.events[:]
+
+        before.dispatch(unknown_action())
+        self.assertEqual(hook.events, [])
+        after.dispatch(unknown_action())
+        self.assertEqual(len(hook.events), 3)
+
+    def test_works_with_queued_dispatch(self):
+        hook = Recorder()
+        store = create_store(reducers['todos'], hooks=[hook], queue_dispatch=True)
+        def listener():
+            if len(store.get_state()) == 1:
+                store.dispatch(add_todo('nested'))
+        store.subscribe(listener)
+        del hook.events[:]
+        store.dispatch(add_todo('first'))
+        self.assertEqual(hook.names(), ['before_dispatch', 'after_reduce', 'after_notify'] * 2)
+
+    def test_uses_plain_dispatch_without_hooks(self):
+        self.assertEqual(create_store(reducers['todos'])['dispatch'].__name__, 'dispatch')
+        hooked = create_store(reducers['todos'], hooks=[Recorder()])
+        self.assertNotEqual(hooked['dispatch'].__name__, 'dispatch')
+
+    def test_throws_if_hook_is_not_a_function(self):
+        with self.assertRaises(TypeError):
+            create_store(reducers['todos'], hooks=['hook'])
+        with self.assertRaises(TypeError):
+            add_hook(None)
+
+
+class TestCombineReducersHooks(unittest.TestCase):
+    def test_reports_changed_slices(self):
+        hook = Recorder()
+        reducer = combine_reducers({
+            'todos': reducers['todos'],
+            'other': reducers['error_throwing_reducer'],
+        }, hooks=[hook])
+
+        state = reducer(None, {'type': '@@redux/INIT'})
+        self.assertEqual(sorted(hook.events),
+                         [('slice_changed', ('other', {'type': '@@redux/INIT'})),
+                          ('slice_changed', ('todos', {'type': '@@redux/INIT'}))])
+        del hook.events[:]
+
+        self.assertTrue(reducer(state, unknown_action()) is state)
+        self.assertEqual(hook.events, [])
+
+        action = add_todo('Hello')
+        reducer(state, action)
+        self.assertEqual(hook.events, [('slice_changed', ('todos', action))])
+
+    def test_does_not_compare_unchanged_slices(self):
+        class Slice(object):
+            def __ne__(self, other):
+                raise AssertionError('compared')
+            __eq__ = __ne__
+            __hash__ = object.__hash__
+
+        hook = Recorder()
+        value = Slice()
+        reducer = combine_reducers({
+            'todos': reducers['todos'],
+            'other': lambda state=None, action=None: value,
+        }, hooks=[hook])
+        action = add_todo('Hello')
+        reducer({'todos': [], 'other': value}, action)
+        self.assertEqual(hook.events, [('slice_changed', ('todos', action))])
+
+    def test_uses_plain_combination_without_hooks(self):
+        reducer = combine_reducers({'todos': reducers['todos']})
+        self.assertEqual(reducer.__name__, 'combination')
+
+
+if __name__ == '__main__':
+    unittest.main()
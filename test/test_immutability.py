@@ -0,0 +1,127 @@
+import unittest
+
+import mock
+from pydux import apply_middleware, check_immutability, combine_reducers, create_store
+from pydux.compose import compose
+from pydux.immutability import MutationChecker, MutationError
+from pydux.thunk_middleware import thunk_middleware
+
+
+def todos(state=None, action=None):
+    if state is None:
+        state = {'items': [], 'meta': {'tags': ['a']}}
+    if action.get('type') == 'ADD':
+        return dict(state, items=state['items'] + [{'text': action['text']}])
+    if action.get('type') == 'ADD_IN_PLACE':
+        state['items'].append({'text': action['text']})
+        return dict(state)
+    if action.get('type') == 'TAG_IN_PLACE':
+        state['meta']['tags'].append(action['tag'])
+        return state
+    if action.get('type') == 'RENAME_IN_PLACE':
+        state['items'][0]['text'] = action['text']
+        return dict(state)
+    return state
+
+reducer = combine_reducers({'todos': todos, 'other': lambda state=None, action=None: state or {}})
+
+
+class TestMutationChecker(unittest.TestCase):
+    def test_accepts_new_objects(self):
+        checker = MutationChecker()
+        state = {'a': [1, 2], 'b': {'c': 3}}
+        self.assertEqual(checker.check(state), [])
+        state = dict(state, a=state['a'] + [3])
+        self.assertEqual(checker.check(state), [])
+        self.assertEqual(checker.check(dict(state, b=5)), [])
+        self.assertEqual(len(checker), 2)
+
+    def test_finds_mutated_path(self):
+        checker = MutationChecker()
+        state = {'a': {'b': [1, 2]}, 'c': (1, [2])}
+        checker.check(state)
+        state['a']['b'][0] = 10
+        state['c'][1].append(3)
+        self.assertEqual(sorted(checker.check(state)), [('a', 'b'), ('c', 1)])
+        self.assertEqual(checker.check(state), [])
+
+    def test_bounds_verification_per_check(self):
+        state = {'items': [[i] for i in range(100)]}
+        checker = MutationChecker(max_nodes=10)
+        checker.check(state)
+        state['items'][57].append(0)
+
+        checks = 1
+        while not checker.check(state):
+            checks += 1
+        self.assertTrue(1 < checks <= 11)
+
+    def test_forgets_removed_subtrees(self):
+        checker = MutationChecker()
+        inner = {'x': [1]}
+        checker.check({'a': inner})
+        checker.check({'a': 1})
+        self.assertEqual(len(checker), 1)
+        inner['x'].append(2)
+        self.assertEqual(checker.check({'a': 1}), [])
+
+
+class TestCheckImmutability(unittest.TestCase):
+    def test_passes_pure_reducers(self):
+        store = create_store(reducer, None, check_immutability())
+        store.dispatch({'type': 'ADD', 'text': 'milk'})
+        self.assertEqual(store.get_state()['todos']['items'], [{'text': 'milk'}])
+
+    def test_raises_with_path(self):
+        store = create_store(reducer, None, check_immutability())
+        with self.assertRaises(MutationError) as cm:
+            store.dispatch({'type': 'ADD_IN_PLACE', 'text': 'milk'})
+        self.assertEqual(cm.exception.path, ('todos', 'items'))
+        self.assertEqual(cm.exception.action['type'], 'ADD_IN_PLACE')
+
+    def test_finds_deep_mutation_of_unchanged_slice(self):
+        on_mutation = mock.MagicMock()
+        store = create_store(reducer, None, check_immutability(on_mutation=on_mutation))
+        store.dispatch({'type': 'ADD', 'text': 'milk'})
+        store.dispatch({'type': 'TAG_IN_PLACE', 'tag': 'b'})
+        store.dispatch({'type': 'RENAME_IN_PLACE', 'text': 'eggs'})
+        self.assertEqual([c[0][0] for c in on_mutation.call_args_list],
+                         [('todos', 'meta', 'tags'), ('todos', 'items', 0)])
+
+    def test_samples_dispatches(self):
+        on_mutation = mock.MagicMock()
+        enhancer = check_immutability(sample_rate=0.25, on_mutation=on_mutation)
+        store = create_store(reducer, None, enhancer)
+        store.dispatch({'type': 'TAG_IN_PLACE', 'tag': 'b'})
+        store.dispatch({'type': 'NOOP'})
+        store.dispatch({'type': 'NOOP'})
+        self.assertEqual(on_mutation.call_count, 0)
+        store.dispatch({'type': 'NOOP'})
+        on_mutation.assert_called_once_with(('todos', 'meta', 'tags'), {'type': 'NOOP'})
+
+    def test_samples_fractions_of_dispatches(self):
+        store = create_store(reducer, None, check_immutability(sample_rate=0.7))
+        with mock.patch.object(MutationChecker, 'check', return_value=[]) as check:
+            for _ in range(10):
+                store.dispatch({'type': 'NOOP'})
+        self.assertEqual(check.call_count, 7)
+
+    def test_disabled(self):
+        store = create_store(reducer, None, check_immutability(sample_rate=0))
+        store.dispatch({'type': 'ADD_IN_PLACE', 'text': 'milk'})
+
+    def test_composes_with_middleware(self):
+        enhancer = compose(check_immutability(), apply_middleware(thunk_middleware))
+        store = create_store(reducer, None, enhancer)
+        store.dispatch(lambda dispatch, get_state: dispatch({'type': 'ADD', 'text': 'x'}))
+        with self.assertRaises(MutationError):
+            store.dispatch(lambda dispatch, get_state: dispatch(
+                {'type': 'ADD_IN_PLACE', 'text': 'y'}))
+
+    def test_throws_on_invalid_sample_rate(self):
+        with self.assertRaises(ValueError):
+            check_immutability(sample_rate=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import pydux
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# cumulative microseconds for `import pydux`, bytecode compilation included
+IMPORT_BUDGET_US = 50000
+
+
+def run_python(*args):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([ROOT, env.get('PYTHONPATH', '')])
+    process = subprocess.Popen([sys.executable] + list(args), cwd=ROOT, env=env,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               universal_newlines=True)
+    out, err = process.communicate()
+    if process.returncode != 0:
+        raise AssertionError(err)
+    return out, err
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'requires -X importtime')
+class TestImportTime(unittest.TestCase):
+    def test_import_is_within_budget(self):
+        _, err = run_python('-X', 'importtime', '-c', 'import pydux')
+        cumulative = None
+        for line in err.splitlines():
+            if not line.startswith('import time:'):
+                continue
+            fields = [field.strip() for field in line[len('import time:'):].split('|')]
+            if fields[2] == 'pydux':
+                cumulative = int(fields[1])
+        self.assertTrue(cumulative is not None, err)
+        self.assertTrue(cumulative < IMPORT_BUDGET_US,
+                        'import pydux took %dus, budget is %dus' %
+                        (cumulative, IMPORT_BUDGET_US))
+
+    def test_only_create_store_is_imported_eagerly(self):
+        out, _ = run_python('-c', 'import sys, pydux; print(" ".join(sorted(sys.modules)))')
+        modules = set(out.split())
+        self.assertTrue('pydux.create_store' in modules)
+        for name in ['pydux.combine_reducers', 'pydux.apply_middleware',
+                     'pydux.handle_actions', 'pydux.memoize_reducer', 'random']:
+            self.assertFalse(name in modules, name)
+
+
+class TestLazyAttributes(unittest.TestCase):
+    def test_lazy_attributes_resolve_to_functions(self):
+        for name in pydux.__all__:
+            self.assertTrue(hasattr(getattr(pydux, name), '__call__'), name)
+        self.assertEqual(sorted(pydux.__all__), [name for name in dir(pydux)
+                                                 if name in pydux.__all__])
+
+    def test_submodule_import_does_not_shadow_function(self):
+        import pydux.combine_reducers
+        from pydux.apply_middleware import apply_middleware
+        self.assertTrue(pydux.combine_reducers.__name__ == 'combine_reducers')
+        self.assertTrue(pydux.apply_middleware is apply_middleware)
+
+    def test_imports_eagerly_before_python_3_7(self):
+        out, _ = run_python('-c', '; '.join([
+            'import sys',
+            'sys.version_info = (3, 6)',
+            'import pydux, pydux.combine_reducers',
+            'print("%s %s %s" % (type(pydux).__name__, pydux.combine_reducers.__name__,'
+            ' "pydux.undoable" in sys.modules))',
+        ]))
+        self.assertEqual(out.split(), ['module', 'combine_reducers', 'True'])
+
+    def test_unknown_attribute_raises(self):
+        with self.assertRaises(AttributeError):
+            pydux.does_not_exist
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import io
+import json
+import time
+import unittest
+
+import mock
+from pydux import create_store
+from pydux.ingest import (
+    BATCH, Ingest, batch, decode_json, enable_batching,
+)
+
+try:
+    import queue
+except ImportError:  # python 2
+    import Queue as queue
+
+try:
+    namespace = {}
+    exec('async def agen(items):\n'
+         '    for item in items:\n'
+         '        yield item\n', namespace)
+    agen = namespace['agen']
+except SyntaxError:
+    agen = None
+
+
+def counter(state=None, action=None):
+    state = 0 if state is None else state
+    if action and action.get('type') == 'ADD':
+        return state + action['n']
+    return state
+
+def make_store():
+    return create_store(enable_batching(counter))
+
+def adds(count):
+    return [{'type': 'ADD', 'n': 1} for _ in range(count)]
+
+
+class TestEnableBatching(unittest.TestCase):
+    def test_reduces_batched_actions_in_order(self):
+        reducer = enable_batching(lambda state, action: (state or []) + [action['type']])
+        state = reducer([], batch([{'type': 'a'}, {'type': 'b'}]))
+        self.assertEqual(state, ['a', 'b'])
+
+    def test_notifies_once_per_batch(self):
+        store = make_store()
+        listener = mock.MagicMock()
+        store.subscribe(listener)
+        store.dispatch(batch(adds(5)))
+        self.assertEqual(store.get_state(), 5)
+        self.assertEqual(listener.call_count, 1)
+
+    def test_keeps_handled_types(self):
+        reducer = mock.MagicMock()
+        reducer.handled_types = frozenset(['ADD'])
+        self.assertEqual(enable_batching(reducer).handled_types, frozenset(['ADD', BATCH]))
+
+
+class TestIngest(unittest.TestCase):
+    def test_dispatches_lines_in_batches(self):
+        lines = io.StringIO(u''.join(json.dumps(a) + u'\n' for a in adds(25)) + u'\n')
+        store = make_store()
+        listener = mock.MagicMock()
+        store.subscribe(listener)
+
+        stats = Ingest(store, lines, decode=decode_json, batch_size=10).run()
+        self.assertEqual(store.get_state(), 25)
+        self.assertEqual(stats.received, 26)
+        self.assertEqual(stats.dispatched, 25)
+        self.assertEqual(stats.batches, listener.call_count)
+        self.assertTrue(3 <= stats.batches <= 26)
+        self.assertEqual(stats.buffered, 0)
+
+    def test_dispatches_unbatched(self):
+        store = create_store(counter)
+        stats = Ingest(store, adds(7), batched=False).run()
+        self.assertEqual(store.get_state(), 7)
+        self.assertEqual(stats.dispatched, 7)
+
+    def test_applies_backpressure(self):
+        source = queue.Queue()
+        for action in adds(200):
+            source.put(action)
+        source.put(None)
+
+        store = make_store()
+        ingest = Ingest(store, source, batch_size=5, high_water=20, low_water=10)
+        buffered = []
+        store.subscribe(lambda: buffered.append(ingest.stats().buffered))
+
+        ingest.start()
+        with ingest._cond:
+            while not ingest._paused:
+                ingest._cond.wait(1)
+        self.assertEqual(ingest.stats().buffered, 20)
+        self.assertEqual(ingest.pump(), 20)
+
+        stats = ingest.run()
+        self.assertEqual(store.get_state(), 200)
+        self.assertTrue(stats.pauses >= 1)
+        self.assertTrue(max(buffered) <= 20)
+
+    def test_reports_lag(self):
+        now = [0.0]
+        store = make_store()
+        source = queue.Queue()
+        ingest = Ingest(store, source, clock=lambda: now[0])
+        ingest.start()
+        source.put({'type': 'ADD', 'n': 1})
+        while ingest.stats().buffered == 0:
+            time.sleep(0.001)
+        now[0] = 2.5
+        self.assertEqual(ingest.stats().lag, 2.5)
+        ingest.pump()
+        stats = ingest.stats()
+        self.assertEqual((stats.lag, stats.throughput), (0.0, 1 / 2.5))
+        ingest.stop()
+        ingest.run()
+
+    def test_stop_ends_queue_source(self):
+        store = make_store()
+        ingest = Ingest(store, queue.Queue())
+        ingest.poll_interval = 0.01
+        ingest.start()
+        ingest.stop()
+        self.assertEqual(ingest.run().dispatched, 0)
+
+    def test_raises_source_errors(self):
+        def failing():
+            yield {'type': 'ADD', 'n': 1}
+            raise IOError('connection lost')
+
+        store = make_store()
+        with self.assertRaises(IOError):
+            Ingest(store, failing()).run()
+        self.assertEqual(store.get_state(), 1)
+
+    def test_stops_reader_when_dispatch_raises(self):
+        store = make_store()
+        store['dispatch'] = mock.MagicMock(side_effect=ValueError('rejected'))
+        ingest = Ingest(store, iter(adds(1000)), batch_size=5, high_water=20)
+        with self.assertRaises(ValueError):
+            ingest.run()
+        ingest._reader.join(5)
+        self.assertFalse(ingest._reader.is_alive())
+
+    @unittest.skipIf(agen is None, 'needs async generators')
+    def test_reads_async_iterators(self):
+        store = make_store()
+        Ingest(store, agen(adds(12)), batch_size=4).run()
+        self.assertEqual(store.get_state(), 12)
+
+    def test_throws_on_invalid_water_marks(self):
+        store = make_store()
+        with self.assertRaises(ValueError):
+            Ingest(store, [], high_water=10, low_water=10)
+        with self.assertRaises(ValueError):
+            Ingest(store, [], batch_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import io
+import sys
+import unittest
+
+import mock
+from pydux import combine_reducers, create_store
+from pydux.loadgen import (
+    format_report, load_factory, main, parse_mix, replay_actions, run_load,
+    synthetic_actions,
+)
+
+
+def counter(state=None, action=None):
+    state = 0 if state is None else state
+    return state + 1 if action.get('type') == 'ADD' else state
+
+def make_store():
+    return create_store(combine_reducers({'counter': counter}))
+
+
+class TestActions(unittest.TestCase):
+    def test_parses_mix(self):
+        self.assertEqual(parse_mix('ADD=5, REMOVE=0.5,NOOP'),
+                         [('ADD', 5.0), ('REMOVE', 0.5), ('NOOP', 1.0)])
+        with self.assertRaises(ValueError):
+            parse_mix('ADD=-1')
+
+    def test_synthetic_actions_are_deterministic(self):
+        mix = [('ADD', 3), ({'type': 'SET', 'value': 1}, 1), ('NEVER', 0)]
+        first = list(synthetic_actions(mix, count=1000, seed=42))
+        self.assertEqual(first, list(synthetic_actions(mix, count=1000, seed=42)))
+        self.assertNotEqual(first, list(synthetic_actions(mix, count=1000, seed=43)))
+
+        types = [action['type'] for action in first]
+        self.assertEqual([action['seq'] for action in first], list(range(1000)))
+        self.assertTrue(650 < types.count('ADD') < 850)
+        self.assertEqual(types.count('NEVER'), 0)
+        self.assertTrue(all(action['value'] == 1 for action in first
+                            if action['type'] == 'SET'))
+
+    def test_replays_json_lines(self):
+        log = io.StringIO(u'{"type": "ADD"}\n\n{"type": "NOOP", "n": 1}\n')
+        self.assertEqual(list(replay_actions(log)),
+                         [{'type': 'ADD'}, {'type': 'NOOP', 'n': 1}])
+
+
+class TestRunLoad(unittest.TestCase):
+    def test_reports_throughput_and_listeners(self):
+        actions = synthetic_actions([('ADD', 1), ('NOOP', 1)], count=500)
+        report = run_load(make_store, actions, listeners=10)
+        self.assertEqual(report.actions, 500)
+        self.assertTrue(report.throughput > 0)
+        self.assertEqual(report.latency.count, 500)
+        self.assertEqual(report.listeners, 10)
+        self.assertTrue(report.per_listener > 0)
+        self.assertTrue(report.memory_growth is None)
+        self.assertTrue('throughput' in format_report(report))
+
+    @unittest.skipIf(sys.version_info < (3, 4), 'requires tracemalloc')
+    def test_traces_memory(self):
+        import tracemalloc
+        report = run_load(make_store, [{'type': 'ADD'}] * 10, trace_memory=True)
+        self.assertTrue(report.memory_growth is not None)
+        self.assertTrue('memory' in format_report(report))
+
+        factory = mock.MagicMock(side_effect=ValueError('no store'))
+        with self.assertRaises(ValueError):
+            run_load(factory, [], trace_memory=True)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_paces_fixed_rate(self):
+        sleep = mock.MagicMock()
+        report = run_load(make_store, [{'type': 'ADD'}] * 10, rate=1000.0, sleep=sleep)
+        self.assertEqual(report.actions, 10)
+        self.assertTrue(sleep.call_count > 0)
+        self.assertTrue(all(0 < c[0][0] <= 0.01 for c in sleep.call_args_list))
+
+    def test_stops_after_duration(self):
+        report = run_load(make_store, synthetic_actions([('ADD', 1)]), duration=0.05)
+        self.assertTrue(report.actions > 0)
+        self.assertTrue(report.seconds >= 0.05)
+
+    def test_does_not_leave_hooks_behind(self):
+        run_load(make_store, [{'type': 'ADD'}])
+        store = make_store()
+        self.assertFalse(store['dispatch'].__name__ == 'staged_dispatch')
+
+
+class TestMain(unittest.TestCase):
+    def test_runs_mix(self):
+        with mock.patch('sys.stdout', new_callable=io.StringIO if str is not bytes
+                        else io.BytesIO) as stdout:
+            self.assertEqual(main(['test.test_loadgen:make_store', '--mix', 'ADD=1',
+                                   '--count', '50', '--listeners', '2']), 0)
+        self.assertTrue('actions      50 ' in stdout.getvalue())
+
+    def test_adds_working_directory_to_path_once(self):
+        path = list(sys.path)
+        self.addCleanup(setattr, sys, 'path', path)
+        with mock.patch('sys.stdout'):
+            for _ in range(2):
+                main(['test.test_loadgen:make_store', '--mix', 'ADD=1', '--count', '1'])
+        self.assertTrue(sys.path.count('') <= 1)
+
+    def test_loads_factory(self):
+        self.assertTrue(load_factory('test.test_loadgen:make_store') is make_store)
+        with self.assertRaises(ValueError):
+            load_factory('test.test_loadgen')
+
+
+if __name__ == '__main__':
+    unittest.main()
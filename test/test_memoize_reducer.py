@@ -0,0 +1,93 @@
+import unittest
+
+import mock
+from pydux import combine_reducers, handle_actions, memoize_reducer
+from pydux.memoize_reducer import freeze_action
+
+
+def items(state=None, action=None):
+    if state is None:
+        state = []
+    if action and action.get('type') == 'SET':
+        return list(action['items'])
+    return state
+
+
+class TestMemoizeReducer(unittest.TestCase):
+    def test_returns_cached_state_for_duplicate_action(self):
+        spy = mock.MagicMock(side_effect=items)
+        reducer = memoize_reducer(spy)
+
+        state = []
+        action = {'type': 'SET', 'items': [1, 2, 3]}
+        first = reducer(state, action)
+        second = reducer(state, dict(action))
+
+        self.assertEqual(first, [1, 2, 3])
+        self.assertTrue(first is second)
+        self.assertEqual(spy.call_count, 1)
+        self.assertEqual(reducer.cache_info().hits, 1)
+        self.assertEqual(reducer.cache_info().misses, 1)
+
+    def test_keys_on_state_identity(self):
+        spy = mock.MagicMock(side_effect=items)
+        reducer = memoize_reducer(spy)
+        action = {'type': 'SET', 'items': [1]}
+
+        reducer([], action)
+        reducer([], action)
+        self.assertEqual(spy.call_count, 2)
+
+    def test_keeps_combined_state_referentially_equal(self):
+        slice_reducer = memoize_reducer(items)
+        reducer = combine_reducers({'items': slice_reducer})
+        poll = {'type': 'SET', 'items': [1]}
+
+        state = reducer({'items': []}, poll)
+        self.assertEqual(state, {'items': [1]})
+        self.assertTrue(reducer(state, dict(poll)) is state)
+        self.assertTrue(slice_reducer(state['items'], poll) is
+                        slice_reducer(state['items'], dict(poll)))
+
+    def test_bounds_cache_size(self):
+        reducer = memoize_reducer(items, maxsize=2)
+        state = []
+        for i in range(5):
+            reducer(state, {'type': 'SET', 'items': [i]})
+        info = reducer.cache_info()
+        self.assertEqual(info.currsize, 2)
+        self.assertEqual(info.maxsize, 2)
+
+        reducer(state, {'type': 'SET', 'items': [4]})
+        reducer(state, {'type': 'SET', 'items': [0]})
+        self.assertEqual(reducer.cache_info().hits, 1)
+
+    def test_bypasses_cache_for_unhashable_keys(self):
+        reducer = memoize_reducer(items, key=lambda action: action['items'])
+        reducer([], {'type': 'SET', 'items': [1]})
+        self.assertEqual(reducer.cache_info().currsize, 0)
+        self.assertEqual(reducer.cache_info().misses, 1)
+
+    def test_cache_clear(self):
+        reducer = memoize_reducer(items)
+        reducer([], {'type': 'SET', 'items': [1]})
+        reducer.cache_clear()
+        self.assertEqual(tuple(reducer.cache_info()), (0, 0, 128, 0))
+
+    def test_preserves_handled_types(self):
+        reducer = memoize_reducer(handle_actions({'A': lambda s, a: s}, 0))
+        self.assertEqual(reducer.handled_types, frozenset(['A']))
+
+    def test_freeze_action_distinguishes_value_types(self):
+        self.assertNotEqual(freeze_action({'v': 1}), freeze_action({'v': True}))
+        self.assertNotEqual(freeze_action({'v': [1]}), freeze_action({'v': (1,)}))
+        self.assertEqual(freeze_action({'a': 1, 'b': {'c': [2]}}),
+                         freeze_action({'b': {'c': [2]}, 'a': 1}))
+
+    def test_throws_if_reducer_is_not_a_function(self):
+        with self.assertRaises(TypeError):
+            memoize_reducer('reducer')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+from pydux import apply_middleware, combine_reducers, create_store
+from pydux.metrics import Histogram, Metrics
+from pydux.thunk_middleware import thunk_middleware
+
+try:
+    from urllib.request import urlopen
+except ImportError:  # python 2
+    from urllib2 import urlopen
+
+
+def counter(state=None, action=None):
+    state = 0 if state is None else state
+    return state + 1 if action.get('type') == 'increment' else state
+
+def todos(state=None, action=None):
+    state = [] if state is None else state
+    return state + [action['text']] if action.get('type') == 'add' else state
+
+
+def make_store(metrics, *middlewares):
+    reducer = combine_reducers({'counter': counter, 'todos': todos}, hooks=[metrics])
+    enhancer = apply_middleware(*middlewares) if middlewares else None
+    return create_store(reducer, None, enhancer, metrics=metrics)
+
+
+class TestHistogram(unittest.TestCase):
+    def test_percentiles(self):
+        histogram = Histogram(bounds=[1, 2, 4, 8])
+        for value in [0.5] * 50 + [1.5] * 40 + [3] * 9 + [20]:
+            histogram.record(value)
+        self.assertEqual(histogram.counts, [50, 40, 9, 0, 1])
+        percentiles = histogram.percentiles()
+        self.assertEqual(percentiles.count, 100)
+        self.assertEqual(percentiles.p50, 1)
+        self.assertEqual(percentiles.p90, 2)
+        self.assertEqual(percentiles.p99, 4)
+        self.assertEqual(percentiles.max, 20)
+
+    def test_empty(self):
+        self.assertEqual(Histogram().percentile(0.5), 0.0)
+
+
+class TestMetrics(unittest.TestCase):
+    def test_counts_actions_slices_and_listeners(self):
+        metrics = Metrics()
+        store = make_store(metrics)
+        store.subscribe(lambda: None)
+        store.subscribe(lambda: None)
+        store.dispatch({'type': 'increment'})
+        store.dispatch({'type': 'increment'})
+        store.dispatch({'type': 'add', 'text': 'milk'})
+        store.dispatch({'type': 'unknown'})
+
+        self.assertEqual(metrics.actions['increment'], 2)
+        self.assertEqual(metrics.actions['add'], 1)
+        self.assertEqual(metrics.slice_changes, {'counter': 3, 'todos': 2})  # with INIT
+        self.assertEqual(metrics.listeners, 2)
+        self.assertEqual(metrics.reduce_seconds.count, 5)  # with INIT
+        self.assertEqual(metrics.notify_seconds.count, 5)
+        self.assertEqual(metrics.dispatch_seconds.count, 0)
+
+    def test_times_middleware_chain(self):
+        metrics = Metrics()
+        store = make_store(metrics, thunk_middleware)
+        store.dispatch(lambda dispatch, get_state: dispatch({'type': 'increment'}))
+        self.assertEqual(metrics.dispatch_seconds.count, 2)  # thunk and action
+        self.assertEqual(metrics.actions['increment'], 1)
+
+    def test_counts_listener_errors(self):
+        metrics = Metrics()
+        store = create_store(counter, metrics=metrics, on_listener_error=mock.MagicMock())
+        store.subscribe(mock.MagicMock(side_effect=ValueError()))
+        store.dispatch({'type': 'increment'})
+        self.assertEqual(metrics.listener_errors, 1)
+
+    def test_bounds_action_types(self):
+        metrics = Metrics(max_types=3)
+        store = create_store(counter, metrics=metrics)
+        for i in range(10):
+            store.dispatch({'type': 'type-%d' % (i,)})
+        self.assertEqual(len(metrics.actions), 4)
+        self.assertEqual(sum(metrics.actions.values()), 11)
+
+    def test_exposition(self):
+        metrics = Metrics(buckets=[0.001, 1])
+        store = make_store(metrics)
+        store.dispatch({'type': 'add', 'text': 'say "hi"'})
+        text = metrics.exposition()
+        self.assertTrue('pydux_actions_total{type="add"} 1\n' in text)
+        self.assertTrue('pydux_slice_changes_total{slice="todos"} 2\n' in text)
+        self.assertTrue('pydux_listeners 0\n' in text)
+        self.assertTrue('pydux_reduce_seconds_bucket{le="+Inf"} 2\n' in text)
+        self.assertTrue('pydux_reduce_seconds_count 2\n' in text)
+        self.assertTrue('# TYPE pydux_dispatch_seconds histogram\n' in text)
+
+    def test_dump(self):
+        metrics = Metrics()
+        create_store(counter, metrics=metrics)
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'pydux.prom')
+            metrics.dump(path)
+            with open(path) as fd:
+                self.assertEqual(fd.read(), metrics.exposition())
+            self.assertEqual(os.listdir(directory), ['pydux.prom'])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_serve(self):
+        metrics = Metrics()
+        create_store(counter, metrics=metrics)
+        server = metrics.serve()
+        try:
+            url = 'http://127.0.0.1:%d/metrics' % (server.server_address[1],)
+            body = urlopen(url, timeout=5).read().decode('utf-8')
+            self.assertEqual(body, metrics.exposition())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,249 @@
+import sys
+import unittest
+
+import mock
+from pydux import apply_middleware, create_store
+from pydux.saga_middleware import (
+    SagaMiddleware, call, cancel, debounce, delay, fork, put, race, select, take,
+)
+from .helpers.clock import FakeClock
+
+
+def log(state=None, action=None):
+    if state is None:
+        state = []
+    if action.get('type', '').startswith('@@'):
+        return state
+    return state + [action['type']]
+
+
+if sys.version_info >= (3, 3):
+    exec('def select_plus(x):\n'
+         '    value = yield select(lambda state, n: len(state) + n, x)\n'
+         '    return value\n')
+else:
+    def select_plus(x):
+        value = yield select(lambda state, n: len(state) + n, x)
+        raise StopIteration(value)
+
+
+def make_store(**kwargs):
+    sagas = SagaMiddleware(**kwargs)
+    store = create_store(log, None, apply_middleware(sagas))
+    return store, sagas
+
+
+class TestSagaMiddleware(unittest.TestCase):
+    def test_take_and_put(self):
+        store, sagas = make_store()
+
+        def saga():
+            while True:
+                action = yield take('PING')
+                yield put({'type': 'PONG', 'n': action['n']})
+
+        sagas.run(saga)
+        store.dispatch({'type': 'PING', 'n': 1})
+        store.dispatch({'type': 'OTHER'})
+        store.dispatch({'type': 'PING', 'n': 2})
+        self.assertEqual(store.get_state(), ['PING', 'PONG', 'OTHER', 'PING', 'PONG'])
+
+    def test_take_patterns(self):
+        store, sagas = make_store()
+        seen = []
+
+        def saga(pattern):
+            while True:
+                action = yield take(pattern)
+                seen.append((pattern if isinstance(pattern, str) else 'other', action['type']))
+
+        sagas.run(saga, '*')
+        sagas.run(saga, ['A', 'B'])
+        sagas.run(saga, lambda action: action['type'] == 'C')
+        for ty in ['A', 'B', 'C']:
+            store.dispatch({'type': ty})
+        self.assertEqual(sorted(seen), sorted([
+            ('*', 'A'), ('*', 'B'), ('*', 'C'),
+            ('other', 'A'), ('other', 'B'), ('other', 'C'),
+        ]))
+
+    def test_call_resumes_with_result_or_throws(self):
+        store, sagas = make_store()
+        results = []
+
+        def failing():
+            raise ValueError('boom')
+
+        def saga():
+            results.append((yield call(lambda a, b: a + b, 1, 2)))
+            results.append((yield call(select_plus, 10)))
+            try:
+                yield call(failing)
+            except ValueError as e:
+                results.append(str(e))
+
+        task = sagas.run(saga)
+        self.assertEqual(results, [3, 10, 'boom'])
+        self.assertTrue(task.done)
+        self.assertEqual(sagas.task_count, 0)
+
+    def test_fork_runs_concurrently_and_cancel_stops_tasks(self):
+        store, sagas = make_store()
+
+        def worker(name):
+            while True:
+                yield take('TICK')
+                yield put({'type': name})
+
+        def root():
+            a = yield fork(worker, 'A')
+            yield fork(worker, 'B')
+            yield take('STOP_A')
+            yield cancel(a)
+
+        root_task = sagas.run(root)
+        store.dispatch({'type': 'TICK'})
+        store.dispatch({'type': 'STOP_A'})
+        store.dispatch({'type': 'TICK'})
+        self.assertEqual(store.get_state(), ['TICK', 'A', 'B', 'STOP_A', 'TICK', 'B'])
+        self.assertTrue(root_task.done)
+        self.assertEqual(sagas.task_count, 1)
+
+    def test_race_between_take_and_delay(self):
+        clock = FakeClock()
+        store, sagas = make_store(clock=clock)
+        results = []
+
+        def saga():
+            while True:
+                results.append((yield race({'action': take('GO'), 'timeout': delay(5)})))
+
+        sagas.run(saga)
+        store.dispatch({'type': 'GO'})
+        self.assertEqual(results, [{'action': {'type': 'GO'}, 'timeout': None}])
+        self.assertEqual(sagas.next_deadline(), 5)
+
+        clock.now = 4
+        sagas.tick()
+        self.assertEqual(len(results), 1)
+        clock.now = 5
+        sagas.tick()
+        self.assertEqual(results[1], {'action': None, 'timeout': True})
+
+    def test_resumed_and_cancelled_takers_are_removed(self):
+        clock = FakeClock()
+        store, sagas = make_store(clock=clock)
+
+        def rare():
+            while True:
+                yield race({'action': take('RARE'), 'any': take('*'), 'timeout': delay(1)})
+
+        def either():
+            while True:
+                yield take(['A', 'B'])
+
+        sagas.run(rare)
+        sagas.run(either)
+        for _ in range(100):
+            clock.now += 1
+            sagas.tick()
+            store.dispatch({'type': 'A'})
+        self.assertEqual(dict((k, len(v)) for k, v in sagas._takers_by_type.items()),
+                         {'RARE': 1, 'A': 1, 'B': 1})
+        self.assertEqual(len(sagas._other_takers), 1)
+
+    def test_debounce(self):
+        clock = FakeClock()
+        store, sagas = make_store(clock=clock)
+        searched = []
+
+        def search(prefix, action):
+            searched.append((prefix, action['q']))
+            yield put({'type': 'SEARCHED'})
+
+        def root():
+            yield debounce(1, 'INPUT', search, 'q')
+
+        sagas.run(root)
+        for i, q in enumerate(['a', 'ab', 'abc']):
+            clock.now = i * 0.5
+            store.dispatch({'type': 'INPUT', 'q': q})
+            sagas.tick()
+        self.assertEqual(searched, [])
+
+        clock.now = 2
+        sagas.tick()
+        self.assertEqual(searched, [('q', 'abc')])
+        self.assertEqual(store.get_state()[-1], 'SEARCHED')
+
+    def test_puts_do_not_grow_the_stack(self):
+        store, sagas = make_store()
+
+        def ping():
+            for i in range(5000):
+                yield put({'type': 'PING'})
+                yield take('PONG')
+
+        def pong():
+            while True:
+                yield take('PING')
+                yield put({'type': 'PONG'})
+
+        sagas.run(pong)
+        task = sagas.run(ping)
+        self.assertTrue(task.done)
+        self.assertEqual(len(store.get_state()), 10000)
+
+    def test_many_suspended_workflows(self):
+        store, sagas = make_store()
+
+        def workflow(i):
+            yield take('GO')
+            yield put({'type': 'DONE'})
+
+        for i in range(2000):
+            sagas.run(workflow, i)
+        self.assertEqual(sagas.task_count, 2000)
+        store.dispatch({'type': 'GO'})
+        self.assertEqual(sagas.task_count, 0)
+        self.assertEqual(len(store.get_state()), 2001)
+
+    def test_errors_are_raised_or_reported(self):
+        store, sagas = make_store()
+
+        def failing():
+            yield take('FAIL')
+            raise ValueError('saga failed')
+
+        sagas.run(failing)
+        with self.assertRaises(ValueError):
+            store.dispatch({'type': 'FAIL'})
+
+        on_error = mock.MagicMock()
+        store, sagas = make_store(on_error=on_error)
+        task = sagas.run(failing)
+        store.dispatch({'type': 'FAIL'})
+        self.assertEqual(on_error.call_count, 1)
+        self.assertTrue(on_error.call_args[0][1] is task)
+        self.assertTrue(isinstance(task.error, ValueError))
+
+    def test_yielding_a_non_effect_throws_into_saga(self):
+        store, sagas = make_store()
+        errors = []
+
+        def saga():
+            try:
+                yield 'not an effect'
+            except TypeError as e:
+                errors.append(e)
+
+        sagas.run(saga)
+        self.assertEqual(len(errors), 1)
+
+    def test_run_requires_applied_middleware(self):
+        with self.assertRaises(Exception):
+            SagaMiddleware().run(lambda: None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+
+import mock
+from pydux import combine_reducers
+from pydux.selectors import create_selector, create_selector_family
+from .helpers.clock import FakeClock
+
+
+def users(state=None, action=None):
+    if state is None:
+        state = {}
+    if action and action.get('type') == 'SET_USER':
+        out = dict(state)
+        out[action['id']] = action['name']
+        return out
+    return state
+
+def counter(state=None, action=None):
+    state = 0 if state is None else state
+    return state + 1 if action and action.get('type') == 'increment' else state
+
+reducer = combine_reducers({'users': users, 'counter': counter})
+
+
+class TestCreateSelector(unittest.TestCase):
+    def test_recomputes_only_when_inputs_change(self):
+        result_func = mock.MagicMock(side_effect=lambda users: len(users))
+        select_count = create_selector([lambda state: state['users']], result_func)
+
+        state = reducer(None, {'type': 'init'})
+        self.assertEqual(select_count(state), 0)
+        state = reducer(state, {'type': 'increment'})
+        self.assertEqual(select_count(state), 0)
+        self.assertEqual(result_func.call_count, 1)
+
+        state = reducer(state, {'type': 'SET_USER', 'id': 1, 'name': 'a'})
+        self.assertEqual(select_count(state), 1)
+        self.assertEqual(result_func.call_count, 2)
+
+
+class TestCreateSelectorFamily(unittest.TestCase):
+    def make(self, **kwargs):
+        result_func = mock.MagicMock(side_effect=lambda users, user_id: users.get(user_id))
+        select_user = create_selector_family(
+            [lambda state, user_id: state['users']], result_func, **kwargs)
+        return select_user, result_func
+
+    def test_memoizes_per_parameter(self):
+        select_user, result_func = self.make()
+        state = reducer(None, {'type': 'init'})
+        for user_id in range(3):
+            state = reducer(state, {'type': 'SET_USER', 'id': user_id, 'name': 'u%d' % user_id})
+
+        for _ in range(3):
+            self.assertEqual([select_user(state, i) for i in range(3)], ['u0', 'u1', 'u2'])
+        self.assertEqual(result_func.call_count, 3)
+        info = select_user.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (6, 3, 3))
+
+    def test_invalidates_on_input_identity(self):
+        select_user, result_func = self.make()
+        state = reducer(None, {'type': 'init'})
+        select_user(state, 1)
+
+        state = reducer(state, {'type': 'increment'})
+        self.assertEqual(select_user(state, 1), None)
+        self.assertEqual(result_func.call_count, 1)
+
+        state = reducer(state, {'type': 'SET_USER', 'id': 1, 'name': 'a'})
+        self.assertEqual(select_user(state, 1), 'a')
+        self.assertEqual(result_func.call_count, 2)
+
+    def test_evicts_least_recently_used(self):
+        select_user, result_func = self.make(maxsize=2)
+        state = reducer(None, {'type': 'init'})
+        select_user(state, 1)
+        select_user(state, 2)
+        select_user(state, 1)
+        select_user(state, 3)  # evicts 2
+        select_user(state, 1)
+        self.assertEqual(result_func.call_count, 3)
+        select_user(state, 2)
+        self.assertEqual(result_func.call_count, 4)
+        info = select_user.cache_info()
+        self.assertEqual((info.evictions, info.currsize, info.maxsize), (2, 2, 2))
+
+    def test_expires_entries_after_ttl(self):
+        clock = FakeClock()
+        select_user, result_func = self.make(ttl=5, clock=clock)
+        state = reducer(None, {'type': 'init'})
+        select_user(state, 1)
+        clock.now = 4
+        select_user(state, 1)
+        clock.now = 5
+        select_user(state, 1)
+        self.assertEqual(result_func.call_count, 2)
+        self.assertEqual(select_user.cache_info().expirations, 1)
+
+    def test_invalidate_and_clear(self):
+        select_user, result_func = self.make()
+        state = reducer(None, {'type': 'init'})
+        select_user(state, 1)
+        select_user.invalidate(1)
+        select_user(state, 1)
+        self.assertEqual(result_func.call_count, 2)
+        select_user.cache_clear()
+        self.assertEqual(tuple(select_user.cache_info()), (0, 0, 0, 0, 256, 0))
+
+    def test_does_not_cache_unhashable_parameters(self):
+        result_func = mock.MagicMock(side_effect=lambda users, ids: [users.get(i) for i in ids])
+        select_users = create_selector_family([lambda state, ids: state['users']], result_func)
+        state = reducer(None, {'type': 'init'})
+        self.assertEqual(select_users(state, [1]), [None])
+        select_users(state, [1])
+        self.assertEqual(result_func.call_count, 2)
+        self.assertEqual(select_users.cache_info().currsize, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
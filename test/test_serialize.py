@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import unittest
+
+from pydux import combine_reducers
+from pydux.serialize import StateSerializer, msgpack
+
+
+def dumps(state):
+    return json.dumps(state, separators=(',', ':')).encode('ascii')
+
+
+class TestStateSerializer(unittest.TestCase):
+    def test_matches_json_dumps(self):
+        serializer = StateSerializer()
+        cases = [
+            None, 1, 'text', [], {},
+            {'a': [1, 2.5, None, True, {'b': u'é'}], 'c': (1, 2)},
+            {1: 'int', 2.5: 'float', True: 'bool', None: 'none'},
+        ]
+        for state in cases:
+            self.assertEqual(serializer.dumps(state), dumps(state))
+
+    def test_throws_on_invalid_keys(self):
+        with self.assertRaises(TypeError):
+            StateSerializer().dumps({(1, 2): 'tuple key'})
+
+    def test_reuses_encoded_unchanged_subtrees(self):
+        def big(state=None, action=None):
+            return {'rows': [{'id': i} for i in range(100)]} if state is None else state
+
+        def counter(state=None, action=None):
+            state = {'n': 0} if state is None else state
+            return {'n': state['n'] + 1} if action.get('type') == 'increment' else state
+
+        reducer = combine_reducers({'big': big, 'counter': counter})
+        serializer = StateSerializer()
+        state = reducer(None, {'type': 'init'})
+        serializer.dumps(state)
+        misses = serializer.cache_info().misses
+
+        state = reducer(state, {'type': 'increment'})
+        self.assertEqual(serializer.dumps(state), dumps(state))
+        info = serializer.cache_info()
+        # only the root and the counter slice are re-encoded
+        self.assertEqual(info.misses - misses, 2)
+        self.assertEqual(info.hits, 1)
+
+    def test_bounds_cache_size(self):
+        serializer = StateSerializer(maxsize=10)
+        state = [[i] for i in range(100)]
+        self.assertEqual(serializer.dumps(state), dumps(state))
+        self.assertEqual(serializer.cache_info().currsize, 10)
+        serializer.cache_clear()
+        self.assertEqual(tuple(serializer.cache_info()), (0, 0, 10, 0))
+
+    def test_dump_writes_to_file(self):
+        fp = io.BytesIO()
+        StateSerializer().dump({'a': [1]}, fp)
+        self.assertEqual(fp.getvalue(), b'{"a":[1]}')
+
+    def test_throws_on_unknown_format(self):
+        with self.assertRaises(ValueError):
+            StateSerializer(format='xml')
+
+    @unittest.skipIf(msgpack is None, 'msgpack is not installed')
+    def test_matches_msgpack_packb(self):
+        serializer = StateSerializer(format='msgpack')
+        cases = [
+            {'a': [1, 2.5, None, True, {'b': u'é'}], 'c': b'bytes'},
+            {'wide': list(range(20)), 'map': dict(('k%d' % i, i) for i in range(20))},
+            list(range(70000)),
+        ]
+        for state in cases:
+            self.assertEqual(serializer.dumps(state),
+                             msgpack.packb(state, use_bin_type=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
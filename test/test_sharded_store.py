@@ -0,0 +1,157 @@
+import threading
+import unittest
+
+import mock
+from pydux import apply_middleware, create_sharded_store, create_store
+from pydux.thunk_middleware import thunk_middleware
+
+
+def make_counter(prefix):
+    def counter(state=None, action=None):
+        state = 0 if state is None else state
+        if action and action.get('type') in (prefix + '/INCREMENT', 'INCREMENT_ALL'):
+            return state + 1
+        return state
+    return counter
+
+
+def make_store(**kwargs):
+    return create_sharded_store({'a': make_counter('a'), 'b': make_counter('b')},
+                                **kwargs)
+
+
+class TestShardedStore(unittest.TestCase):
+    def test_routes_by_type_prefix(self):
+        store = make_store()
+        store.dispatch({'type': 'a/INCREMENT'})
+        store.dispatch({'type': 'a/INCREMENT'})
+        store.dispatch({'type': 'b/INCREMENT'})
+        self.assertEqual(store.get_state(), {'a': 2, 'b': 1})
+
+    def test_routes_by_type(self):
+        reducer_a = mock.MagicMock(side_effect=make_counter('a'))
+        reducer_b = mock.MagicMock(side_effect=make_counter('b'))
+        store = create_sharded_store({'a': reducer_a, 'b': reducer_b},
+                                     routes={'INCREMENT_ALL': 'b'})
+        reducer_a.reset_mock()
+        store.dispatch({'type': 'INCREMENT_ALL'})
+        self.assertEqual(store.get_state(), {'a': 0, 'b': 1})
+        self.assertEqual(reducer_a.call_count, 0)
+
+    def test_broadcasts_unrouted_actions(self):
+        store = make_store()
+        store.dispatch({'type': 'INCREMENT_ALL'})
+        self.assertEqual(store.get_state(), {'a': 1, 'b': 1})
+
+    def test_sends_unrouted_actions_to_default(self):
+        store = make_store(default='a')
+        store.dispatch({'type': 'INCREMENT_ALL'})
+        self.assertEqual(store.get_state(), {'a': 1, 'b': 0})
+        store.broadcast({'type': 'INCREMENT_ALL'})
+        self.assertEqual(store.get_state(), {'a': 2, 'b': 1})
+
+    def test_get_state_keeps_identity(self):
+        store = make_store()
+        state = store.get_state()
+        store.dispatch({'type': 'a/UNKNOWN'})
+        self.assertTrue(store.get_state() is state)
+        store.dispatch({'type': 'a/INCREMENT'})
+        self.assertFalse(store.get_state() is state)
+
+    def test_notifies_listeners_per_shard(self):
+        store = make_store()
+        listener = mock.MagicMock()
+        unsubscribe = store.subscribe(listener)
+        store.dispatch({'type': 'a/INCREMENT'})
+        self.assertEqual(listener.call_count, 1)
+        store.broadcast({'type': 'INCREMENT_ALL'})
+        self.assertEqual(listener.call_count, 3)
+
+        self.assertEqual(store.listener_count(), 1)
+        unsubscribe()
+        store.dispatch({'type': 'a/INCREMENT'})
+        self.assertEqual(listener.call_count, 3)
+        self.assertEqual(store.listener_count(), 0)
+
+    def test_shards_keep_their_own_listeners(self):
+        store = make_store()
+        listener = mock.MagicMock()
+        store.shard('b').subscribe(listener)
+        store.dispatch({'type': 'a/INCREMENT'})
+        self.assertEqual(listener.call_count, 0)
+        store.dispatch({'type': 'b/INCREMENT'})
+        self.assertEqual(listener.call_count, 1)
+
+    def test_accepts_enhanced_shards(self):
+        shard = create_store(make_counter('a'), None, apply_middleware(thunk_middleware))
+        store = create_sharded_store({'a': shard, 'b': make_counter('b')}, default='a')
+        result = store.dispatch(lambda dispatch, get_state: dispatch({'type': 'a/INCREMENT'}))
+        self.assertEqual(result, {'type': 'a/INCREMENT'})
+        self.assertEqual(store.get_state(), {'a': 1, 'b': 0})
+
+    def test_replaces_a_shard_reducer(self):
+        store = make_store()
+        store.replace_shard_reducer('b', lambda state, action: 10)
+        self.assertEqual(store.get_state(), {'a': 0, 'b': 10})
+        store.replace_reducer({'a': lambda state, action: 20})
+        self.assertEqual(store.get_state(), {'a': 20, 'b': 10})
+        with self.assertRaises(ValueError):
+            store.replace_reducer({'c': lambda state, action: 0})
+
+    def test_throws_on_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            create_sharded_store({})
+        with self.assertRaises(TypeError):
+            create_sharded_store({'a': 1})
+        with self.assertRaises(ValueError):
+            make_store(routes={'X': 'c'})
+        with self.assertRaises(ValueError):
+            make_store(default='c')
+
+    def test_throws_on_invalid_actions(self):
+        store = make_store()
+        with self.assertRaises(TypeError):
+            store.dispatch(lambda dispatch, get_state: None)
+        with self.assertRaises(ValueError):
+            store.dispatch({})
+
+
+class TestThreadedShardedStore(unittest.TestCase):
+    def test_reduces_each_shard_on_its_own_thread(self):
+        threads = {}
+
+        def make_recorder(name):
+            def reducer(state=None, action=None):
+                threads.setdefault(name, set()).add(threading.current_thread())
+                return make_counter(name)(state, action)
+            return reducer
+
+        store = create_sharded_store({'a': make_recorder('a'), 'b': make_recorder('b')},
+                                     threaded=True)
+        threads.clear()
+        futures = [store.dispatch({'type': 'a/INCREMENT'}) for _ in range(10)]
+        futures.append(store.dispatch({'type': 'b/INCREMENT'}))
+        futures.append(store.broadcast({'type': 'INCREMENT_ALL'}))
+        for future in futures:
+            future.result(timeout=5)
+        store.close()
+
+        self.assertEqual(store.get_state(), {'a': 11, 'b': 2})
+        self.assertEqual(len(threads['a']), 1)
+        self.assertTrue(threads['a'].isdisjoint(threads['b']))
+        self.assertFalse(threading.current_thread() in threads['a'])
+
+    def test_future_carries_reducer_errors(self):
+        def failing(state=None, action=None):
+            if action and action.get('type') == 'FAIL':
+                raise RuntimeError('oops')
+            return state
+
+        store = create_sharded_store({'a': failing, 'b': failing}, threaded=True)
+        with self.assertRaises(RuntimeError):
+            store.dispatch({'type': 'FAIL'}).result(timeout=5)
+        store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
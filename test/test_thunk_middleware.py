@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import unittest
+
+import mock
+from pydux import apply_middleware, create_store
+from pydux.thunk_middleware import create_thunk_middleware, keyed, thunk_middleware
+from .helpers.action_creators import add_todo, add_todo_if_empty
+from .helpers.clock import FakeClock
+from .helpers.reducers import reducers
+
+
+class TestThunkMiddleware(unittest.TestCase):
+    def test_runs_thunks_inline(self):
+        store = create_store(reducers['todos'], None, apply_middleware(thunk_middleware))
+        store.dispatch(add_todo_if_empty('Hello'))
+        store.dispatch(add_todo_if_empty('World'))
+        self.assertEqual(store.get_state(), [{'id': 1, 'text': 'Hello'}])
+
+
+class TestCreateThunkMiddleware(unittest.TestCase):
+    def test_returns_futures_for_inline_thunks(self):
+        store = create_store(reducers['todos'], None,
+                             apply_middleware(create_thunk_middleware()))
+        future = store.dispatch(lambda dispatch, get_state: len(get_state()))
+        self.assertEqual(future.result(), 0)
+
+        def failing(dispatch, get_state):
+            raise ValueError('failed')
+        with self.assertRaises(ValueError):
+            store.dispatch(failing).result()
+
+        self.assertEqual(store.dispatch(add_todo('plain')), add_todo('plain'))
+
+    def test_offloads_to_executor(self):
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        store = create_store(reducers['todos'], None,
+                             apply_middleware(create_thunk_middleware(executor)))
+
+        def fetch(dispatch, get_state):
+            dispatch(add_todo('fetched'))
+            return threading.current_thread()
+
+        thread = store.dispatch(fetch).result(timeout=5)
+        self.assertFalse(thread is threading.current_thread())
+        self.assertEqual(store.get_state(), [{'id': 1, 'text': 'fetched'}])
+
+    def test_deduplicates_in_flight_thunks_by_key(self):
+        executor = ThreadPoolExecutor(max_workers=4)
+        self.addCleanup(executor.shutdown)
+        store = create_store(reducers['todos'], None,
+                             apply_middleware(create_thunk_middleware(executor)))
+        release = threading.Event()
+        calls = mock.MagicMock()
+
+        def fetch_user(dispatch, get_state):
+            calls()
+            release.wait(5)
+            return 'user'
+
+        futures = [store.dispatch(keyed('user:1', fetch_user)) for _ in range(5)]
+        other = store.dispatch(keyed('user:2', fetch_user))
+        release.set()
+
+        self.assertTrue(all(future is futures[0] for future in futures))
+        self.assertEqual(futures[0].result(timeout=5), 'user')
+        self.assertEqual(other.result(timeout=5), 'user')
+        self.assertEqual(calls.call_count, 2)
+
+        # without a ttl, completed thunks run again
+        store.dispatch(keyed('user:1', fetch_user)).result(timeout=5)
+        self.assertEqual(calls.call_count, 3)
+
+    def test_caches_successful_results_for_ttl(self):
+        clock = FakeClock()
+        store = create_store(reducers['todos'], None, apply_middleware(
+            create_thunk_middleware(key=lambda thunk: thunk.__name__, ttl=10, clock=clock)))
+        calls = mock.MagicMock(return_value='data')
+
+        def fetch(dispatch, get_state):
+            return calls()
+
+        first = store.dispatch(fetch)
+        clock.now = 9
+        self.assertTrue(store.dispatch(fetch) is first)
+        self.assertEqual(calls.call_count, 1)
+
+        clock.now = 10
+        self.assertEqual(store.dispatch(fetch).result(), 'data')
+        self.assertEqual(calls.call_count, 2)
+
+    def test_keeps_keys_per_store(self):
+        clock = FakeClock()
+        middleware = apply_middleware(create_thunk_middleware(ttl=60, clock=clock))
+        first = create_store(reducers['todos'], None, middleware)
+        second = create_store(reducers['todos'], None, middleware)
+        load = keyed('load', lambda dispatch, get_state: dispatch(add_todo('loaded')))
+
+        self.assertFalse(first.dispatch(load) is second.dispatch(load))
+        self.assertEqual(first.get_state(), [{'id': 1, 'text': 'loaded'}])
+        self.assertEqual(second.get_state(), [{'id': 1, 'text': 'loaded'}])
+
+    def test_does_not_cache_failures(self):
+        clock = FakeClock()
+        store = create_store(reducers['todos'], None, apply_middleware(
+            create_thunk_middleware(ttl=10, clock=clock)))
+        failing = mock.MagicMock(side_effect=ValueError('failed'))
+        thunk = keyed('k', lambda dispatch, get_state: failing())
+
+        self.assertTrue(isinstance(store.dispatch(thunk).exception(), ValueError))
+        store.dispatch(thunk)
+        self.assertEqual(failing.call_count, 2)
+
+    def test_failed_submit_does_not_stay_in_flight(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        submit = executor.submit
+        executor.submit = mock.MagicMock(side_effect=[RuntimeError('shut down'), submit])
+        store = create_store(reducers['todos'], None,
+                             apply_middleware(create_thunk_middleware(executor)))
+        thunk = keyed('k', lambda dispatch, get_state: 'data')
+
+        self.assertTrue(isinstance(store.dispatch(thunk).exception(), RuntimeError))
+        executor.submit.side_effect = submit
+        self.assertEqual(store.dispatch(thunk).result(timeout=5), 'data')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+
+from pydux import combine_reducers, create_store, handle_actions, undoable
+from pydux.undoable import (
+    HistoryStack, REDO, UNDO, clear_history, redo, undo,
+)
+
+
+def text(state=None, action=None):
+    if state is None:
+        state = ''
+    if action and action.get('type') == 'TYPE':
+        return state + action['char']
+    if action and action.get('type') == 'SET':
+        return action['value']
+    return state
+
+def typed(chars):
+    return [{'type': 'TYPE', 'char': char} for char in chars]
+
+
+class TestHistoryStack(unittest.TestCase):
+    def test_push_pop_are_persistent(self):
+        empty = HistoryStack()
+        one = empty.push(1)
+        two = one.push(2)
+        self.assertEqual(list(two), [2, 1])
+        self.assertEqual(list(two.pop()), [1])
+        self.assertEqual(list(one), [1])
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(two.peek(), 2)
+        with self.assertRaises(IndexError):
+            empty.pop()
+
+    def test_is_bounded(self):
+        stack = HistoryStack(limit=3)
+        for i in range(100):
+            stack = stack.push(i)
+            self.assertTrue(stack._depth <= 6)
+        self.assertEqual(list(stack), [99, 98, 97])
+        self.assertEqual(list(stack.pop().pop().push('x')), ['x', 97])
+
+
+class TestUndoable(unittest.TestCase):
+    def test_undo_and_redo(self):
+        store = create_store(undoable(text))
+        for action in typed('abc'):
+            store.dispatch(action)
+        self.assertEqual(store.get_state()['present'], 'abc')
+
+        store.dispatch(undo())
+        store.dispatch(undo())
+        self.assertEqual(store.get_state()['present'], 'a')
+        store.dispatch(redo())
+        self.assertEqual(store.get_state()['present'], 'ab')
+
+        store.dispatch(typed('x')[0])
+        self.assertEqual(store.get_state()['present'], 'abx')
+        self.assertEqual(len(store.get_state()['future']), 0)
+        state = store.get_state()
+        store.dispatch(redo())
+        self.assertTrue(store.get_state() is state)
+
+    def test_undo_with_empty_history_keeps_state(self):
+        reducer = undoable(text)
+        state = reducer(None, {'type': '@@redux/INIT'})
+        self.assertTrue(reducer(state, undo()) is state)
+        self.assertTrue(reducer(state, {'type': 'UNKNOWN'}) is state)
+
+    def test_limits_history(self):
+        reducer = undoable(text, limit=5)
+        state = reducer(None, {'type': '@@redux/INIT'})
+        for action in typed('abcdefghij'):
+            state = reducer(state, action)
+        self.assertEqual(len(state['past']), 5)
+        for _ in range(10):
+            state = reducer(state, undo())
+        self.assertEqual(state['present'], 'abcde')
+        self.assertEqual(len(state['future']), 5)
+
+    def test_groups_consecutive_actions(self):
+        reducer = undoable(text, group_by=lambda action: action.get('word'))
+        state = reducer(None, {'type': '@@redux/INIT'})
+        for word in ['hello', 'world']:
+            for char in word:
+                state = reducer(state, {'type': 'TYPE', 'char': char, 'word': word})
+        self.assertEqual(len(state['past']), 2)
+        state = reducer(state, undo())
+        self.assertEqual(state['present'], 'hello')
+        state = reducer(state, undo())
+        self.assertEqual(state['present'], '')
+
+    def test_filter_skips_recording(self):
+        reducer = undoable(text, filter=lambda action, present, previous: action['type'] != 'SET')
+        state = reducer(None, {'type': '@@redux/INIT'})
+        state = reducer(state, typed('a')[0])
+        state = reducer(state, {'type': 'SET', 'value': 'draft'})
+        self.assertEqual(state['present'], 'draft')
+        self.assertEqual(list(state['past']), [''])
+
+    def test_clear_history(self):
+        reducer = undoable(text)
+        state = reducer(None, {'type': '@@redux/INIT'})
+        for action in typed('ab'):
+            state = reducer(state, action)
+        state = reducer(state, undo())
+        state = reducer(state, clear_history())
+        self.assertEqual((len(state['past']), state['present'], len(state['future'])),
+                         (0, 'a', 0))
+
+    def test_composes_with_combine_reducers(self):
+        editor = undoable(handle_actions({'TYPE': lambda s, a: s + a['char']}, ''))
+        self.assertTrue(UNDO in editor.handled_types and REDO in editor.handled_types)
+        reducer = combine_reducers({'editor': editor, 'text': text})
+        store = create_store(reducer)
+        store.dispatch(typed('a')[0])
+        store.dispatch(undo())
+        self.assertEqual(store.get_state()['editor']['present'], '')
+        self.assertEqual(store.get_state()['text'], 'a')
+
+    def test_throws_on_invalid_limit(self):
+        with self.assertRaises(ValueError):
+            undoable(text, limit=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+
+import mock
+from pydux import apply_middleware, create_store
+from pydux.validation_middleware import (
+    compile_schema, create_validation_middleware, optional,
+)
+from .helpers.action_creators import add_todo, unknown_action
+from .helpers.action_types import ADD_TODO
+from .helpers.middleware import thunk
+from .helpers.reducers import reducers
+
+SCHEMAS = {
+    ADD_TODO: {'text': str},
+}
+
+
+class TestCompileSchema(unittest.TestCase):
+    def test_checks_required_fields_and_types(self):
+        check = compile_schema('MOVE', {
+            'x': int,
+            'y': (int, float),
+            'label': optional(str),
+            'speed': lambda value: value >= 0,
+        })
+        check({'type': 'MOVE', 'x': 1, 'y': 2.5, 'speed': 0})
+        check({'type': 'MOVE', 'x': 1, 'y': 2, 'speed': 1, 'label': 'a'})
+
+        for bad in [
+            {'type': 'MOVE', 'y': 2, 'speed': 0},
+            {'type': 'MOVE', 'x': '1', 'y': 2, 'speed': 0},
+            {'type': 'MOVE', 'x': 1, 'y': 2, 'speed': -1},
+            {'type': 'MOVE', 'x': 1, 'y': 2, 'speed': 0, 'label': 3},
+        ]:
+            with self.assertRaises(ValueError):
+                check(bad)
+
+    def test_uses_callable_schema_as_checker(self):
+        checker = mock.MagicMock()
+        self.assertTrue(compile_schema('A', checker) is checker)
+
+    def test_throws_on_invalid_spec(self):
+        with self.assertRaises(TypeError):
+            compile_schema('A', {'x': 'int'})
+        with self.assertRaises(TypeError):
+            compile_schema('A', 42)
+
+
+class TestValidationMiddleware(unittest.TestCase):
+    def test_rejects_invalid_actions(self):
+        store = create_store(reducers['todos'], None, apply_middleware(
+            create_validation_middleware(SCHEMAS)))
+
+        store.dispatch(add_todo('Hello'))
+        with self.assertRaises(ValueError) as e:
+            store.dispatch(add_todo(42))
+        self.assertTrue('"text"' in str(e.exception))
+        self.assertEqual(store.get_state(), [{'id': 1, 'text': 'Hello'}])
+
+    def test_passes_unknown_types_and_thunks(self):
+        store = create_store(reducers['todos'], None, apply_middleware(
+            thunk, create_validation_middleware(SCHEMAS)))
+        store.dispatch(unknown_action())
+        store.dispatch(lambda dispatch, get_state: dispatch(add_todo('a')))
+        self.assertEqual(store.get_state(), [{'id': 1, 'text': 'a'}])
+
+    def test_compiles_each_schema_once(self):
+        compiler = mock.MagicMock(side_effect=compile_schema)
+        store = create_store(reducers['todos'], None, apply_middleware(
+            create_validation_middleware(SCHEMAS, compiler=compiler)))
+        for i in range(3):
+            store.dispatch(add_todo('todo %d' % i))
+            store.dispatch(unknown_action())
+        self.assertEqual(compiler.call_count, 1)
+
+    def test_throws_on_invalid_schema_at_dispatch(self):
+        store = create_store(reducers['todos'], None, apply_middleware(
+            create_validation_middleware({ADD_TODO: {'text': 'not-a-spec'}})))
+        with self.assertRaises(TypeError):
+            store.dispatch(add_todo('Hello'))
+        self.assertEqual(store.get_state(), [])
+
+    def test_passes_actions_with_unhashable_types(self):
+        store = create_store(lambda state=None, action=None: action, None, apply_middleware(
+            create_validation_middleware(SCHEMAS)))
+        action = {'type': ['not', 'hashable']}
+        self.assertTrue(store.dispatch(action) is action)
+
+    def test_reports_to_on_invalid_and_drops_action(self):
+        on_invalid = mock.MagicMock()
+        store = create_store(reducers['todos'], None, apply_middleware(
+            create_validation_middleware(SCHEMAS, on_invalid=on_invalid)))
+        action = add_todo(None)
+        store.dispatch(action)
+        self.assertEqual(store.get_state(), [])
+        self.assertEqual(on_invalid.call_count, 1)
+        self.assertTrue(on_invalid.call_args[0][0] is action)
+        self.assertTrue(isinstance(on_invalid.call_args[0][1], ValueError))
+
+    def test_samples_validation(self):
+        on_invalid = mock.MagicMock()
+        store = create_store(reducers['todos'], None, apply_middleware(
+            create_validation_middleware(SCHEMAS, sample_rate=0.25,
+                                         on_invalid=on_invalid)))
+        for _ in range(8):
+            store.dispatch(add_todo(None))
+        self.assertEqual(on_invalid.call_count, 2)
+        self.assertEqual(len(store.get_state()), 6)
+
+    def test_samples_fractions(self):
+        on_invalid = mock.MagicMock()
+        store = create_store(reducers['todos'], None, apply_middleware(
+            create_validation_middleware(SCHEMAS, sample_rate=0.7,
+                                         on_invalid=on_invalid)))
+        for _ in range(10):
+            store.dispatch(add_todo(None))
+        self.assertEqual(on_invalid.call_count, 7)
+
+    def test_samples_per_store(self):
+        middleware = apply_middleware(create_validation_middleware(
+            SCHEMAS, sample_rate=0.5, on_invalid=mock.MagicMock()))
+        stores = [create_store(reducers['todos'], None, middleware) for _ in range(2)]
+        for store in stores:
+            store.dispatch(add_todo(None))
+        self.assertEqual([len(store.get_state()) for store in stores], [1, 1])
+
+    def test_sample_rate_zero_disables_validation(self):
+        store = create_store(reducers['todos'], None, apply_middleware(
+            create_validation_middleware(SCHEMAS, sample_rate=0)))
+        store.dispatch(add_todo(None))
+        self.assertEqual(len(store.get_state()), 1)
+
+    def test_throws_on_invalid_sample_rate(self):
+        with self.assertRaises(ValueError):
+            create_validation_middleware(SCHEMAS, sample_rate=2)
+
+
+if __name__ == '__main__':
+    unittest.main()